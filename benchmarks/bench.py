@@ -0,0 +1,221 @@
+"""Microbenchmarks of SDK hot paths
+
+Run from the repository root:
+
+    python benchmarks/bench.py --output results.json
+    python benchmarks/bench.py --baseline results.json --threshold 0.1
+
+Results are written as json, comparing against a baseline exits with status 1 if a benchmark's
+median got slower than the baseline's by more than threshold
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+from typing import Callable, Dict, List, Optional
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+import hprose
+import gizo.codec as codec
+import gizo.status as status
+import gizo.transport as transport
+import gizo.utils as utils
+from gizo.builder import ExecBuilder
+from gizo.dispatcher import Dispatcher
+from gizo.env import Env, Envs
+from gizo.job import Requests
+from gizo.metrics import Metrics
+from gizo.standin import StandIn
+from gizo.template import ExecTemplate
+
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+"""Benchmark name to setup function, which returns the callable to time"""
+
+def benchmark(name: str) -> Callable:
+    """Registers a setup function under name"""
+    def register(setup: Callable[[], Callable[[], object]]) -> Callable[[], Callable[[], object]]:
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+PUB = "304e301006072a8648ce3d020106052b81040021033a000473ed48af27222301e8907ce4031b6811b6ce0a0edb0b40426e57180468312985aefdd3e340eac3349a42225514c39231f4b733d8e07b7f2e"
+HASH_HEX = "001f176b24e37440867e1a60fdb1c8e691a29e1651e9b7b57d6eb38335d94dfe"
+HASH_B64 = base64.b64encode(bytes.fromhex(HASH_HEX)).decode("utf-8")
+
+def _exec(n: int) -> dict:
+    """Exec in the structure NewExec returns"""
+    return {"Hash": HASH_B64, "Timestamp": 1540000000000000000 + n, "Duration": 1200000, "Args": [n], "Err": None, "Priority": 0, "Result": n * 2, "Status": status.FINISHED, "Retries": 5, "RetriesCount": 0, "Backoff": 0, "ExecutionTime": 0, "Interval": 0, "By": PUB, "TTL": 0, "Pub": PUB, "Envs": "tsjvpJgFyhn+7arBKeRz4lFv9qihC5aJE6V23sCdeoALUCL3gMpfwxf+RA0lgmNwAG15"}
+def _block(jobs: int, execs: int) -> str:
+    """Json of a block holding jobs, each with execs"""
+    return json.dumps({
+        "Header": {"Timestamp": 1540000000, "PrevBlockHash": HASH_B64, "MerkleRoot": HASH_B64, "Nonce": 1, "Difficulty": 10, "Hash": HASH_B64},
+        "Jobs": [{"ID": hashlib.sha256(str(j).encode()).hexdigest(), "Hash": HASH_B64, "Execs": [_exec(e) for e in range(execs)], "Name": "Factorial", "Task": "func Factorial(n){ return n }", "Signature": HASH_B64, "SubmissionTime": 1540000000, "Private": False} for j in range(jobs)],
+        "Height": 1,
+        "ReceivedAt": 1540000000,
+        "By": PUB,
+    })
+
+@benchmark("requests.jrs.1")
+def requests_jrs_1() -> Callable[[], object]:
+    jr = Requests("job", _exec(0))
+    return jr.jrs
+@benchmark("requests.jrs.100")
+def requests_jrs_100() -> Callable[[], object]:
+    jr = Requests("job", *[_exec(n) for n in range(100)])
+    return jr.jrs
+@benchmark("envs.construct.10")
+def envs_construct() -> Callable[[], object]:
+    envs = [Env(f"key{n}", f"value{n}") for n in range(10)]
+    return lambda: Envs(*envs)
+@benchmark("newexec.payload")
+def newexec_payload() -> Callable[[], object]:
+    envs = Envs(*[Env(f"key{n}", f"value{n}") for n in range(10)])
+    return lambda: hprose.HproseFormatter.serialize([[1, 2, 3], 5, 0, 0, 0, 0, 0, PUB, codec.dumps(envs.envs)])
+@benchmark("newexec.build")
+def newexec_build() -> Callable[[], object]:
+    envs = Envs(Env("key", "value"))
+    builder = ExecBuilder(PUB, lambda envs: "encrypted")
+    return lambda: builder.build([1, 2, 3], 5, 0, 0, 0, 0, 0, envs)
+@benchmark("newexec.template")
+def newexec_template() -> Callable[[], object]:
+    template = ExecTemplate("job", _exec(0))
+    return lambda: template.json([1, 2, 3])
+@benchmark("utils.hex_to_bytes")
+def hex_to_bytes() -> Callable[[], object]:
+    return lambda: utils.hex_to_bytes(HASH_HEX)
+@benchmark("utils.bytes_to_hex")
+def bytes_to_hex() -> Callable[[], object]:
+    raw = utils.hex_to_bytes(HASH_HEX)
+    return lambda: utils.bytes_to_hex(raw)
+@benchmark("utils.b64_to_hex")
+def b64_to_hex() -> Callable[[], object]:
+    return lambda: utils.b64_to_hex(HASH_B64)
+@benchmark("utils.b64_to_bytes")
+def b64_to_bytes() -> Callable[[], object]:
+    return lambda: utils.b64_to_bytes(HASH_B64)
+@benchmark("utils.exec_hash")
+def exec_hash() -> Callable[[], object]:
+    return lambda: utils.ExecHash.from_hex(HASH_HEX).list
+@benchmark("dispatcher.parse")
+def dispatcher_parse() -> Callable[[], object]:
+    return lambda: Dispatcher(f"gizo://{PUB}@127.0.0.1:9999")
+@benchmark("block.loads.small")
+def block_loads_small() -> Callable[[], object]:
+    raw = _block(1, 1)
+    return lambda: json.loads(raw)
+@benchmark("block.loads.large")
+def block_loads_large() -> Callable[[], object]:
+    raw = _block(100, 10)
+    return lambda: json.loads(raw)
+@benchmark("block.codec.large")
+def block_codec_large() -> Callable[[], object]:
+    raw = _block(100, 10)
+    return lambda: codec.loads(raw)
+
+_standin: Optional[StandIn] = None
+def _dispatcher() -> Dispatcher:
+    """Dispatcher of a stand-in started on first use"""
+    global _standin
+    if _standin is None:
+        _standin = StandIn(seed=0).start()
+    return Dispatcher(_standin.url)
+@benchmark("transport.call")
+def transport_call() -> Callable[[], object]:
+    client = transport.connect(_dispatcher(), metrics=Metrics())
+    return client.PeerCount
+@benchmark("transport.block")
+def transport_block() -> Callable[[], object]:
+    client = transport.connect(_dispatcher(), metrics=Metrics())
+    return lambda: client.BlockByHeight(0)
+
+def measure(fn: Callable[[], object], repeat: int=5, min_time: float=0.2) -> dict:
+    """
+    Parameters
+    ----------
+    fn : callable
+        callable to time
+    repeat : int
+        number of timed rounds
+    min_time : float
+        least seconds a round takes, the number of calls per round is picked to reach it
+
+    Returns : dict
+    -------
+    calls per round and the median, fastest and standard deviation of time per call (nanoseconds)
+    """
+    timer = timeit.Timer(fn)
+    number, elapsed = 1, 0.0
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    rounds = [t / number * 1e9 for t in timer.repeat(repeat, number)]
+    return {"number": number, "median_ns": statistics.median(rounds), "min_ns": min(rounds), "stdev_ns": statistics.pstdev(rounds)}
+def run(names: List[str], repeat: int=5, min_time: float=0.2) -> dict:
+    """Runs benchmarks and returns their results with the environment they ran in"""
+    results = {}
+    for name in names:
+        results[name] = measure(BENCHMARKS[name](), repeat, min_time)
+        print(f"{name:24} {results[name]['median_ns']:14.1f} ns", file=sys.stderr)
+    return {
+        "meta": {"python": platform.python_version(), "implementation": platform.python_implementation(), "platform": platform.platform(), "codec": codec.BACKEND, "time": int(time.time())},
+        "results": results,
+    }
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    Returns : list
+    -------
+    names of benchmarks whose median is slower than the baseline's by more than threshold
+    """
+    regressions = []
+    for name, result in results["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:24} {'new':>10}")
+            continue
+        ratio = result["median_ns"] / base["median_ns"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "faster"
+        print(f"{name:24} {base['median_ns']:14.1f} -> {result['median_ns']:14.1f} ns {ratio:7.2f}x {flag}")
+    return regressions
+
+def main(argv: Optional[List[str]]=None) -> int:
+    parser = argparse.ArgumentParser(description="Run SDK microbenchmarks")
+    parser.add_argument("--output", help="file results are written to as json")
+    parser.add_argument("--baseline", help="results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="slowdown over the baseline counted as a regression (fraction)")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed rounds")
+    parser.add_argument("--min-time", type=float, default=0.2, help="least seconds a round takes")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args(argv)
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    results = run(names, args.repeat, args.min_time)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4, sort_keys=True)
+    else:
+        print(json.dumps(results, indent=4, sort_keys=True))
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
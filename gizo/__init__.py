@@ -1,9 +1,24 @@
 """ Official python implementation of Gizo SDK """
 
+from gizo.builder import ExecBuilder
+from gizo.cache import BlockCache
 from gizo.dispatcher import Dispatcher
 from gizo.env import Env, Envs
+from gizo.futures import Submitter, ExecError
 from gizo.gizo import Gizo
-from gizo.job import Requests
+from gizo.aio import AsyncGizo
+from gizo.cluster import GizoCluster
+from gizo.admission import AdmissionController
+from gizo.job import Requests, EncodedExec
+from gizo.limits import Limits
+from gizo.metrics import Metrics
+from gizo.models import ExecDetails, Block, BlockHeader, Job, Exec
+from gizo.registry import JobRegistry
+from gizo.replay import Recorder, ReplayClient
+from gizo.store import BlockStore
+from gizo.sync import ChainSync
+from gizo.template import ExecTemplate
+from gizo.watcher import ExecWatcher
 import gizo.priorities as Priorities
 import gizo.utils as Utils
 import gizo.status as Status
\ No newline at end of file
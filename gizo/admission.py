@@ -0,0 +1,217 @@
+"""Admission control of exec submissions"""
+import threading
+import time
+from typing import Any, NamedTuple, Optional
+from gizo.job import exec_job_ids
+
+class Gauges(NamedTuple):
+    """Load of a dispatcher as last sampled"""
+    idle: int
+    """workers not busy"""
+    busy: int
+    """workers busy"""
+    queued: int
+    """execs waiting in the job queue"""
+    pending: int
+    """jobs waiting to be written to the blockchain"""
+    time: float
+    """time.monotonic when sampled"""
+
+class AdmissionController:
+    """Holds submissions locally while the dispatcher is saturated
+    Exposes Solo, Batch, Chain and Chord like Gizo and admits each submission once a token bucket has
+    a token per exec and the dispatcher's queue has room for them. The queue is estimated from
+    WorkersCountNotBusy, WorkersCountBusy, JobQueueCount and PendingCount sampled every interval
+    seconds from one background thread, plus the execs admitted since. Every other attribute is
+    passed through to gizo, so the controller can stand in for it, e.g under a Submitter
+    Parameters
+    ----------
+    gizo : Gizo
+        connected client to submit with
+    rate : float
+        execs admitted per second on average - None for no rate limit
+    burst : int
+        most execs admitted at once after being idle - defaults to rate
+    queue_target : int
+        most execs left waiting in the dispatcher's queue once idle workers are used - defaults to
+        the number of workers
+    pending_target : int
+        most jobs waiting to be written to the blockchain - None for no limit
+    interval : float
+        seconds between samples of the gauges
+    timeout : float
+        seconds a submission waits for admission before raising - None to wait forever
+    """
+    def __init__(self, gizo: Any, rate: Optional[float]=None, burst: Optional[int]=None, queue_target: Optional[int]=None, pending_target: Optional[int]=None, interval: float=1.0, timeout: Optional[float]=None) -> None:
+        self.gizo = gizo
+        self.rate = rate
+        self.burst: float = float(burst if burst is not None else max(rate or 1, 1))
+        self.queue_target = queue_target
+        self.pending_target = pending_target
+        self.interval = interval
+        self.timeout = timeout
+        self.gauges: Optional[Gauges] = None
+        """last sampled gauges - None before the first sample"""
+        self.__tokens: float = self.burst
+        self.__refilled = time.monotonic()
+        self.__since: int = 0
+        self.__admitted: int = 0
+        self.__waited: float = 0.0
+        self.__timeouts: int = 0
+        self.__samples: int = 0
+        self.__failures: int = 0
+        self.__cond = threading.Condition()
+        self.__thread: Optional[threading.Thread] = None
+        self.__stopped = False
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.gizo, name)
+    def start(self) -> "AdmissionController":
+        """Starts sampling the gauges - called by the first submission if not called before"""
+        with self.__cond:
+            if self.__thread is not None and self.__thread.is_alive():
+                return self
+            self.__stopped = False
+            self.__thread = threading.Thread(target=self.__run, name="gizo-admission", daemon=True)
+            self.__thread.start()
+        return self
+    def stop(self) -> None:
+        """Stops sampling the gauges"""
+        with self.__cond:
+            self.__stopped = True
+            self.__cond.notify_all()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+    def sample(self) -> Optional[Gauges]:
+        """Samples the gauges now
+        Returns : Gauges
+        -------
+        gauges sampled - None if the dispatcher couldn't be reached, admission then falls back to the rate limit alone
+        """
+        with self.__cond:
+            since = self.__since
+        try:
+            gauges = Gauges(self.gizo.WorkersCountNotBusy(), self.gizo.WorkersCountBusy(), self.gizo.JobQueueCount(), self.gizo.PendingCount(), time.monotonic())
+        except Exception:
+            gauges = None
+        with self.__cond:
+            self.__samples += 1
+            if gauges is None:
+                self.__failures += 1
+            self.gauges = gauges
+            self.__since -= since
+            self.__cond.notify_all()
+        return gauges
+    def acquire(self, execs: int=1, timeout: Optional[float]=None) -> bool:
+        """Waits until execs can be submitted
+        Parameters
+        ----------
+        execs : int
+            number of execs to submit
+        timeout : float
+            seconds to wait - None to wait forever
+
+        Returns : bool
+        -------
+        True if admitted, False if timeout passed first
+        """
+        self.start()
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        with self.__cond:
+            while True:
+                now = time.monotonic()
+                wait = self.__wait(execs, now)
+                if wait == 0:
+                    if self.rate is not None:
+                        self.__tokens -= execs
+                    self.__since += execs
+                    self.__admitted += execs
+                    self.__waited += now - start
+                    return True
+                if deadline is not None:
+                    if now >= deadline:
+                        self.__timeouts += 1
+                        self.__waited += now - start
+                        return False
+                    wait = min(wait, deadline - now)
+                self.__cond.wait(wait)
+    def stats(self) -> dict:
+        """
+        Returns : dict
+        -------
+        execs admitted, seconds spent waiting, submissions that timed out, samples taken and samples that failed
+        """
+        with self.__cond:
+            return {"admitted": self.__admitted, "waited": self.__waited, "timeouts": self.__timeouts, "samples": self.__samples, "failures": self.__failures}
+    def __wait(self, execs: int, now: float) -> float:
+        """Returns 0 if execs can be admitted now, else seconds to wait before checking again - called holding the lock"""
+        wait = 0.0
+        if self.rate is not None:
+            self.__tokens = min(self.burst, self.__tokens + (now - self.__refilled) * self.rate)
+            self.__refilled = now
+            needed = min(execs, self.burst)
+            if self.__tokens < needed:
+                wait = (needed - self.__tokens) / self.rate
+        gauges = self.gauges
+        if gauges is None:
+            if self.__samples == 0:
+                return max(wait, self.interval)
+            return wait
+        if self.pending_target is not None and gauges.pending + self.__since > self.pending_target:
+            return max(wait, self.interval)
+        target = self.queue_target if self.queue_target is not None else gauges.idle + gauges.busy
+        room = gauges.idle + target - gauges.queued - self.__since
+        if execs > room and not (self.__since == 0 and gauges.queued <= target):
+            return max(wait, self.interval)
+        return wait
+    def __run(self) -> None:
+        while True:
+            self.sample()
+            with self.__cond:
+                self.__cond.wait_for(lambda: self.__stopped, self.interval)
+                if self.__stopped:
+                    return
+    def __admit(self, execs: int) -> None:
+        if not self.acquire(execs, self.timeout):
+            raise Exception("timed out waiting for admission")
+    def Solo(self, jr: Any) -> Any:
+        """ Executes a single exec once admitted
+        Parameters
+        ----------
+        jr : Requests
+            job request
+        """
+        self.__admit(len(exec_job_ids([jr])))
+        return self.gizo.Solo(jr)
+    def Chord(self, jrs: list, callback_jr: Any) -> Any:
+        """ Executes execs one after the other then passes results into callback exec as a list, once admitted
+        Parameters
+        ----------
+        jrs : list
+            list of Reqeusts
+        callback_jr : Requests
+            callback job requests
+        """
+        self.__admit(len(exec_job_ids(list(jrs) + [callback_jr])))
+        return self.gizo.Chord(jrs, callback_jr)
+    def Chain(self, jrs: list) -> Any:
+        """ Executes execs one after the other once admitted
+        Parameters
+        ----------
+        jrs : list
+            list of Requests
+        """
+        self.__admit(len(exec_job_ids(jrs)))
+        return self.gizo.Chain(jrs)
+    def Batch(self, jrs: list) -> Any:
+        """ Executes execs in parallel once admitted
+        Parameters
+        ----------
+        jrs : list
+            list of job requests
+        """
+        self.__admit(len(exec_job_ids(jrs)))
+        return self.gizo.Batch(jrs)
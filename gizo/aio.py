@@ -0,0 +1,863 @@
+"""Asyncio client for dispatcher nodes"""
+import asyncio
+import ssl
+import time
+from io import BytesIO
+from os import path
+from typing import Optional, Any, List, Dict, Sequence, Tuple
+from urllib.parse import urlsplit
+from hprose import HproseException, HproseReader, HproseTags, HproseWriter
+from gizo.centrum import CENTRUM_TESTNET, CENTRUM
+from gizo.dispatcher import Dispatcher
+from gizo.env import Envs
+from gizo.job import Requests
+from gizo.metrics import Metrics, METRICS
+from gizo.registry import JobRegistry, source_hash, write_config
+from gizo.template import ExecTemplate
+from gizo.utils import hash_arg
+import gizo.codec as codec
+import gizo.models as models
+
+def _encode_call(name: str, args: Sequence) -> bytes:
+    """
+    Parameters
+    ----------
+    name : str
+        name of rpc method
+    args : list
+        arguments passed to rpc method
+
+    Returns : bytes
+    -------
+    hprose request body
+    """
+    stream = BytesIO()
+    writer = HproseWriter(stream)
+    stream.write(HproseTags.TagCall)
+    writer.writeString(name)
+    if len(args) > 0:
+        writer.reset()
+        writer.writeList(list(args))
+    stream.write(HproseTags.TagEnd)
+    return stream.getvalue()
+def _decode_reply(data: bytes) -> Any:
+    """
+    Parameters
+    ----------
+    data : bytes
+        hprose response body
+
+    Returns
+    -------
+    result of rpc method
+
+    Raises
+    ------
+    HproseException
+        if the dispatcher returned an error or the response is malformed
+    """
+    if not data or data[-1:] != HproseTags.TagEnd:
+        raise HproseException("Wrong Response: \r\n%s" % str(data, 'utf-8'))
+    stream = BytesIO(data)
+    reader = HproseReader(stream)
+    result = None
+    error = None
+    while True:
+        tag = stream.read(1)
+        if tag == HproseTags.TagEnd:
+            break
+        elif tag == HproseTags.TagResult:
+            reader.reset()
+            result = reader.unserialize()
+        elif tag == HproseTags.TagArgument:
+            reader.reset()
+            reader.readList()
+        elif tag == HproseTags.TagError:
+            reader.reset()
+            error = reader.readString()
+        else:
+            raise HproseException("Wrong Response: \r\n%s" % str(data, 'utf-8'))
+    if error is not None:
+        raise HproseException(error)
+    return result
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes]:
+    """Reads a http/1.1 response off a stream
+    Parameters
+    ----------
+    reader : StreamReader
+        stream to read from
+
+    Returns : tuple
+    -------
+    status code, lower cased headers and body
+
+    Raises
+    ------
+    ConnectionError
+        if the connection was closed before a response was read
+    """
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("connection closed by dispatcher")
+    status = int(line.split(None, 2)[1])
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0], 16)
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        body = b"".join(chunks)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    else:
+        body = await reader.read()
+    return status, headers, body
+async def _http_get(url: str, timeout: Optional[float]=None) -> Tuple[int, bytes]:
+    """Sends a one-off GET request
+    Parameters
+    ----------
+    url : str
+        url to request
+    timeout : float
+        seconds to wait for the response
+
+    Returns : tuple
+    -------
+    status code and body
+    """
+    parsed = urlsplit(url)
+    secure = parsed.scheme == "https"
+    port = parsed.port or (443 if secure else 80)
+    target = parsed.path or "/"
+    if parsed.query:
+        target += "?" + parsed.query
+    async def get() -> Tuple[int, bytes]:
+        reader, writer = await asyncio.open_connection(parsed.hostname, port, ssl=ssl.create_default_context() if secure else None)
+        try:
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: {parsed.netloc}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+            status, _, body = await _read_response(reader)
+            return status, body
+        finally:
+            writer.close()
+    return await asyncio.wait_for(get(), timeout)
+
+class AsyncClient:
+    """Hprose over http client with a keep-alive connection pool for asyncio
+    Parameters
+    ----------
+    uri : str
+        rpc endpoint of dispatcher
+    max_connections : int
+        maximum number of rpc calls in flight at once
+    timeout : float
+        seconds to wait for a single rpc call
+    metrics : Metrics
+        metrics calls are recorded to - defaults to metrics.METRICS
+    """
+    def __init__(self, uri: str, max_connections: int=100, timeout: float=30, metrics: Optional[Metrics]=None) -> None:
+        parsed = urlsplit(uri)
+        self.uri = uri
+        self.timeout = timeout
+        self.metrics: Metrics = metrics if metrics is not None else METRICS
+        self.dispatcher: str = parsed.netloc
+        self.__host: str = parsed.hostname
+        self.__port: int = parsed.port or 80
+        self.__path: str = parsed.path or "/"
+        self.__idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.__limit = asyncio.Semaphore(max_connections)
+    async def invoke(self, name: str, args: Sequence=()) -> Any:
+        """Calls an rpc method on the dispatcher
+        Parameters
+        ----------
+        name : str
+            name of rpc method
+        args : list
+            arguments passed to rpc method
+
+        Returns
+        -------
+        result of rpc method
+
+        Raises
+        ------
+        HproseException
+            if the dispatcher returned an error
+        """
+        body = _encode_call(name, args)
+        received = 0
+        error = None
+        start = time.perf_counter()
+        try:
+            async with self.__limit:
+                reply = await asyncio.wait_for(self.__post(body), self.timeout)
+            received = len(reply)
+            return _decode_reply(reply)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.metrics.record(name, self.dispatcher, time.perf_counter() - start, error, len(body), received)
+    async def close(self) -> None:
+        """Closes all idle connections"""
+        while self.__idle:
+            _, writer = self.__idle.pop()
+            writer.close()
+    async def __post(self, body: bytes) -> bytes:
+        """Posts a request body, reusing an idle connection when one is available
+        Parameters
+        ----------
+        body : bytes
+            hprose request body
+
+        Returns : bytes
+        -------
+        hprose response body
+        """
+        head = (f"POST {self.__path} HTTP/1.1\r\nHost: {self.__host}:{self.__port}\r\n"
+                f"Content-Type: application/hprose\r\nContent-Length: {len(body)}\r\n"
+                "Connection: keep-alive\r\n\r\n").encode("latin-1")
+        while True:
+            reused = len(self.__idle) > 0
+            if reused:
+                reader, writer = self.__idle.pop()
+            else:
+                reader, writer = await asyncio.open_connection(self.__host, self.__port)
+            try:
+                writer.write(head + body)
+                await writer.drain()
+                status, headers, data = await _read_response(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused:
+                    continue # stale keep-alive connection, retry on a fresh one
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            if headers.get("connection", "").lower() == "close":
+                writer.close()
+            else:
+                self.__idle.append((reader, writer))
+            if status != 200:
+                raise HproseException(f"{status}:dispatcher returned an error")
+            return data
+
+class AsyncGizo:
+    """Connects to dispatcher and exposes rpc methods as coroutines
+    Parameters
+    ----------
+    url : str
+        url of specific dispatcher to connect to
+    export_file : str
+        file for config to be written
+    test : bool
+        specifies if sdk should connect to testnet or prod network
+    max_connections : int
+        maximum number of rpc calls in flight at once
+    payloads : str
+        form of json payloads returned by rpc methods - codec.DECODED decodes them, codec.BYTES and
+        codec.MEMORYVIEW return them undecoded
+    typed : bool
+        return blocks, jobs and execs as the models Block, Job and Exec instead of dicts
+    metrics : Metrics
+        metrics every rpc call is recorded to - defaults to metrics.METRICS
+    centrum : str
+        url of centrum dispatchers are found through - defaults to the test or main network's
+
+    Config is shared with Gizo, the connection is made by awaiting connect()
+    or entering the client as an async context manager
+
+    Raises
+    ------
+    Exception
+        if unable to connect to centrum
+        if unable to connect to a specified dispatcher
+        if no dispatchers are available
+    """
+    def __init__(self, url: Optional[str]=None, export_file: Optional[str]=None, test: bool=False, max_connections: int=100, payloads: str=codec.DECODED, typed: bool=False, metrics: Optional[Metrics]=None, centrum: Optional[str]=None) -> None:
+        self.__dispatcher: Optional[Dispatcher] = None
+        self.__client: Optional[AsyncClient] = None
+        self.__config: str
+        self.__keys: dict = {}
+        self.__test: bool = test
+        self.__centrum: str = centrum if centrum is not None else (CENTRUM_TESTNET if test else CENTRUM)
+        self.__url: Optional[str] = url
+        self.__max_connections: int = max_connections
+        self.__payloads: str = payloads
+        self.__typed: bool = typed
+        self.metrics: Metrics = metrics if metrics is not None else METRICS
+
+        if export_file is None:
+            if self.__test:
+                self.__config = ".gizo-test"
+            else:
+                self.__config = ".gizo"
+        else:
+            self.__config = export_file
+        self.jobs: JobRegistry = JobRegistry(f"{self.__config}.db")
+        """Holds jobs deployed from the SDK
+        Key value pair of job name and Job ID, shared with Gizo
+        """
+    async def __aenter__(self) -> "AsyncGizo":
+        return await self.connect()
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+    async def connect(self) -> "AsyncGizo":
+        """Connects to a dispatcher, following the same rules as Gizo
+        Returns : AsyncGizo
+        -------
+        the connected client
+
+        Raises
+        ------
+        Exception
+            if unable to connect to centrum
+            if unable to connect to a specified dispatcher
+            if no dispatchers are available
+        """
+        if path.isfile(self.__config):
+            try:
+                self.__import_config()
+                if (await _http_get(self.__dispatcher.status(), timeout=0.5))[0] != 200:
+                    raise Exception("dispatcher unavailable")
+                self.__client = self.__connect_dispatcher(self.__dispatcher)
+            except Exception:
+                self.__dispatcher = None
+                await self.__connect()
+                self.__export_config()
+        else:
+            if self.__url != None:
+                try:
+                    self.__dispatcher = Dispatcher(self.__url)
+                    if (await _http_get(self.__dispatcher.status(), timeout=0.5))[0] != 200:
+                        raise Exception("dispatcher unavailable")
+                    self.__client = self.__connect_dispatcher(self.__dispatcher)
+                    self.__keys = await self.KeyPair()
+                    self.__export_config()
+                except Exception:
+                    raise Exception("unable to connect to dispatcher")
+            else:
+                await self.__connect()
+                self.__keys = await self.KeyPair()
+                self.__export_config()
+        return self
+    async def close(self) -> None:
+        """Closes pooled connections to the dispatcher"""
+        if self.__client is not None:
+            await self.__client.close()
+    def __import_config(self) -> None:
+        """Imports dispatcher and keys from config file
+        Raises
+        ------
+        IOError
+            If the file could not be read.
+        """
+        with open(self.__config, "r") as f:
+            content = codec.loads(f.read())
+        self.__dispatcher = Dispatcher(content["dispatcher"])
+        self.__keys = content["keys"]
+        if content.get("jobs"):
+            self.jobs.update_missing(content["jobs"])
+    def __export_config(self) -> None:
+        """Exports dispatcher and keys to config file atomically, jobs are kept in the job registry
+        Raises
+        ------
+        IOError
+            If the file could not be written.
+        """
+        temp: dict = {}
+        temp["dispatcher"] = self.__dispatcher.url
+        temp["keys"] = self.__keys
+        temp["jobs"] = {}
+        write_config(self.__config, temp)
+    async def __connect(self) -> None:
+        """Connects to a dispatcher
+        Raises
+        ------
+        Exception
+            if no dispatchers available
+            if unable to connect to centrum
+        """
+        status, body = await _http_get(f"{self.__centrum}/v1/dispatchers")
+        if status == 200:
+            for dispatcher in codec.loads(body):
+                try:
+                    temp = Dispatcher(dispatcher)
+                    self.__client = self.__connect_dispatcher(temp)
+                    self.__dispatcher = temp
+                    break
+                except Exception:
+                    pass
+            if self.__dispatcher == None:
+                raise Exception("no dispatchers available")
+        else:
+            raise Exception("unable to connect to centrum")
+    def __connect_dispatcher(self, dispatcher: Dispatcher) -> AsyncClient:
+        """Connects to a specified dispatcher
+        Parameters
+        ----------
+        dispatcher : Dispatcher
+            object of dispatcher to connect
+
+        Returns : AsyncClient
+        -------
+        pooled hprose connection
+        """
+        return AsyncClient(dispatcher.rpc(), max_connections=self.__max_connections, metrics=self.metrics)
+    async def __call(self, name: str, *args: Any) -> Any:
+        if self.__client is None:
+            raise Exception("not connected to a dispatcher - await connect() first")
+        return await self.__client.invoke(name, args)
+    def __model(self, raw: Any, model: Any) -> Any:
+        """Returns an rpc payload in the form set by payloads, built into model if typed"""
+        if self.__typed and self.__payloads == codec.DECODED:
+            return model(raw)
+        return codec.decode(raw, self.__payloads)
+    async def gather(self, method: str, calls: Sequence[Sequence], return_exceptions: bool=False) -> list:
+        """Runs many calls of one rpc method concurrently
+        Parameters
+        ----------
+        method : str
+            name of method on AsyncGizo e.g "ExecStatus"
+        calls : list
+            arguments of each call e.g [(job_id, exec_hash), ...]
+        return_exceptions : bool
+            return exceptions in place of results instead of raising the first one
+
+        Returns : list
+        -------
+        results in the same order as calls
+        """
+        fn = getattr(self, method)
+        return await asyncio.gather(*[fn(*args) for args in calls], return_exceptions=return_exceptions)
+    async def Version(self) -> dict:
+        """
+        Returns : dict
+        -------
+        dispatcher node's version information"""
+        return codec.decode(await self.__call("Version"), self.__payloads)
+    async def PeerCount(self) -> int:
+        """
+        Returns : int
+        -------
+        the number of peers a node has"""
+        return await self.__call("PeerCount")
+    async def BlockByHash(self, hash: str) -> dict:
+        """
+        Returns : dict
+        -------
+        block of specified hash
+        """
+        return self.__model(await self.__call("BlockByHash", hash), models.Block)
+    async def BlockByHeight(self, height: int) -> dict:
+        """
+        Returns : dict
+        -------
+        block at specified height
+        """
+        return self.__model(await self.__call("BlockByHeight", height), models.Block)
+    async def Latest15Blocks(self) -> list:
+        """
+        Returns : list
+        -------
+        list of most recent 15 blocks
+        """
+        return self.__model(await self.__call("Latest15Blocks"), lambda raw: [models.Block(b) for b in codec.loads(raw)])
+    async def LatestBlock(self) -> dict:
+        """
+        Returns : dict
+        -------
+        latest block in the blockchain
+        """
+        return self.__model(await self.__call("LatestBlock"), models.Block)
+    async def PendingCount(self) -> int:
+        """
+        Returns : int
+        -------
+        number of jobs waiting to be written to the blockchain
+        """
+        return await self.__call("PendingCount")
+    async def Score(self) -> float:
+        """
+        Returns : float
+        -------
+        benchmark score of node
+        """
+        return await self.__call("Score")
+    async def Peers(self) -> list:
+        """
+        Returns : list
+        -------
+        public keys of its peers
+        """
+        return await self.__call("Peers")
+    async def PublicKey(self) -> str:
+        """
+        Returns : str
+        -------
+        public key of node
+        """
+        return await self.__call("PublicKey")
+    async def NewJob(self, fn: str, name: str, priv: bool, force: bool=False) -> str:
+        """
+        Deploys Job to the Blockchain and writes job name and id to jobs variable
+        A job whose source, name and privacy match an earlier deploy isn't deployed again, the earlier ID is returned
+        Parameters
+        ---------
+        fn : str
+            job file
+        name : str
+            name of main function - entry point into job
+        priv : bool
+            specified if job is private / public
+        force : bool
+            deploy even if the same job was deployed before
+
+        Returns : str
+        -------
+        ID of deployed job
+
+        Raises
+        ------
+        Exception
+            if fn is not an anko file (.ank)
+        """
+        if fn.find(".ank") == -1:
+            raise Exception("only anko files accepted")
+        with open(fn, "r") as f:
+            task = f.read()
+        source = source_hash(task)
+        job_id = None if force else self.jobs.deployed(source, name, priv)
+        if job_id is not None:
+            if self.jobs.get(name) != job_id:
+                self.jobs[name] = job_id
+            return job_id
+        job_id = await self.__call("NewJob", task, name, priv, self.__keys['priv'])
+        self.jobs.record_deploy(source, name, priv, job_id)
+        return job_id
+    async def NewExec(self, args: list, retries: int, priority: int, backoff: int, exec_time: int, interval: int, ttl: int, envs: Envs) -> dict:
+        """
+        Returns : dict
+        -------
+        exec with specified config - see Gizo.NewExec for parameters
+        """
+        return self.__model(await self.__call("NewExec", args, retries, priority, backoff, exec_time, interval, ttl, self.__keys['pub'], codec.dumps(envs.envs)), models.Exec)
+    async def NewExecTemplate(self, job_id: str, retries: int, priority: int, backoff: int, exec_time: int, interval: int, ttl: int, envs: Envs) -> ExecTemplate:
+        """
+        Returns : ExecTemplate
+        -------
+        template of exec with specified config - see Gizo.NewExecTemplate
+        """
+        return ExecTemplate(job_id, codec.loads(await self.__call("NewExec", [], retries, priority, backoff, exec_time, interval, ttl, self.__keys['pub'], codec.dumps(envs.envs))))
+    async def WorkersCount(self) -> int:
+        """
+        Returns : int
+        -------
+        number of workers in a dispatchers standard area
+        """
+        return await self.__call("WorkersCount")
+    async def WorkersCountBusy(self) -> int:
+        """
+        Returns : int
+        -------
+        number of workers in a dispatchers standard area that are busy
+        """
+        return await self.__call("WorkersCountBusy")
+    async def WorkersCountNotBusy(self) -> int:
+        """
+        Returns : int
+        -------
+        number of workers in a dispatchers standard area that are not busy
+        """
+        return await self.__call("WorkersCountNotBusy")
+    async def ExecStatus(self, job_id: str, exec_hash: list) -> str:
+        """
+        Returns : str
+        -------
+        status of exec
+        """
+        return await self.__call("ExecStatus", job_id, hash_arg(exec_hash))
+    async def CancelExec(self, exec_hash: list) -> Any:
+        """
+        Raises
+        ------
+        Exception
+            if exec isn't running
+        """
+        return await self.__call("CancelExec", hash_arg(exec_hash))
+    async def ExecTimestamp(self, job_id: str, exec_hash: list) -> int:
+        """
+        Returns : int
+        -------
+        timestamp of exec - when the job started running (unix)
+        """
+        return await self.__call("ExecTimestamp", job_id, hash_arg(exec_hash))
+    async def ExecTimestampString(self, job_id: str, exec_hash: list) -> str:
+        """
+        Returns : str
+        -------
+        timestamp of exec - when the job started running (string)
+        """
+        return await self.__call("ExecTimestampString", job_id, hash_arg(exec_hash))
+    async def ExecDurationNanoseconds(self, job_id: str, exec_hash: list) -> int:
+        """
+        Returns : int
+        -------
+        duration of an exec in nanoseconds
+        """
+        return await self.__call("ExecDurationNanoseconds", job_id, hash_arg(exec_hash))
+    async def ExecDurationSeconds(self, job_id: str, exec_hash: list) -> float:
+        """
+        Returns : float
+        -------
+        duration of an exec in seconds
+        """
+        return await self.__call("ExecDurationSeconds", job_id, hash_arg(exec_hash))
+    async def ExecDurationMinutes(self, job_id: str, exec_hash: list) -> float:
+        """
+        Returns : float
+        -------
+        duration of an exec in minutes
+        """
+        return await self.__call("ExecDurationMinutes", job_id, hash_arg(exec_hash))
+    async def ExecDurationString(self, job_id: str, exec_hash: list) -> str:
+        """
+        Returns : str
+        -------
+        duration of an exec as string
+        """
+        return await self.__call("ExecDurationString", job_id, hash_arg(exec_hash))
+    async def ExecArgs(self, job_id: str, exec_hash: list) -> list:
+        """
+        Returns : list
+        -------
+        arguments of an exec
+        """
+        return await self.__call("ExecArgs", job_id, hash_arg(exec_hash))
+    async def ExecErr(self, job_id: str, exec_hash: list) -> Any:
+        """
+        Returns
+        -------
+        error of an exec - None if no error occured
+        """
+        return await self.__call("ExecErr", job_id, hash_arg(exec_hash))
+    async def ExecPriority(self, job_id: str, exec_hash: list) -> int:
+        """
+        Returns : int
+        -------
+        priority of an exec
+        """
+        return await self.__call("ExecPriority", job_id, hash_arg(exec_hash))
+    async def ExecResult(self, job_id: str, exec_hash: list) -> Any:
+        """
+        Returns
+        -------
+        result of an exec - None if error occurs
+        """
+        return await self.__call("ExecResult", job_id, hash_arg(exec_hash))
+    async def ExecRetries(self, job_id: str, exec_hash: list) -> int:
+        """
+        Returns : int
+        -------
+        number of retries attempted by the worker
+        """
+        return await self.__call("ExecRetries", job_id, hash_arg(exec_hash))
+    async def ExecBackoff(self, job_id: str, exec_hash: list) -> float:
+        """
+        Returns : float
+        -------
+        time between retries of an exec(seconds)
+        """
+        return await self.__call("ExecBackoff", job_id, hash_arg(exec_hash))
+    async def ExecExecutionTime(self, job_id: str, exec_hash: list) -> int:
+        """
+        Returns : int
+        -------
+        scheduled time of exec (unix)
+        """
+        return await self.__call("ExecExecutionTime", job_id, hash_arg(exec_hash))
+    async def ExecExecutionTimeString(self, job_id: str, exec_hash: list) -> str:
+        """
+        Returns : str
+        -------
+        scheduled time of exec (string)
+        """
+        return await self.__call("ExecExecutionTimeString", job_id, hash_arg(exec_hash))
+    async def ExecInterval(self, job_id: str, exec_hash: list) -> int:
+        """
+        Returns : int
+        -------
+        time between retries of an exec(seconds)
+        """
+        return await self.__call("ExecInterval", job_id, hash_arg(exec_hash))
+    async def ExecBy(self, job_id: str, exec_hash: list) -> str:
+        """
+        Returns : str
+        -------
+        public key of worker that executed the job
+        """
+        return await self.__call("ExecBy", job_id, hash_arg(exec_hash))
+    async def ExecTtlNanoseconds(self, job_id: str, exec_hash: list) -> int:
+        """
+        Returns : int
+        -------
+        tll of exec (nanoseconds)
+        """
+        return await self.__call("ExecTtlNanoseconds", job_id, hash_arg(exec_hash))
+    async def ExecTtlSeconds(self, job_id: str, exec_hash: list) -> float:
+        """
+        Returns : float
+        -------
+        ttl of exec (seconds)
+        """
+        return await self.__call("ExecTtlSeconds", job_id, hash_arg(exec_hash))
+    async def ExecTtlMinutes(self, job_id: str, exec_hash: list) -> float:
+        """
+        Returns : float
+        -------
+        ttl of exec (minutes)
+        """
+        return await self.__call("ExecTtlMinutes", job_id, hash_arg(exec_hash))
+    async def ExecTtlHours(self, job_id: str, exec_hash: list) -> float:
+        """
+        Returns : float
+        -------
+        ttl of exec (hours)
+        """
+        return await self.__call("ExecTtlHours", job_id, hash_arg(exec_hash))
+    async def ExecTtlString(self, job_id: str, exec_hash: list) -> str:
+        """
+        Returns : str
+        -------
+        ttl of exec (string)
+        """
+        return await self.__call("ExecTtlString", job_id, hash_arg(exec_hash))
+    async def JobQueueCount(self) -> int:
+        """
+        Returns : int
+        -------
+        number of jobs waiting to be executed
+        """
+        return await self.__call("JobQueueCount")
+    async def LatestBlockHeight(self) -> int:
+        """
+        Returns : int
+        -------
+        height of latest block in the blockchain
+        """
+        return await self.__call("LatestBlockHeight")
+    async def Job(self, job_id: str) -> dict:
+        """
+        Returns : dict
+        -------
+        job
+        """
+        return self.__model(await self.__call("Job", job_id), models.Job)
+    async def JobSubmisstionTimeUnix(self, job_id: str) -> int:
+        """
+        Returns : int
+        -------
+        submission time of job (unix)
+        """
+        return await self.__call("JobSubmisstionTimeUnix", job_id)
+    async def JobSubmisstionTimeString(self, job_id: str) -> str:
+        """
+        Returns : str
+        -------
+        submission time of job (string)
+        """
+        return await self.__call("JobSubmisstionTimeString", job_id)
+    async def IsJobPrivate(self, job_id: str) -> bool:
+        """
+        Returns : bool
+        -------
+        if job is  private (true) / public (false)
+        """
+        return await self.__call("IsJobPrivate", job_id)
+    async def JobName(self, job_id: str) -> str:
+        """
+        Returns : str
+        -------
+        name of job
+        """
+        return await self.__call("JobName", job_id)
+    async def JobLatestExec(self, job_id: str) -> dict:
+        """
+        Returns : dict
+        -------
+        latest exec of job
+        """
+        return self.__model(await self.__call("JobLatestExec", job_id), models.Exec)
+    async def JobExecs(self, job_id: str) -> dict:
+        """
+        Returns : dict
+        -------
+        all execs of a job
+        """
+        return self.__model(await self.__call("JobExecs", job_id), lambda raw: [models.Exec(e) for e in codec.loads(raw)])
+    async def BlockHashesHex(self) -> list:
+        """
+        Returns : list
+        -------
+        hashes of blocks in the blockchain
+        """
+        return await self.__call("BlockHashesHex")
+    async def KeyPair(self) -> dict:
+        """
+        Returns : dict
+        -------
+        pub and priv keys
+        """
+        return codec.loads(await self.__call("KeyPair"))
+    async def Solo(self, jr: Requests) -> Any:
+        """ Executes a single exec
+        Parameters
+        ----------
+        jr : Requests
+            job request
+        """
+        return await self.__call("Solo", jr.jrs())
+    async def Chord(self, jrs: list, callback_jr: Requests) -> Any:
+        """ Executes execs one after the other then passes results into callback exec as a list
+        Parameters
+        ----------
+        jrs : list
+            list of Reqeusts
+        callback_jr : Requests
+            callback job requests
+        """
+        return await self.__call("Chord", jrs, callback_jr)
+    async def Chain(self, jrs: list) -> Any:
+        """ Executes execs one after the other (allows multiple jobs and multiple execs)
+        Parameters
+        ----------
+        jrs : list
+            list of Requests
+        """
+        return await self.__call("Chain", jrs)
+    async def Batch(self, jrs: list) -> Any:
+        """ Executes execs in parallel
+        Parameters
+        ----------
+        jrs : list
+            list of job requests
+
+        Raises
+        ------
+        Exception
+            if number of execs surpasses gizo limit
+            if ttl duration surpases gizo limit
+            if number of retries is greated
+        """
+        return await self.__call("Batch", jrs)
@@ -0,0 +1,91 @@
+"""Local exec builder"""
+import threading
+from typing import Callable, Dict
+import gizo.codec as codec
+import gizo.status as status
+from gizo.env import Envs
+
+BACKOFF_UNIT: int = 10 ** 9
+"""Nanoseconds per unit of backoff passed to NewExec (seconds)"""
+TTL_UNIT: int = 60 * 10 ** 9
+"""Nanoseconds per unit of ttl passed to NewExec (minutes)"""
+
+class ExecBuilder:
+    """Builds execs locally in the structure NewExec returns
+    Every field but Envs is worked out from the arguments. Envs are encrypted by the dispatcher, so the
+    first exec built with a set of envs gets them encrypted with encrypt, later execs with the same envs
+    reuse the encrypted value - building N execs with the same envs costs one round trip instead of N
+    Parameters
+    ----------
+    pub : str
+        public key of sender
+    encrypt : callable
+        takes json of envs and returns them encrypted by the dispatcher
+    """
+    def __init__(self, pub: str, encrypt: Callable[[str], str]) -> None:
+        self.pub = pub
+        self.encrypt = encrypt
+        self.__envs: Dict[str, str] = {}
+        self.__lock = threading.Lock()
+    def envs(self, envs: Envs) -> str:
+        """
+        Parameters
+        ----------
+        envs : Envs
+            environments variables provided to exec
+
+        Returns : str
+        -------
+        envs encrypted by the dispatcher
+        """
+        key = codec.dumps(envs.envs)
+        encrypted = self.__envs.get(key)
+        if encrypted is None:
+            encrypted = self.encrypt(key)
+            with self.__lock:
+                encrypted = self.__envs.setdefault(key, encrypted)
+        return encrypted
+    def build(self, args: list, retries: int, priority: int, backoff: int, exec_time: int, interval: int, ttl: int, envs: Envs) -> dict:
+        """
+        Parameters
+        ----------
+        args : list
+            parameters passed into job
+        retries : int
+            number of max times to run the job on fail
+        priority : int
+            priority of exec
+        backoff : int
+            time between retries (seconds)
+        exec_time : int
+            unix of time to when exec should should be scheduled
+        interval : int
+            time between periodic execs (seconds)
+        ttl : int
+            time limit of job running (minutes)
+        envs : Envs
+            environments variables provided to exec
+
+        Returns : dict
+        -------
+        exec with specified config, as NewExec returns it
+        """
+        return {
+            "Hash": None,
+            "Timestamp": 0,
+            "Duration": 0,
+            "Args": args,
+            "Err": None,
+            "Priority": priority,
+            "Result": None,
+            "Status": status.STARTED,
+            "Retries": retries,
+            "RetriesCount": 0,
+            "Backoff": backoff * BACKOFF_UNIT,
+            "ExecutionTime": exec_time,
+            "Interval": interval,
+            "By": "",
+            "TTL": ttl * TTL_UNIT,
+            "Pub": self.pub,
+            "Envs": self.envs(envs),
+        }
@@ -0,0 +1,124 @@
+"""In-memory block cache"""
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple
+from gizo.utils import b64_to_hex
+
+class BlockCache:
+    """Bounded LRU cache of blocks indexed by both hash and height
+    Blocks never change once written so any block below the chain tip is served from memory,
+    the block at the tip is always refetched in case the chain reorganizes
+    Parameters
+    ----------
+    max_blocks : int
+        maximum number of blocks held - 0 disables the cache
+    max_bytes : int
+        maximum total size of held blocks (size of their json payloads) - None for no limit
+    """
+    def __init__(self, max_blocks: int=1024, max_bytes: Optional[int]=None) -> None:
+        self.max_blocks = max_blocks
+        self.max_bytes = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.size: int = 0
+        """total size of held blocks in bytes"""
+        self.tip: int = -1
+        """height of the latest block seen"""
+        self.__blocks: "OrderedDict[str, Tuple[dict, int]]" = OrderedDict()
+        self.__heights: Dict[int, str] = {}
+        self.__lock = threading.Lock()
+    def __len__(self) -> int:
+        return len(self.__blocks)
+    def get_by_hash(self, hash: str) -> Optional[dict]:
+        """
+        Parameters
+        ----------
+        hash : str
+            hex hash of block
+
+        Returns : dict
+        -------
+        cached block - None on a miss
+        """
+        with self.__lock:
+            return self.__get(hash.lower())
+    def get_by_height(self, height: int) -> Optional[dict]:
+        """
+        Parameters
+        ----------
+        height : int
+            height of block
+
+        Returns : dict
+        -------
+        cached block - None on a miss or if the block is at the tip
+        """
+        with self.__lock:
+            if height >= self.tip:
+                self.misses += 1
+                return None
+            return self.__get(self.__heights.get(height))
+    def put(self, block: dict, size: int=0) -> None:
+        """Caches a block, evicting the least recently used blocks past the limits
+        Parameters
+        ----------
+        block : dict
+            block as returned by the dispatcher
+        size : int
+            size of the block's json payload
+        """
+        if self.max_blocks <= 0:
+            return
+        hash = b64_to_hex(block["Header"]["Hash"])
+        height = block["Height"]
+        with self.__lock:
+            if hash in self.__blocks:
+                self.size -= self.__blocks.pop(hash)[1]
+            replaced = self.__heights.get(height)
+            if replaced is not None and replaced != hash and replaced in self.__blocks:
+                self.size -= self.__blocks.pop(replaced)[1]
+            self.__blocks[hash] = (block, size)
+            self.__heights[height] = hash
+            self.size += size
+            if height > self.tip:
+                self.tip = height
+            self.__evict()
+    def observe_tip(self, height: int) -> None:
+        """Records the chain's latest height so blocks below it are served from the cache
+        Parameters
+        ----------
+        height : int
+            height of latest block
+        """
+        with self.__lock:
+            if height > self.tip:
+                self.tip = height
+    def clear(self) -> None:
+        """Drops every cached block"""
+        with self.__lock:
+            self.__blocks.clear()
+            self.__heights.clear()
+            self.size = 0
+    def stats(self) -> dict:
+        """
+        Returns : dict
+        -------
+        hits, misses, evictions, blocks held and bytes held
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "blocks": len(self.__blocks), "bytes": self.size}
+    def __get(self, hash: Optional[str]) -> Optional[dict]:
+        entry = self.__blocks.get(hash) if hash is not None else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.__blocks.move_to_end(hash)
+        self.hits += 1
+        return entry[0]
+    def __evict(self) -> None:
+        while self.__blocks and (len(self.__blocks) > self.max_blocks or (self.max_bytes is not None and self.size > self.max_bytes)):
+            hash, (block, size) = self.__blocks.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+            if self.__heights.get(block["Height"]) == hash:
+                del self.__heights[block["Height"]]
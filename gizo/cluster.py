@@ -0,0 +1,431 @@
+"""Client spreading submissions across several dispatchers"""
+import base64
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import requests
+from hprose import HproseException
+from gizo.centrum import CENTRUM_TESTNET, CENTRUM
+from gizo.dispatcher import Dispatcher
+from gizo.gizo import Gizo, PROBE_TIMEOUT
+from gizo.job import Requests, exec_job_ids, reply_execs
+from gizo.metrics import Metrics
+import gizo.limits as limits
+import gizo.models as models
+import gizo.transport as transport
+
+OWNERS: int = 100000
+"""Most exec hashes whose dispatcher is remembered"""
+VISIBLE_TIMEOUT: float = 30.0
+"""Seconds NewJob waits for a deployed job to be seen by every dispatcher"""
+
+class Member:
+    """Dispatcher of a cluster and its load as last sampled"""
+    def __init__(self, url: str, gizo: Gizo) -> None:
+        self.url: str = url
+        self.gizo: Gizo = gizo
+        """client connected to the dispatcher"""
+        self.score: float = 0.0
+        """benchmark score of the dispatcher"""
+        self.idle: int = 0
+        """workers not busy"""
+        self.queued: int = 0
+        """execs waiting in the job queue"""
+        self.inflight: int = 0
+        """execs routed to the dispatcher since the last sample"""
+        self.healthy: bool = True
+        self.submitted: int = 0
+        """execs submitted to the dispatcher"""
+        self.failures: int = 0
+        """samples and submissions that failed"""
+    @property
+    def spare(self) -> int:
+        """idle workers left once the queue and execs routed since the last sample are taken"""
+        return self.idle - self.queued - self.inflight
+    def __repr__(self) -> str:
+        return f"Member({self.url!r}, score={self.score}, idle={self.idle}, queued={self.queued}, inflight={self.inflight}, healthy={self.healthy})"
+
+def _unavailable(e: Exception) -> bool:
+    """
+    Returns : bool
+    -------
+    True if the call failed before reaching the dispatcher, so it is safe to send elsewhere
+    """
+    if isinstance(e, requests.exceptions.ConnectionError):
+        return True
+    return isinstance(e, HproseException) and str(e).startswith("503:")
+
+class GizoCluster:
+    """Connects to several dispatchers and routes submissions to the one with the most spare capacity
+    Solo, Batch, Chain and Chord go to the healthy dispatcher with the most idle workers left once
+    its queue and the execs routed to it since the last sample are taken, higher score first on a
+    tie. Score, WorkersCountNotBusy and JobQueueCount of every dispatcher are sampled every interval
+    seconds from one background thread. A submission that can't reach its dispatcher marks it
+    unhealthy and goes to the next one. The dispatcher of every exec submitted is remembered, so
+    CancelExec, ExecDetails and the Exec* methods are answered by the dispatcher running it. Every
+    other attribute is passed through to the primary client, which holds the keys and job registry
+    every member shares. A job is deployed once, through the primary - submissions can only be
+    routed to dispatchers that see it on the chain, so NewJob and NewJobs wait until every healthy
+    dispatcher does. Jobs deployed another way must be visible to every dispatcher before their
+    execs are submitted through the cluster
+    Parameters
+    ----------
+    urls : list
+        urls of dispatchers to use - defaults to every dispatcher from centrum
+    export_file : str
+        file for config to be written
+    test : bool
+        specifies if sdk should connect to testnet or prod network
+    centrum : str
+        url of centrum dispatchers are found through - defaults to the test or main network's
+    interval : float
+        seconds between samples of the dispatchers' load
+    pool_size : int
+        number of keep-alive connections kept open to each dispatcher
+    idle_timeout : float
+        seconds a connection pool may sit unused before its connections are dropped
+    metrics : Metrics
+        metrics every rpc call is recorded to - defaults to metrics.METRICS
+    owners : int
+        most exec hashes whose dispatcher is remembered, the oldest are forgotten first
+    limits : Limits
+        limits submissions are checked against before sending - None to leave checking to the dispatchers
+
+    Raises
+    ------
+    Exception
+        if unable to connect to centrum
+        if no dispatchers are available
+    """
+    def __init__(self, urls: Optional[List[str]]=None, export_file: Optional[str]=None, test: bool=False, centrum: Optional[str]=None, interval: float=1.0, pool_size: int=transport.POOL_SIZE, idle_timeout: float=transport.IDLE_TIMEOUT, metrics: Optional[Metrics]=None, owners: int=OWNERS, limits: Optional[limits.Limits]=limits.DEFAULT) -> None:
+        if centrum is None:
+            centrum = CENTRUM_TESTNET if test else CENTRUM
+        if export_file is None:
+            export_file = ".gizo-test" if test else ".gizo"
+        self.interval = interval
+        self.__owners: "OrderedDict[str, Member]" = OrderedDict()
+        self.__max_owners = owners
+        self.__lock = threading.Condition()
+        self.__thread: Optional[threading.Thread] = None
+        self.__stopped = False
+        if urls is None:
+            r = requests.get(f"{centrum}/v1/dispatchers")
+            if r.status_code != 200:
+                raise Exception("unable to connect to centrum")
+            urls = r.json()
+        healthy = [url for url in urls if self.__healthy(Dispatcher(url), pool_size, idle_timeout)]
+        primary: Optional[Gizo] = None
+        for url in healthy:
+            try:
+                primary = Gizo(url=url, export_file=export_file, test=test, pool_size=pool_size, idle_timeout=idle_timeout, metrics=metrics, centrum=centrum, limits=limits)
+                break
+            except Exception:
+                pass
+        if primary is None:
+            raise Exception("no dispatchers available")
+        self.primary: Gizo = primary
+        """client non-routed calls are made with, connected to the first healthy dispatcher - its config file holds the keys every member uses"""
+        self.members: List[Member] = []
+        """dispatchers submissions are routed to"""
+        for url in healthy:
+            client = transport.connect(Dispatcher(url), pool_size, idle_timeout, metrics)
+            self.members.append(Member(url, Gizo(export_file=export_file, metrics=metrics, client=client, limits=limits)))
+        self.sample()
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name.startswith("Exec"):
+            method = name
+            def owned(*args: Any) -> Any:
+                return getattr(self.owner(args[-1]), method)(*args)
+            return owned
+        return getattr(self.primary, name)
+    def start(self) -> "GizoCluster":
+        """Starts sampling the dispatchers - called by the first submission if not called before"""
+        with self.__lock:
+            if self.__thread is not None and self.__thread.is_alive():
+                return self
+            self.__stopped = False
+            self.__thread = threading.Thread(target=self.__run, name="gizo-cluster", daemon=True)
+            self.__thread.start()
+        return self
+    def stop(self) -> None:
+        """Stops sampling the dispatchers"""
+        with self.__lock:
+            self.__stopped = True
+            self.__lock.notify_all()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+    def sample(self) -> List[Member]:
+        """Samples every dispatcher's load now, concurrently
+        Returns : list
+        -------
+        members - a member that couldn't be sampled is marked unhealthy until it can
+        """
+        with self.__lock:
+            since = [m.inflight for m in self.members]
+        with ThreadPoolExecutor(max_workers=min(len(self.members), 32)) as pool:
+            samples = list(pool.map(self.__sample, self.members))
+        with self.__lock:
+            for member, inflight, sampled in zip(self.members, since, samples):
+                member.inflight -= inflight
+                if sampled is None:
+                    member.healthy = False
+                    member.failures += 1
+                else:
+                    member.score, member.idle, member.queued = sampled
+                    member.healthy = True
+        return self.members
+    def owner(self, exec_hash: list) -> Gizo:
+        """
+        Parameters
+        ----------
+        exec_hash : list
+            byte array of exec hash
+
+        Returns : Gizo
+        -------
+        client of the dispatcher the exec was submitted to - the primary client if it isn't known
+        """
+        key = base64.b64encode(bytes(exec_hash)).decode("utf-8")
+        with self.__lock:
+            member = self.__owners.get(key)
+        return member.gizo if member is not None else self.primary
+    def stats(self) -> Dict[str, dict]:
+        """
+        Returns : dict
+        -------
+        url of every dispatcher to its score, idle workers, queued execs, health, execs submitted and failures
+        """
+        with self.__lock:
+            return {m.url: {"score": m.score, "idle": m.idle, "queued": m.queued, "healthy": m.healthy, "submitted": m.submitted, "failures": m.failures} for m in self.members}
+    @staticmethod
+    def __healthy(dispatcher: Dispatcher, pool_size: int, idle_timeout: float) -> bool:
+        try:
+            transport.pool(dispatcher, pool_size, idle_timeout).get(dispatcher.status(), timeout=PROBE_TIMEOUT).raise_for_status()
+        except Exception:
+            return False
+        return True
+    def __sample(self, member: Member) -> Optional[tuple]:
+        try:
+            return float(member.gizo.Score()), member.gizo.WorkersCountNotBusy(), member.gizo.JobQueueCount()
+        except Exception:
+            return None
+    def __run(self) -> None:
+        while True:
+            with self.__lock:
+                self.__lock.wait_for(lambda: self.__stopped, self.interval)
+                if self.__stopped:
+                    return
+            self.sample()
+    def __route(self, method: str, jrs: List[Any], *args: Any) -> Any:
+        """Submits to the member with the most spare capacity, failing over to the next while unreachable"""
+        self.start()
+        job_ids = exec_job_ids(jrs)
+        execs = len(job_ids)
+        tried: List[Member] = []
+        while True:
+            with self.__lock:
+                candidates = [m for m in self.members if m not in tried]
+                if not candidates:
+                    raise Exception("no dispatchers available")
+                member = max(candidates, key=lambda m: (m.healthy, m.spare, m.score))
+                member.inflight += execs
+            try:
+                reply = getattr(member.gizo, method)(*args)
+            except Exception as e:
+                with self.__lock:
+                    member.inflight -= execs
+                    if not _unavailable(e):
+                        raise
+                    member.healthy = False
+                    member.failures += 1
+                tried.append(member)
+                continue
+            self.__own(member, reply, job_ids)
+            return reply
+    def __own(self, member: Member, reply: Any, job_ids: List[str]) -> None:
+        found = reply_execs(reply, job_ids) or []
+        with self.__lock:
+            member.submitted += len(job_ids)
+            for _, e in found:
+                if e.get("Hash"):
+                    self.__owners[e["Hash"]] = member
+                    self.__owners.move_to_end(e["Hash"])
+            while len(self.__owners) > self.__max_owners:
+                self.__owners.popitem(last=False)
+    def Solo(self, jr: Requests) -> Any:
+        """ Executes a single exec on the dispatcher with the most spare capacity
+        Parameters
+        ----------
+        jr : Requests
+            job request
+        """
+        return self.__route("Solo", [jr], jr)
+    def Chord(self, jrs: list, callback_jr: Requests) -> Any:
+        """ Executes execs one after the other then passes results into callback exec as a list, on the dispatcher with the most spare capacity
+        Parameters
+        ----------
+        jrs : list
+            list of Reqeusts
+        callback_jr : Requests
+            callback job requests
+        """
+        return self.__route("Chord", list(jrs) + [callback_jr], jrs, callback_jr)
+    def Chain(self, jrs: list) -> Any:
+        """ Executes execs one after the other on the dispatcher with the most spare capacity
+        Parameters
+        ----------
+        jrs : list
+            list of Requests
+        """
+        return self.__route("Chain", jrs, jrs)
+    def Batch(self, jrs: list) -> Any:
+        """ Executes execs in parallel on the dispatcher with the most spare capacity
+        Parameters
+        ----------
+        jrs : list
+            list of job requests
+        """
+        return self.__route("Batch", jrs, jrs)
+    def BatchMany(self, jrs: list, workers: int=8, max_execs: Optional[int]=None) -> limits.BatchResult:
+        """ Executes any number of execs in parallel, split into Batch calls each routed on its own
+        Parameters
+        ----------
+        jrs : list
+            list of Requests
+        workers : int
+            maximum number of Batch calls in flight at once
+        max_execs : int
+            most execs a single Batch call holds - defaults to the primary's limits
+
+        Returns : BatchResult
+        -------
+        reply of each chunk (None where it failed), the chunks submitted and the chunks that failed
+        """
+        checked = self.primary.limits
+        if checked is not None:
+            limits.validate(jrs, max_retries=checked.max_retries, max_ttl=checked.max_ttl)
+        chunks = limits.chunk(jrs, max_execs if max_execs is not None else (checked or limits.DEFAULT).max_execs)
+        with ThreadPoolExecutor(max_workers=max(min(workers, len(chunks)), 1)) as pool:
+            futures = [pool.submit(self.Batch, c) for c in chunks]
+        replies = []
+        errors = []
+        for i, future in enumerate(futures):
+            try:
+                replies.append(limits.decode(future.result()))
+            except Exception as e:
+                replies.append(None)
+                errors.append(limits.ChunkError(i, chunks[i], e))
+        return limits.BatchResult(replies, chunks, errors)
+    def NewJob(self, fn: str, name: str, priv: bool, force: bool=False, timeout: float=VISIBLE_TIMEOUT) -> str:
+        """Deploys a job through the primary and waits until every healthy dispatcher sees it
+        Parameters
+        ---------
+        fn : str
+            job file
+        name : str
+            name of main function - entry point into job
+        priv : bool
+            specified if job is private / public
+        force : bool
+            deploy even if the same job was deployed before
+        timeout : float
+            seconds to wait for the job to be seen by every dispatcher
+
+        Returns : str
+        -------
+        ID of deployed job
+
+        Raises
+        ------
+        Exception
+            if the job isn't seen by every healthy dispatcher within timeout
+        """
+        job_id = self.primary.NewJob(fn, name, priv, force)
+        self.__visible([job_id], timeout)
+        return job_id
+    def NewJobs(self, jobs: Union[str, Sequence[Union[str, Tuple[str, str]]]], priv: bool=False, workers: int=8, timeout: float=VISIBLE_TIMEOUT) -> Dict[str, str]:
+        """Deploys many jobs through the primary and waits until every healthy dispatcher sees them
+        Parameters
+        ---------
+        jobs : str
+            directory of anko files, or a list of anko files and (file, name) pairs
+        priv : bool
+            specified if jobs are private / public
+        workers : int
+            maximum number of deploys in flight at once
+        timeout : float
+            seconds to wait for the jobs to be seen by every dispatcher
+
+        Returns : dict
+        -------
+        job name and ID of every job
+
+        Raises
+        ------
+        Exception
+            if a job isn't seen by every healthy dispatcher within timeout
+        """
+        deployed = self.primary.NewJobs(jobs, priv, workers)
+        self.__visible(list(deployed.values()), timeout)
+        return deployed
+    def __visible(self, job_ids: List[str], timeout: float) -> None:
+        """Waits until every healthy member sees the jobs"""
+        deadline = time.monotonic() + timeout
+        with self.__lock:
+            waiting = [m for m in self.members if m.healthy]
+        while True:
+            waiting = [m for m in waiting if not self.__sees(m, job_ids)]
+            if not waiting:
+                return
+            if time.monotonic() >= deadline:
+                raise Exception(f"job not visible on {', '.join(m.url for m in waiting)}")
+            time.sleep(min(self.interval, 0.1))
+    def __sees(self, member: Member, job_ids: List[str]) -> bool:
+        try:
+            return all(member.gizo.Job(job_id) for job_id in job_ids)
+        except Exception:
+            return False
+    def CancelExec(self, exec_hash: list) -> Any:
+        """ Cancels an exec on the dispatcher running it
+        Parameters
+        -----------
+        exec_hash : list
+            byte array of exec hash or ExecHash
+
+        Raises
+        ------
+        Exception
+            if exec isn't running
+        """
+        return self.owner(exec_hash).CancelExec(exec_hash)
+    def ExecDetailsMany(self, job_id: str, exec_hashes: List[list], workers: int=16) -> List[models.ExecDetails]:
+        """Reads execs from the dispatchers running them, one ExecDetailsMany call per dispatcher
+        Parameters
+        -----------
+        job_id : str
+            id of job execs ran
+        exec_hashes : list
+            byte arrays of exec hashes
+        workers : int
+            maximum number of concurrent per-field calls on each dispatcher
+
+        Returns : list
+        -------
+        ExecDetails in the same order as exec_hashes
+        """
+        groups: Dict[int, List[int]] = {}
+        clients: Dict[int, Gizo] = {}
+        for i, exec_hash in enumerate(exec_hashes):
+            client = self.owner(exec_hash)
+            clients[id(client)] = client
+            groups.setdefault(id(client), []).append(i)
+        details: List[Any] = [None] * len(exec_hashes)
+        for key, indexes in groups.items():
+            for i, d in zip(indexes, clients[key].ExecDetailsMany(job_id, [exec_hashes[i] for i in indexes], workers)):
+                details[i] = d
+        return details
@@ -0,0 +1,140 @@
+"""JSON codec for rpc payloads
+Uses orjson or ujson when one is installed and falls back to the json module otherwise
+"""
+import json
+from typing import Any, Union
+
+DECODED = "decoded"
+"""payloads are decoded into python objects"""
+BYTES = "bytes"
+"""payloads are returned as undecoded bytes"""
+MEMORYVIEW = "memoryview"
+"""payloads are returned as a memoryview over undecoded bytes"""
+
+try:
+    import orjson
+    BACKEND: str = "orjson"
+    """name of the json library in use"""
+    def loads(payload: Union[str, bytes, bytearray, memoryview]) -> Any:
+        """
+        Parameters
+        ----------
+        payload : str
+            json
+
+        Returns
+        -------
+        decoded value
+        """
+        return orjson.loads(payload)
+    def dumps(value: Any) -> str:
+        """Encodes through the json module when orjson can't, e.g integers wider than 64 bits
+        Parameters
+        ----------
+        value : any
+            value to encode
+
+        Returns : str
+        -------
+        json of value
+        """
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            return json.dumps(value)
+except ImportError:
+    try:
+        import ujson
+        BACKEND = "ujson"
+        def loads(payload: Union[str, bytes, bytearray, memoryview]) -> Any:
+            """
+            Parameters
+            ----------
+            payload : str
+                json
+
+            Returns
+            -------
+            decoded value
+            """
+            if isinstance(payload, memoryview):
+                payload = payload.tobytes()
+            return ujson.loads(payload)
+        def dumps(value: Any) -> str:
+            """Encodes through the json module when ujson can't, e.g integers wider than 64 bits
+            Parameters
+            ----------
+            value : any
+                value to encode
+
+            Returns : str
+            -------
+            json of value
+            """
+            try:
+                return ujson.dumps(value, ensure_ascii=False, escape_forward_slashes=False)
+            except (TypeError, OverflowError):
+                return json.dumps(value)
+    except ImportError:
+        BACKEND = "json"
+        def loads(payload: Union[str, bytes, bytearray, memoryview]) -> Any:
+            """
+            Parameters
+            ----------
+            payload : str
+                json
+
+            Returns
+            -------
+            decoded value
+            """
+            if isinstance(payload, memoryview):
+                payload = payload.tobytes()
+            return json.loads(payload)
+        def dumps(value: Any) -> str:
+            """
+            Parameters
+            ----------
+            value : any
+                value to encode
+
+            Returns : str
+            -------
+            json of value
+            """
+            return json.dumps(value)
+
+def dumps_pretty(value: Any) -> str:
+    """Encodes with sorted keys and indentation, always through the json module so files stay byte for byte stable
+    Parameters
+    ----------
+    value : any
+        value to encode
+
+    Returns : str
+    -------
+    json of value
+    """
+    return json.dumps(value, indent=4, separators=(',', ': '), sort_keys=True)
+def decode(payload: Union[str, bytes, memoryview], mode: str=DECODED) -> Any:
+    """
+    Parameters
+    ----------
+    payload : str
+        json returned by the dispatcher
+    mode : str
+        DECODED, BYTES or MEMORYVIEW
+
+    Returns
+    -------
+    payload in the requested form
+    """
+    if mode == DECODED:
+        return loads(payload)
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    if mode == MEMORYVIEW:
+        return payload if isinstance(payload, memoryview) else memoryview(payload)
+    if mode == BYTES:
+        return payload.tobytes() if isinstance(payload, memoryview) else bytes(payload)
+    raise Exception(f"unknown payload mode {mode}")
@@ -0,0 +1,244 @@
+"""Future-returning exec submission"""
+import base64
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Any, Dict, List, Tuple
+import gizo.status as status
+from gizo.job import Requests, exec_job_ids, reply_execs
+from gizo.watcher import ExecWatcher, Transition, ABANDONED
+
+class ExecError(Exception):
+    """Raised by a submission's future when one of its execs didn't finish
+    Parameters
+    ----------
+    job_id : str
+        id of job exec ran
+    exec_hash : list
+        byte array of exec hash
+    status : str
+        terminal status of exec
+    err : any
+        error of exec
+    """
+    def __init__(self, job_id: str, exec_hash: list, status: str, err: Any) -> None:
+        super(ExecError, self).__init__(f"exec {status.lower()}: {err}")
+        self.job_id = job_id
+        self.exec_hash = exec_hash
+        self.status = status
+        self.err = err
+
+class _Pending:
+    """Execs of one submission still being tracked"""
+    def __init__(self, future: Future, execs: List[Tuple[str, dict]]) -> None:
+        self.future = future
+        self.results: List[Any] = [None] * len(execs)
+        self.error: Optional[ExecError] = None
+        self.left = len(execs)
+        self.lock = threading.Lock()
+        self.deadline: Optional[Tuple[float, int, "_Pending"]] = None
+        """entry in the submitter's deadline heap - None when not timed"""
+
+class Submitter:
+    """Submits execs and returns futures that resolve once every exec of the submission is done
+    A future resolves to the list of exec results in submission order, or raises ExecError for the first
+    exec that was cancelled, timed out or abandoned by the watcher. A future raises if the dispatcher's
+    reply doesn't describe the submitted execs, and raises TimeoutError if its execs aren't done within
+    timeout. Futures can be collected with concurrent.futures.as_completed or wait and awaited with
+    asyncio.wrap_future. Every outstanding future is tracked by one shared ExecWatcher and timed by one
+    deadline thread, the submissions themselves run on a shared thread pool
+    Parameters
+    ----------
+    gizo : Gizo
+        connected client to submit with
+    workers : int
+        maximum number of submissions in flight at once
+    watcher : ExecWatcher
+        watcher to track execs with, its on_change is taken over - defaults to a new ExecWatcher on gizo
+    timeout : float
+        seconds after submission a future's execs must be done in - None to wait forever
+    """
+    def __init__(self, gizo: Any, workers: int=8, watcher: Optional[ExecWatcher]=None, timeout: Optional[float]=None) -> None:
+        self.gizo = gizo
+        self.timeout = timeout
+        self.watcher = watcher if watcher is not None else ExecWatcher(gizo)
+        self.watcher.on_change = self.__on_change
+        self.__pool = ThreadPoolExecutor(max_workers=workers)
+        self.__tracked: Dict[Tuple[str, bytes], List[Tuple[_Pending, int]]] = {}
+        self.__lock = threading.Lock()
+        self.__deadlines: List[Tuple[float, int, _Pending]] = []
+        self.__seq = itertools.count()
+        self.__deadline_cond = threading.Condition()
+        self.__deadline_thread: Optional[threading.Thread] = None
+        self.__closed = False
+    def Solo(self, jr: Requests) -> Future:
+        """ Executes a single exec
+        Parameters
+        ----------
+        jr : Requests
+            job request
+
+        Returns : Future
+        -------
+        resolves to the results of jr's execs
+        """
+        return self.__submit(self.gizo.Solo, [jr], jr)
+    def Chord(self, jrs: list, callback_jr: Requests) -> Future:
+        """ Executes execs one after the other then passes results into callback exec as a list
+        Parameters
+        ----------
+        jrs : list
+            list of Reqeusts
+        callback_jr : Requests
+            callback job requests
+
+        Returns : Future
+        -------
+        resolves to the results of every exec
+        """
+        return self.__submit(self.gizo.Chord, list(jrs) + [callback_jr], jrs, callback_jr)
+    def Chain(self, jrs: list) -> Future:
+        """ Executes execs one after the other (allows multiple jobs and multiple execs)
+        Parameters
+        ----------
+        jrs : list
+            list of Requests
+
+        Returns : Future
+        -------
+        resolves to the results of every exec
+        """
+        return self.__submit(self.gizo.Chain, jrs, jrs)
+    def Batch(self, jrs: list) -> Future:
+        """ Executes execs in parallel
+        Parameters
+        ----------
+        jrs : list
+            list of job requests
+
+        Returns : Future
+        -------
+        resolves to the results of every exec
+        """
+        return self.__submit(self.gizo.Batch, jrs, jrs)
+    def shutdown(self) -> None:
+        """Waits for in flight submissions and stops the watcher and deadline thread"""
+        self.__pool.shutdown()
+        self.watcher.stop()
+        with self.__deadline_cond:
+            self.__closed = True
+            self.__deadline_cond.notify()
+        if self.__deadline_thread is not None:
+            self.__deadline_thread.join()
+    def __submit(self, method: Any, jrs: List[Any], *args: Any) -> Future:
+        future: Future = Future()
+        def submit() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                reply = method(*args)
+                execs = reply_execs(reply, exec_job_ids(jrs))
+            except Exception as e:
+                future.set_exception(e)
+                return
+            if execs is None:
+                future.set_exception(Exception(f"reply doesn't describe the submitted execs: {reply!r:.200}"))
+                return
+            if not execs:
+                future.set_result([])
+                return
+            self.__track(_Pending(future, execs), execs)
+        self.__pool.submit(submit)
+        return future
+    def __track(self, pending: _Pending, execs: List[Tuple[str, dict]]) -> None:
+        if self.timeout is not None:
+            with self.__deadline_cond:
+                pending.deadline = (time.monotonic() + self.timeout, next(self.__seq), pending)
+                heapq.heappush(self.__deadlines, pending.deadline)
+                if self.__deadline_thread is None:
+                    self.__deadline_thread = threading.Thread(target=self.__expiry, name="gizo-submitter-deadlines", daemon=True)
+                    self.__deadline_thread.start()
+                self.__deadline_cond.notify()
+        for i, (job_id, e) in enumerate(execs):
+            exec_hash = e.get("Hash")
+            if isinstance(exec_hash, str):
+                exec_hash = list(base64.b64decode(exec_hash))
+            if e.get("Status") in status.TERMINAL:
+                self.__done(pending, i, job_id, exec_hash, e["Status"], e.get("Result"), e.get("Err"))
+                continue
+            if not exec_hash:
+                self.__done(pending, i, job_id, exec_hash, e.get("Status"), None, "exec has no hash to track")
+                continue
+            with self.__lock:
+                self.__tracked.setdefault((job_id, bytes(exec_hash)), []).append((pending, i))
+            self.watcher.watch(job_id, exec_hash)
+    def __on_change(self, transition: Transition) -> None:
+        if transition.status not in status.TERMINAL and transition.status != ABANDONED:
+            return
+        with self.__lock:
+            waiting = self.__tracked.pop((transition.job_id, bytes(transition.exec_hash)), [])
+        if not waiting:
+            return
+        if transition.status == ABANDONED:
+            for pending, i in waiting:
+                self.__done(pending, i, transition.job_id, transition.exec_hash, ABANDONED, None, "status polls kept failing")
+            return
+        result = err = None
+        try:
+            if transition.status == status.FINISHED:
+                result = self.gizo.ExecResult(transition.job_id, transition.exec_hash)
+            if result is None:
+                err = self.gizo.ExecErr(transition.job_id, transition.exec_hash)
+        except Exception as e:
+            err = e
+        for pending, i in waiting:
+            self.__done(pending, i, transition.job_id, transition.exec_hash, transition.status, result, err)
+    def __expiry(self) -> None:
+        """Expires submissions as their deadlines pass, until shutdown"""
+        while True:
+            with self.__deadline_cond:
+                while not self.__closed and (not self.__deadlines or self.__deadlines[0][0] > time.monotonic()):
+                    self.__deadline_cond.wait(self.__deadlines[0][0] - time.monotonic() if self.__deadlines else None)
+                if self.__closed:
+                    return
+                _, _, pending = heapq.heappop(self.__deadlines)
+                pending.deadline = None
+            self.__expire(pending)
+    def __expire(self, pending: _Pending) -> None:
+        """Fails a submission whose execs weren't done within timeout and stops tracking them"""
+        with pending.lock:
+            if pending.left <= 0:
+                return
+            left, pending.left = pending.left, 0
+        unwatch = []
+        with self.__lock:
+            for key, waiting in list(self.__tracked.items()):
+                waiting = [w for w in waiting if w[0] is not pending]
+                if waiting:
+                    self.__tracked[key] = waiting
+                else:
+                    del self.__tracked[key]
+                    unwatch.append(key)
+        for job_id, exec_hash in unwatch:
+            self.watcher.unwatch(job_id, list(exec_hash))
+        pending.future.set_exception(TimeoutError(f"{left} execs not done within {self.timeout} seconds"))
+    def __done(self, pending: _Pending, i: int, job_id: str, exec_hash: list, state: str, result: Any, err: Any) -> None:
+        with pending.lock:
+            if state == status.FINISHED and err is None:
+                pending.results[i] = result
+            elif pending.error is None:
+                pending.error = ExecError(job_id, exec_hash, state, err)
+            pending.left -= 1
+            finished = pending.left == 0
+        if finished:
+            with self.__deadline_cond:
+                if pending.deadline is not None:
+                    self.__deadlines.remove(pending.deadline)
+                    heapq.heapify(self.__deadlines)
+                    pending.deadline = None
+            if pending.error is not None:
+                pending.future.set_exception(pending.error)
+            else:
+                pending.future.set_result(pending.results)
@@ -1,14 +1,61 @@
 import requests
 import hprose
-import json
+import base64
 import sys
-from typing import Optional, Any, List, Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, List, Dict, Sequence, Tuple, Union
+import os
 from os import path
 from furl import furl
+from gizo.builder import ExecBuilder
+from gizo.cache import BlockCache
 from gizo.centrum import CENTRUM_TESTNET, CENTRUM
 from gizo.dispatcher import Dispatcher
 from gizo.env import Envs
 from gizo.job import Requests
+from gizo.metrics import Metrics, METRICS
+from gizo.replay import Recorder
+from gizo.utils import hash_arg
+from gizo.registry import JobRegistry, source_hash, write_config
+from gizo.store import BlockStore
+from gizo.template import ExecTemplate
+import gizo.codec as codec
+import gizo.limits as limits
+import gizo.models as models
+import gizo.transport as transport
+
+_EXEC_FIELDS = (
+    ("status", "ExecStatus", None),
+    ("timestamp", "ExecTimestamp", None),
+    ("duration", "ExecDurationNanoseconds", None),
+    ("args", "ExecArgs", None),
+    ("err", "ExecErr", None),
+    ("priority", "ExecPriority", None),
+    ("result", "ExecResult", None),
+    ("retries_count", "ExecRetries", None),
+    ("backoff", "ExecBackoff", 1e9),
+    ("execution_time", "ExecExecutionTime", None),
+    ("interval", "ExecInterval", None),
+    ("by", "ExecBy", None),
+    ("ttl", "ExecTtlNanoseconds", None),
+)
+"""Fields of ExecDetails that can be read with a per-field rpc - (field, rpc method, scale to nanoseconds)"""
+PROBE_TIMEOUT: float = 0.5
+"""Seconds to wait for a dispatcher's status and score while probing"""
+RTT_BUCKET: float = 0.01
+"""Dispatchers whose round trips fall within the same bucket (seconds) are ranked by score"""
+FAILED_COOLDOWN: float = 30.0
+"""Seconds a dispatcher that failed is left out of re-ranking unless no other dispatcher is healthy"""
+
+def _unsupported(e: Exception) -> bool:
+    """
+    Returns : bool
+    -------
+    True if the dispatcher raised because it doesn't have the rpc method called
+    """
+    return "Can't find this" in str(e)
 
 class Gizo:
     """Connects to dispatcher and exposes rpc methods
@@ -20,6 +67,36 @@ class Gizo:
         file for config to be written
     test_net : bool
         specifies if sdk should connect to testnet or prod network
+    pool_size : int
+        number of keep-alive connections kept open to the dispatcher
+    idle_timeout : float
+        seconds the connection pool may sit unused before its connections are dropped
+    block_cache : BlockCache
+        cache for blocks - defaults to a BlockCache with default limits
+    block_store : BlockStore
+        on-disk store blocks are read from before asking the dispatcher, blocks below the tip
+        fetched from the dispatcher are appended to it
+    payloads : str
+        form of json payloads returned by rpc methods - codec.DECODED decodes them, codec.BYTES and
+        codec.MEMORYVIEW return them undecoded (blocks then bypass the block cache)
+    typed : bool
+        return blocks, jobs and execs as the models Block, Job and Exec, which keep the json and decode
+        fields on first access, instead of dicts
+    lazy : bool
+        make no network calls while constructing - the config file is loaded and its dispatcher is
+        re-validated in the background, connecting happens on the first rpc or on warmup()
+    metrics : Metrics
+        metrics every rpc call is recorded to - defaults to metrics.METRICS
+    record : Recorder
+        recorder every rpc call is written to, for replaying later with replay.ReplayClient
+    client : HproseClient
+        client every rpc call is made with instead of connecting to a dispatcher, e.g a
+        replay.ReplayClient - keys are read from the config file if there is one
+    centrum : str
+        url of centrum dispatchers are found through - defaults to the test or main network's
+    limits : Limits
+        limits Batch and BatchMany check requests against before sending - None to leave checking
+        to the dispatcher
 
     Raises
     ------
@@ -28,16 +105,34 @@ class Gizo:
         if unable to connect to a specified dispatcher
         if no dispatchers are available
     """
-    def __init__(self, url: Optional[str]=None, export_file: Optional[str]=None, test: bool=False) -> None:
+    def __init__(self, url: Optional[str]=None, export_file: Optional[str]=None, test: bool=False, pool_size: int=transport.POOL_SIZE, idle_timeout: float=transport.IDLE_TIMEOUT, block_cache: Optional[BlockCache]=None, block_store: Optional[BlockStore]=None, payloads: str=codec.DECODED, typed: bool=False, lazy: bool=False, metrics: Optional[Metrics]=None, record: Optional[Recorder]=None, client: Optional[hprose.HproseClient]=None, centrum: Optional[str]=None, limits: Optional[limits.Limits]=limits.DEFAULT) -> None:
         self.__dispatcher: Dispatcher
-        self.__client: hprose.HproseHttpClient
+        self.__rpc: Optional[hprose.HproseClient] = None
+        self.__url: Optional[str] = url
+        self.__lock = threading.RLock()
+        self.__validator: Optional[threading.Thread] = None
+        self.__pool_size: int = pool_size
+        self.__idle_timeout: float = idle_timeout
         self.__config: str
         self.__keys: dict
         self.__test: bool = test
-        self.jobs: List[dict] = {}
-        """Holds jobs deployed from the SDK
-        Key value pair of job name and Job ID
-        """
+        self.__centrum: str = centrum if centrum is not None else (CENTRUM_TESTNET if test else CENTRUM)
+        self.__payloads: str = payloads
+        self.__typed: bool = typed
+        self.__recorder: Optional[Recorder] = record
+        self.__builder: Optional[ExecBuilder] = None
+        self.__dispatcher = None
+        self.__candidates: List[Dispatcher] = []
+        """Dispatchers from centrum ranked best first, kept for reconnecting"""
+        self.__failed: Dict[str, float] = {}
+        """urls of dispatchers that failed and when (time.monotonic) - see FAILED_COOLDOWN"""
+        self.block_cache: BlockCache = block_cache if block_cache is not None else BlockCache()
+        """Blocks read from the dispatcher - see BlockCache.stats for hit and miss counters"""
+        self.block_store: Optional[BlockStore] = block_store
+        self.metrics: Metrics = metrics if metrics is not None else METRICS
+        """Counts, errors, latencies and payload sizes of rpc calls - see Metrics.prometheus for exporting them"""
+        self.limits = limits
+        """Limits requests are checked against before Batch and BatchMany send them - None to not check"""
 
         if export_file is None:
             if self.__test:
@@ -46,29 +141,94 @@ class Gizo:
                 self.__config = ".gizo"
         else:
             self.__config = export_file
+        self.jobs: JobRegistry = JobRegistry(f"{self.__config}.db")
+        """Holds jobs deployed from the SDK
+        Key value pair of job name and Job ID, kept in an sqlite database next to the config file
+        """
+        if client is not None:
+            self.__rpc = client
+            self.__keys = {"priv": "", "pub": ""}
+            if path.isfile(self.__config):
+                self.__import_config()
+        elif not lazy:
+            self.__startup()
+        elif path.isfile(self.__config):
+            try:
+                self.__import_config()
+                self.__rpc = self.__connect_dispatcher(self.__dispatcher)
+            except Exception:
+                self.__rpc = None
+            else:
+                self.__validator = threading.Thread(target=self.__validate, name="gizo-validate", daemon=True)
+                self.__validator.start()
+    @property
+    def __client(self) -> hprose.HproseClient:
+        """rpc client of the dispatcher - connects first if not connected yet"""
+        if self.__rpc is None:
+            self.warmup()
+        return self.__rpc
+    def warmup(self) -> "Gizo":
+        """Connects to a dispatcher now instead of on the first rpc, waiting for any background re-validation
+        Returns : Gizo
+        -------
+        the connected client
+
+        Raises
+        ------
+        Exception
+            if unable to connect to centrum
+            if unable to connect to a specified dispatcher
+            if no dispatchers are available
+        """
+        validator = self.__validator
+        if validator is not None and validator is not threading.current_thread():
+            validator.join()
+        with self.__lock:
+            if self.__rpc is None:
+                self.__startup()
+        return self
+    def __startup(self) -> None:
+        """Connects to the dispatcher from the config file, the one specified by url or the best one on the network"""
         if path.isfile(self.__config):
             try:
                 self.__import_config()
-                requests.get(self.__dispatcher.status(), timeout=0.5)
-                self.__client = self.__connect_dispatcher(self.__dispatcher)
+                self.__pool(self.__dispatcher).get(self.__dispatcher.status(), timeout=0.5).raise_for_status()
+                self.__rpc = self.__connect_dispatcher(self.__dispatcher)
             except Exception:
                 self.__dispatcher = None
                 self.__connect()
                 self.__export_config()
         else:
-            if url != None:
+            if self.__url != None:
                 try:
-                    self.__dispatcher = Dispatcher(url)
-                    requests.get(self.__dispatcher.status(), timeout=0.5)
-                    self.__client = self.__connect_dispatcher(self.__dispatcher)
+                    self.__dispatcher = Dispatcher(self.__url)
+                    self.__pool(self.__dispatcher).get(self.__dispatcher.status(), timeout=0.5).raise_for_status()
+                    self.__rpc = self.__connect_dispatcher(self.__dispatcher)
                     self.__keys = self.KeyPair()
                     self.__export_config()
                 except Exception:
+                    self.__rpc = None
                     raise Exception("unable to connect to dispatcher")
             else:
                 self.__connect()
                 self.__keys = self.KeyPair()
                 self.__export_config()
+    def __validate(self) -> None:
+        """Checks the dispatcher from the config file is up and switches to the best one on the network if not
+        A failure to switch is left for the next rpc to retry and raise
+        """
+        try:
+            self.__pool(self.__dispatcher).get(self.__dispatcher.status(), timeout=0.5).raise_for_status()
+            return
+        except Exception:
+            pass
+        with self.__lock:
+            try:
+                self.__dispatcher = None
+                self.__connect()
+                self.__export_config()
+            except Exception:
+                self.__rpc = None
     def __import_config(self) -> None:
         """Imports dispatcher and keys from config file
         Raises
@@ -77,12 +237,13 @@ class Gizo:
             If the file could not be read.
         """
         with open(self.__config, "r") as f:
-            content = json.loads(f.read())
+            content = codec.loads(f.read())
         self.__dispatcher = Dispatcher(content["dispatcher"])
         self.__keys = content["keys"]
-        self.jobs = content["jobs"]
+        if content.get("jobs"):
+            self.jobs.update_missing(content["jobs"])
     def __export_config(self) -> None:
-        """Exports dispatcher and keys to config file
+        """Exports dispatcher and keys to config file atomically, jobs are kept in the job registry
         Raises
         ------
         IOError
@@ -91,48 +252,143 @@ class Gizo:
         temp: dict = {}
         temp["dispatcher"] = self.__dispatcher.url
         temp["keys"] = self.__keys
-        temp["jobs"] = self.jobs
-        with open(self.__config, "w+") as f:
-            f.write(json.dumps(temp, indent=4, separators=(',', ': '), sort_keys=True))
+        temp["jobs"] = {}
+        write_config(self.__config, temp)
     def __connect(self) -> None:
-        """Connects to a dispatcher
+        """Connects to the best dispatcher on the network
+        Probes every dispatcher from centrum concurrently and ranks them with __rank
+        Dispatchers that failed within FAILED_COOLDOWN are only ranked if no other dispatcher is healthy
         Raises
         ------
         Exception
             if no dispatchers available
             if unable to connect to centrum
         """
-        r = None
-        if self.__test:
-            r = requests.get(f"{CENTRUM_TESTNET}/v1/dispatchers")
-        else:
-            r = requests.get(f"{CENTRUM}/v1/dispatchers")
+        r = requests.get(f"{self.__centrum}/v1/dispatchers")
         if r.status_code == 200:
-            dispatchers = r.json()
-            for dispatcher in dispatchers:
+            urls = r.json()
+            failed = self.__recently_failed()
+            self.__candidates = self.__rank([url for url in urls if url not in failed])
+            if not self.__candidates:
+                self.__candidates = self.__rank([url for url in urls if url in failed])
+            for dispatcher in self.__candidates:
                 try:
-                    temp = Dispatcher(dispatcher)
-                    self.__client = self.__connect_dispatcher(temp)
-                    self.__dispatcher = temp                
+                    self.__rpc = self.__connect_dispatcher(dispatcher)
+                    self.__dispatcher = dispatcher
                     break
                 except Exception:
                     pass
             if self.__dispatcher == None:
-                raise Exception("no dispatchers available")   
+                raise Exception("no dispatchers available")
         else:
             raise Exception("unable to connect to centrum")
-    def __connect_dispatcher(self, dispatcher: Dispatcher) -> hprose.HproseHttpClient:
+    def __probe(self, url: str) -> Optional[tuple]:
+        """Measures a dispatcher's status round trip and benchmark score
+        Parameters
+        ----------
+        url : str
+            url of dispatcher
+
+        Returns : tuple
+        -------
+        round trip (seconds), score (None if unavailable) and dispatcher - None if dispatcher is unhealthy
+        """
+        try:
+            dispatcher = Dispatcher(url)
+            start = time.perf_counter()
+            r = self.__pool(dispatcher).get(dispatcher.status(), timeout=PROBE_TIMEOUT)
+            rtt = time.perf_counter() - start
+            if r.status_code != 200:
+                return None
+        except Exception:
+            return None
+        try:
+            client = self.__connect_dispatcher(dispatcher)
+            client.timeout = PROBE_TIMEOUT
+            score = float(client.Score())
+        except Exception:
+            score = None
+        return rtt, score, dispatcher
+    def __rank(self, urls: List[str]) -> List[Dispatcher]:
+        """Probes dispatchers concurrently and ranks them
+        Parameters
+        ----------
+        urls : list
+            urls of dispatchers
+
+        Returns : list
+        -------
+        healthy dispatchers - lowest round trip first, higher score first within the same RTT_BUCKET
+        """
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(urls), 32)) as pool:
+            probes = [p for p in pool.map(self.__probe, urls) if p is not None]
+        probes.sort(key=lambda p: (int(p[0] / RTT_BUCKET), -(p[1] or 0.0), p[0]))
+        return [p[2] for p in probes]
+    def __recently_failed(self) -> Dict[str, float]:
+        """Forgets failures older than FAILED_COOLDOWN
+        Returns : dict
+        -------
+        urls of dispatchers that failed within FAILED_COOLDOWN and when
+        """
+        now = time.monotonic()
+        for url, failed in list(self.__failed.items()):
+            if now - failed > FAILED_COOLDOWN:
+                del self.__failed[url]
+        return self.__failed
+    def reconnect(self) -> None:
+        """Switches from the current dispatcher, taken as failed, to the next healthy dispatcher from the last ranking
+        Re-ranks the dispatchers from centrum once the ranking is used up, leaving out dispatchers that failed
+        within FAILED_COOLDOWN unless no other dispatcher is healthy
+        Raises
+        ------
+        Exception
+            if no dispatchers available
+            if unable to connect to centrum
+        """
+        current = self.__dispatcher
+        if current is not None:
+            self.__failed[current.url] = time.monotonic()
+        while self.__candidates:
+            dispatcher = self.__candidates.pop(0)
+            if dispatcher.url in self.__recently_failed():
+                continue
+            try:
+                self.__pool(dispatcher).get(dispatcher.status(), timeout=PROBE_TIMEOUT).raise_for_status()
+                self.__rpc = self.__connect_dispatcher(dispatcher)
+                self.__dispatcher = dispatcher
+                self.__export_config()
+                return
+            except Exception:
+                self.__failed[dispatcher.url] = time.monotonic()
+        self.__dispatcher = None
+        self.__connect()
+        self.__export_config()
+    def __connect_dispatcher(self, dispatcher: Dispatcher) -> hprose.HproseClient:
         """Connects to a specified dispatcher
         Parameters
         ----------
         dispatcher : Dispatcher
             object of dispatcher to connect
 
-        Returns : HproseHttpClient
+        Returns : HproseClient
         -------
-        hprose connection
+        hprose connection sharing the dispatcher's keep-alive pool
+        """
+        return transport.connect(dispatcher, self.__pool_size, self.__idle_timeout, self.metrics, self.__recorder)
+    def __pool(self, dispatcher: Dispatcher) -> transport.Pool:
         """
-        return hprose.HttpClient(uri=dispatcher.rpc())
+        Parameters
+        ----------
+        dispatcher : Dispatcher
+            object of dispatcher
+
+        Returns : Pool
+        -------
+        keep-alive pool shared by every client of dispatcher
+        """
+        return transport.pool(dispatcher, self.__pool_size, self.__idle_timeout)
     def __readTask(self, fn: str) -> str:
         """Reads an anko file
         Parameters
@@ -152,12 +408,38 @@ class Gizo:
         with open(fn, "r") as f:
             content = f.read()
         return content
+    def __decode(self, raw: Any) -> Any:
+        """Returns an rpc payload in the form set by payloads"""
+        return codec.decode(raw, self.__payloads)
+    def __model(self, raw: Any, model: Any) -> Any:
+        """Returns an rpc payload in the form set by payloads, built into model if typed"""
+        if self.__typed and self.__payloads == codec.DECODED:
+            return model(raw)
+        return self.__decode(raw)
+    def __cache_block(self, raw: str, stored: bool=False) -> dict:
+        """Decodes a block and adds it to the block cache, and to the block store if it is below the tip
+        Parameters
+        ----------
+        raw : str
+            json of block
+        stored : bool
+            block was read from the block store
+
+        Returns : dict
+        -------
+        decoded block - a Block if typed
+        """
+        block = models.Block(raw) if self.__typed else codec.loads(raw)
+        self.block_cache.put(block, len(raw))
+        if self.block_store is not None and not stored and block["Height"] < self.block_cache.tip:
+            self.block_store.put(block, raw)
+        return block
     def Version(self) -> dict:
         """
         Returns : dict
         ------- 
         dispatcher node's version information"""
-        return json.loads(self.__client.Version())
+        return self.__decode(self.__client.Version())
     def PeerCount(self) -> int:    
         """
         Returns : int
@@ -180,7 +462,17 @@ class Gizo:
         Exception 
             if block doesn't exist in dispatchers blockchain
         """
-        return json.loads(self.__client.BlockByHash(hash))
+        if self.__payloads != codec.DECODED:
+            raw = self.block_store.raw_by_hash(hash) if self.block_store is not None else None
+            return self.__decode(raw if raw is not None else self.__client.BlockByHash(hash))
+        block = self.block_cache.get_by_hash(hash)
+        if block is None and self.block_store is not None:
+            raw = self.block_store.raw_by_hash(hash)
+            if raw is not None:
+                block = self.__cache_block(raw, stored=True)
+        if block is None:
+            block = self.__cache_block(self.__client.BlockByHash(hash))
+        return block
     def BlockByHeight(self, height: int) -> dict:
         """
         Parameters
@@ -197,21 +489,42 @@ class Gizo:
         Exception
             if block doesn't exist in dispatchers blockchain
         """
-        return json.loads(self.__client.BlockByHeight(height))
+        if self.__payloads != codec.DECODED:
+            raw = self.block_store.raw_by_height(height) if self.block_store is not None else None
+            return self.__decode(raw if raw is not None else self.__client.BlockByHeight(height))
+        block = self.block_cache.get_by_height(height)
+        if block is None and self.block_store is not None:
+            raw = self.block_store.raw_by_height(height)
+            if raw is not None:
+                block = self.__cache_block(raw, stored=True)
+        if block is None:
+            block = self.__cache_block(self.__client.BlockByHeight(height))
+        return block
     def Latest15Blocks(self) -> list:
         """
         Returns : list
         -------
         list of most recent 15 blocks
         """
-        return json.loads(self.__client.Latest15Blocks())
+        raw = self.__client.Latest15Blocks()
+        if self.__payloads != codec.DECODED:
+            return self.__decode(raw)
+        blocks = codec.loads(raw)
+        if self.__typed:
+            blocks = [models.Block(block) for block in blocks]
+        for block in blocks:
+            self.block_cache.put(block, len(raw) // max(len(blocks), 1))
+        return blocks
     def LatestBlock(self) -> dict:
         """
         Returns : dict
         -------
         latest block in the blockchain
         """
-        return json.loads(self.__client.LatestBlock())
+        raw = self.__client.LatestBlock()
+        if self.__payloads != codec.DECODED:
+            return self.__decode(raw)
+        return self.__cache_block(raw)
     def PendingCount(self) -> int: 
         """
         Returns : int
@@ -240,9 +553,10 @@ class Gizo:
         public key of node
         """
         return self.__client.PublicKey()
-    def NewJob(self, fn: str, name: str, priv: bool) -> str:
+    def NewJob(self, fn: str, name: str, priv: bool, force: bool=False) -> str:
         """
         Deploys Job to the Blockchain and writes job name and id to jobs variable 
+        A job whose source, name and privacy match an earlier deploy isn't deployed again, the earlier ID is returned
         Parameters
         ---------
         fn : str
@@ -251,6 +565,8 @@ class Gizo:
             name of main function - entry point into job
         priv : bool
             specified if job is private / public 
+        force : bool
+            deploy even if the same job was deployed before
 
         Raises
         ------
@@ -263,9 +579,47 @@ class Gizo:
         """
         if fn.find(".ank") == -1:
             raise Exception("only anko files accepted")
-        job_id: str = self.__client.NewJob(self.__readTask(fn), name, priv, self.__keys['priv'])
-        self.jobs[name] = job_id
-        self.__export_config()
+        task = self.__readTask(fn)
+        source = source_hash(task)
+        job_id = None if force else self.jobs.deployed(source, name, priv)
+        if job_id is not None:
+            if self.jobs.get(name) != job_id:
+                self.jobs[name] = job_id
+            return job_id
+        job_id = self.__client.NewJob(task, name, priv, self.__keys['priv'])
+        self.jobs.record_deploy(source, name, priv, job_id)
+        return job_id
+    def NewJobs(self, jobs: Union[str, Sequence[Union[str, Tuple[str, str]]]], priv: bool=False, workers: int=8) -> Dict[str, str]:
+        """Deploys many jobs concurrently, unchanged jobs aren't deployed again
+        Parameters
+        ---------
+        jobs : str
+            directory of anko files, or a list of anko files and (file, name) pairs - the name of a job
+            given only by its file is the file's name without .ank
+        priv : bool
+            specified if jobs are private / public
+        workers : int
+            maximum number of deploys in flight at once
+
+        Returns : dict
+        -------
+        job name and ID of every job
+
+        Raises
+        ------
+        Exception
+            if a file is not an anko file (.ank)
+            if a job could not be deployed - after every other job has been deployed
+        """
+        if isinstance(jobs, str):
+            jobs = sorted(path.join(jobs, fn) for fn in os.listdir(jobs) if fn.endswith(".ank"))
+        pairs = [job if isinstance(job, tuple) else (job, path.splitext(path.basename(job))[0]) for job in jobs]
+        if not pairs:
+            return {}
+        self.warmup()
+        with self.jobs.batch(), ThreadPoolExecutor(max_workers=min(workers, len(pairs))) as pool:
+            futures = [pool.submit(self.NewJob, fn, name, priv) for fn, name in pairs]
+        return {name: future.result() for (_, name), future in zip(pairs, futures)}
     def NewExec(self, args: list, retries: int, priority: int, backoff: int, exec_time: int, interval: int, ttl: int, envs: Envs) -> dict:
         """
         Parameters
@@ -291,7 +645,67 @@ class Gizo:
         -------
         exec with specified config
         """
-        return json.loads(self.__client.NewExec(args, retries, priority, backoff, exec_time, interval, ttl, self.__keys['pub'], json.dumps(envs.envs)))
+        return self.__model(self.__client.NewExec(args, retries, priority, backoff, exec_time, interval, ttl, self.__keys['pub'], codec.dumps(envs.envs)), models.Exec)
+    def NewExecTemplate(self, job_id: str, retries: int, priority: int, backoff: int, exec_time: int, interval: int, ttl: int, envs: Envs) -> ExecTemplate:
+        """Creates one exec with NewExec and compiles it into a template execs differing only in args are stamped from
+        Parameters
+        ----------
+        job_id : str
+            id of job execs run
+        retries : int
+            number of max times to run the job on fail
+        priority : int
+            priority of exec
+        backoff : int
+            time between retries (seconds)
+        exec_time : int
+            unix of time to when exec should should be scheduled
+        interval : int
+            time between periodic execs (seconds)
+        ttl : int
+            time limit of job running (minutes)
+        envs : Envs
+            environments variables provided to exec
+
+        Returns : ExecTemplate
+        -------
+        template of exec with specified config
+        """
+        return ExecTemplate(job_id, codec.loads(self.__client.NewExec([], retries, priority, backoff, exec_time, interval, ttl, self.__keys['pub'], codec.dumps(envs.envs))))
+    def BuildExec(self, args: list, retries: int, priority: int, backoff: int, exec_time: int, interval: int, ttl: int, envs: Envs) -> dict:
+        """Builds an exec locally in the structure NewExec returns - only the first exec built with a set of envs
+        makes a NewExec call, to have the dispatcher encrypt them
+        Parameters
+        ----------
+        args : list
+            parameters passed into job
+        retries : int
+            number of max times to run the job on fail
+        priority : int
+            priority of exec
+        backoff : int
+            time between retries (seconds)
+        exec_time : int
+            unix of time to when exec should should be scheduled
+        interval : int
+            time between periodic execs (seconds)
+        ttl : int
+            time limit of job running (minutes)
+        envs : Envs
+            environments variables provided to exec
+
+        Returns : dict
+        -------
+        exec with specified config
+        """
+        if self.__builder is None:
+            self.warmup()
+            self.__builder = ExecBuilder(self.__keys['pub'], self.__encrypt_envs)
+        e = self.__builder.build(args, retries, priority, backoff, exec_time, interval, ttl, envs)
+        return models.Exec(e) if self.__typed else e
+    def __encrypt_envs(self, envs: str) -> str:
+        """Has the dispatcher encrypt envs through NewExec"""
+        return codec.loads(self.__client.NewExec([], 0, 0, 0, 0, 0, 0, self.__keys['pub'], envs))["Envs"]
     def WorkersCount(self) -> int:
         """
         Returns : int
@@ -320,7 +734,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : str
         -------
@@ -331,20 +745,20 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecStatus(job_id, exec_hash)
+        return self.__client.ExecStatus(job_id, hash_arg(exec_hash))
     def CancelExec(self, exec_hash:list) -> Any:
         """
         Parameters
         -----------
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Raises
         ------
         Exception 
             if exec isn't running
         """
-        return self.__client.CancelExec(exec_hash)
+        return self.__client.CancelExec(hash_arg(exec_hash))
     def ExecTimestamp(self, job_id: str, exec_hash: list) -> int:
         """
         Parameters
@@ -352,7 +766,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : int
         -------
@@ -363,7 +777,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecTimestamp(job_id, exec_hash)
+        return self.__client.ExecTimestamp(job_id, hash_arg(exec_hash))
     def ExecTimestampString(self, job_id: str, exec_hash: list) -> str:
         """
         Parameters
@@ -371,7 +785,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : str
         -------
@@ -382,7 +796,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecTimestampString(job_id, exec_hash)
+        return self.__client.ExecTimestampString(job_id, hash_arg(exec_hash))
     def ExecDurationNanoseconds(self, job_id: str, exec_hash: list) -> int:
         """
         Parameters
@@ -390,7 +804,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : int
         -------
@@ -401,7 +815,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecDurationNanoseconds(job_id, exec_hash)
+        return self.__client.ExecDurationNanoseconds(job_id, hash_arg(exec_hash))
     def ExecDurationSeconds(self, job_id: str, exec_hash: list) -> float:
         """
         Parameters
@@ -409,7 +823,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : float
         -------
@@ -420,7 +834,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecDurationSeconds(job_id, exec_hash)
+        return self.__client.ExecDurationSeconds(job_id, hash_arg(exec_hash))
     def ExecDurationMinutes(self, job_id: str, exec_hash: list) -> float:
         """
         Parameters
@@ -428,7 +842,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : float
         -------
@@ -439,7 +853,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecDurationMinutes(job_id, exec_hash)
+        return self.__client.ExecDurationMinutes(job_id, hash_arg(exec_hash))
     def ExecDurationString(self, job_id: str, exec_hash: list) -> str:
         """
         Parameters
@@ -447,7 +861,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : str
         -------
@@ -458,7 +872,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecDurationString(job_id, exec_hash)
+        return self.__client.ExecDurationString(job_id, hash_arg(exec_hash))
     def ExecArgs(self, job_id: str, exec_hash: list) -> list:
         """
         Parameters
@@ -466,7 +880,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : list
         -------
@@ -477,7 +891,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecArgs(job_id, exec_hash)
+        return self.__client.ExecArgs(job_id, hash_arg(exec_hash))
     def ExecErr(self, job_id: str, exec_hash: list) -> Any:
         """
         Parameters
@@ -485,7 +899,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns
         -------
@@ -496,7 +910,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecErr(job_id, exec_hash)
+        return self.__client.ExecErr(job_id, hash_arg(exec_hash))
     def ExecPriority(self, job_id: str, exec_hash: list) -> int:
         """
         Parameters
@@ -504,7 +918,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : int
         -------
@@ -515,7 +929,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecPriority(job_id, exec_hash)
+        return self.__client.ExecPriority(job_id, hash_arg(exec_hash))
     def ExecResult(self, job_id: str, exec_hash: list) -> Any:
         """
         Parameters
@@ -523,7 +937,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns 
         -------
@@ -534,7 +948,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecResult(job_id, exec_hash)
+        return self.__client.ExecResult(job_id, hash_arg(exec_hash))
     def ExecRetries(self, job_id: str, exec_hash: list) -> int:
         """
         Parameters
@@ -542,7 +956,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : int
         -------
@@ -553,7 +967,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecRetries(job_id, exec_hash)
+        return self.__client.ExecRetries(job_id, hash_arg(exec_hash))
     def ExecBackoff(self, job_id: str, exec_hash: list) -> float:
         """
         Parameters
@@ -561,7 +975,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : float
         -------
@@ -572,7 +986,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecBackoff(job_id, exec_hash)
+        return self.__client.ExecBackoff(job_id, hash_arg(exec_hash))
     def ExecExecutionTime(self, job_id: str, exec_hash: list) -> int:
         """
         Parameters
@@ -580,7 +994,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : int
         -------
@@ -591,7 +1005,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecExecutionTime(job_id, exec_hash)
+        return self.__client.ExecExecutionTime(job_id, hash_arg(exec_hash))
     def ExecExecutionTimeString(self, job_id: str, exec_hash: list) -> str:
         """
         Parameters
@@ -599,7 +1013,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : str
         -------
@@ -610,7 +1024,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecExecutionTimeString(job_id, exec_hash)
+        return self.__client.ExecExecutionTimeString(job_id, hash_arg(exec_hash))
     def ExecInterval(self, job_id: str, exec_hash: list) -> int:
         """
         Parameters
@@ -618,7 +1032,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : int
         -------
@@ -629,7 +1043,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecInterval(job_id, exec_hash)
+        return self.__client.ExecInterval(job_id, hash_arg(exec_hash))
     def ExecBy(self, job_id: str, exec_hash: list) -> str:
         """
         Parameters
@@ -637,7 +1051,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : str
         -------
@@ -648,7 +1062,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecBy(job_id, exec_hash)
+        return self.__client.ExecBy(job_id, hash_arg(exec_hash))
     def ExecTtlNanoseconds(self, job_id: str, exec_hash: list) -> int:
         """
         Parameters
@@ -656,7 +1070,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : int
         -------
@@ -667,7 +1081,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecTtlNanoseconds(job_id, exec_hash)
+        return self.__client.ExecTtlNanoseconds(job_id, hash_arg(exec_hash))
     def ExecTtlSeconds(self, job_id: str, exec_hash: list) -> float:
         """
         Parameters
@@ -675,7 +1089,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : float
         -------
@@ -686,7 +1100,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecTtlSeconds(job_id, exec_hash)
+        return self.__client.ExecTtlSeconds(job_id, hash_arg(exec_hash))
     def ExecTtlMinutes(self, job_id: str, exec_hash: list) -> float:
         """
         Parameters
@@ -694,7 +1108,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : float
         -------
@@ -705,7 +1119,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecTtlMinutes(job_id, exec_hash)
+        return self.__client.ExecTtlMinutes(job_id, hash_arg(exec_hash))
     def ExecTtlHours(self, job_id: str, exec_hash: list) -> float:
         """
         Parameters
@@ -713,7 +1127,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : float
         -------
@@ -724,7 +1138,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecTtlHours(job_id, exec_hash)
+        return self.__client.ExecTtlHours(job_id, hash_arg(exec_hash))
     def ExecTtlString(self, job_id: str, exec_hash: list) -> str:
         """
         Parameters
@@ -732,7 +1146,7 @@ class Gizo:
         job_id : str
             id of job exec ran 
         exec_hash : list
-            byte array of exec hash - use hex_to_bytes method in utils module to convert hex to bytes
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
 
         Returns : float
         -------
@@ -743,7 +1157,7 @@ class Gizo:
         Exception 
             if unable to find exec
         """
-        return self.__client.ExecTtlString(job_id, exec_hash)
+        return self.__client.ExecTtlString(job_id, hash_arg(exec_hash))
     def JobQueueCount(self) -> int:
         """
         Returns : int
@@ -759,7 +1173,9 @@ class Gizo:
         height of latest block in the blockchain
 
         """
-        return self.__client.LatestBlockHeight()
+        height = self.__client.LatestBlockHeight()
+        self.block_cache.observe_tip(height)
+        return height
     def Job(self, job_id: str) -> dict:
         """
         Parameters
@@ -771,7 +1187,7 @@ class Gizo:
         job
 
         """
-        return json.loads(self.__client.Job(job_id))
+        return self.__model(self.__client.Job(job_id), models.Job)
     def JobSubmisstionTimeUnix(self, job_id: str) -> int:
         """
         Parameters
@@ -831,7 +1247,7 @@ class Gizo:
         latest exec of job
 
         """
-        return json.loads(self.__client.JobLatestExec(job_id))
+        return self.__model(self.__client.JobLatestExec(job_id), models.Exec)
     def JobExecs(self, job_id: str) -> dict:
         """
         Parameters
@@ -843,7 +1259,84 @@ class Gizo:
         all execs of a job
 
         """
-        return json.loads(self.__client.JobExecs(job_id))
+        return self.__model(self.__client.JobExecs(job_id), lambda raw: [models.Exec(e) for e in codec.loads(raw)])
+    def ExecDetails(self, job_id: str, exec_hash: list) -> models.ExecDetails:
+        """
+        Parameters
+        -----------
+        job_id : str
+            id of job exec ran
+        exec_hash : list
+            byte array of exec hash or ExecHash - use hex_to_bytes method or ExecHash in utils module to convert hex
+
+        Returns : ExecDetails
+        -------
+        every field of an exec in one record
+
+        Raises
+        ------
+        Exception
+            if unable to find exec
+        """
+        return self.ExecDetailsMany(job_id, [exec_hash])[0]
+    def ExecDetailsMany(self, job_id: str, exec_hashes: List[list], workers: int=16) -> List[models.ExecDetails]:
+        """Reads the job's execs once and picks out the requested ones
+        Execs not yet in the job's execs, or every exec if the dispatcher doesn't have JobExecs, are
+        read field by field, with the calls made concurrently
+        Parameters
+        -----------
+        job_id : str
+            id of job execs ran
+        exec_hashes : list
+            byte arrays of exec hashes
+        workers : int
+            maximum number of concurrent per-field calls
+
+        Returns : list
+        -------
+        ExecDetails in the same order as exec_hashes
+
+        Raises
+        ------
+        Exception
+            if unable to find an exec
+        """
+        try:
+            execs = codec.loads(self.__client.JobExecs(job_id))
+        except hprose.HproseException as e:
+            if not _unsupported(e):
+                raise
+            execs = []
+        if isinstance(execs, dict):
+            execs = execs.get("Execs") or []
+        indexed: Dict[str, dict] = {}
+        for e in execs or []:
+            if e.get("Hash"):
+                indexed[e["Hash"]] = e
+        details: List[Optional[models.ExecDetails]] = []
+        missing: List[int] = []
+        for i, exec_hash in enumerate(exec_hashes):
+            e = indexed.get(base64.b64encode(bytes(exec_hash)).decode("utf-8"))
+            if e is None:
+                details.append(None)
+                missing.append(i)
+            else:
+                details.append(models.ExecDetails.from_exec(job_id, e))
+        if missing:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                calls = {}
+                for i in missing:
+                    for field, method, _ in _EXEC_FIELDS:
+                        calls[(i, field)] = pool.submit(getattr(self, method), job_id, exec_hashes[i])
+                for i in missing:
+                    fields: Dict[str, Any] = {}
+                    for field, _, scale in _EXEC_FIELDS:
+                        value = calls[(i, field)].result()
+                        if scale is not None and value is not None:
+                            value = int(value * scale)
+                        fields[field] = value
+                    details[i] = models.ExecDetails(job_id=job_id, hash=list(exec_hashes[i]), retries=None, pub=None, envs=None, **fields)
+        return details
     def BlockHashesHex(self) -> list:
         """
         Returns : list
@@ -859,7 +1352,7 @@ class Gizo:
         pub and priv keys
 
         """
-        return json.loads(self.__client.KeyPair())
+        return codec.loads(self.__client.KeyPair())
     def Solo(self, jr: Requests) -> Any:
         """ Executes a single exec
         Parameters
@@ -901,4 +1394,44 @@ class Gizo:
             if ttl duration surpases gizo limit
             if number of retries is greated
         """
+        if self.limits is not None:
+            limits.validate(jrs, self.limits.max_execs, self.limits.max_retries, self.limits.max_ttl)
         return self.__client.Batch(jrs)
+    def BatchMany(self, jrs: list, workers: int=8, max_execs: Optional[int]=None, targets: Optional[List["Gizo"]]=None) -> limits.BatchResult:
+        """ Executes any number of execs in parallel, split into Batch calls that fit gizo limits
+        Parameters
+        ----------
+        jrs : list
+            list of Requests
+        workers : int
+            maximum number of Batch calls in flight at once
+        max_execs : int
+            most execs a single Batch call holds - defaults to the client's limits
+        targets : list
+            other connected clients chunks are spread across round robin, e.g to use several dispatchers
+
+        Returns : BatchResult
+        -------
+        reply of each chunk (None where it failed), the chunks submitted and the chunks that failed
+
+        Raises
+        ------
+        Exception
+            if ttl duration surpases gizo limit
+            if number of retries is greated
+        """
+        if self.limits is not None:
+            limits.validate(jrs, max_retries=self.limits.max_retries, max_ttl=self.limits.max_ttl)
+        chunks = limits.chunk(jrs, max_execs if max_execs is not None else (self.limits or limits.DEFAULT).max_execs)
+        clients = [self] + list(targets or [])
+        with ThreadPoolExecutor(max_workers=max(min(workers, len(chunks)), 1)) as pool:
+            futures = [pool.submit(clients[i % len(clients)].Batch, c) for i, c in enumerate(chunks)]
+        replies = []
+        errors = []
+        for i, future in enumerate(futures):
+            try:
+                replies.append(limits.decode(future.result()))
+            except Exception as e:
+                replies.append(None)
+                errors.append(limits.ChunkError(i, chunks[i], e))
+        return limits.BatchResult(replies, chunks, errors)
@@ -1,6 +1,22 @@
 """Requests"""
-import json
-from typing import Sequence, Dict, List
+from typing import Any, Sequence, Dict, List, Optional, Tuple, Union
+import gizo.codec as codec
+from gizo.models import Exec
+
+class EncodedExec:
+    """Exec already encoded as json, spliced into Requests.jrs without being encoded again
+    Parameters
+    ----------
+    json : str
+        json of exec
+    """
+    __slots__ = ("json",)
+    def __init__(self, json: str) -> None:
+        self.json = json
+    @property
+    def data(self) -> dict:
+        """decoded exec"""
+        return codec.loads(self.json)
 
 class Requests:
     """Requests for tasks to be executed (multiple execs)
@@ -10,17 +26,77 @@ class Requests:
     job_id : str
         id of job to execute
     job_exec : dict
-        execs to be executed
+        execs to be executed - dicts, Exec or EncodedExec
     """
-    def __init__(self, job_id: str, *execs: Dict) -> None:
+    def __init__(self, job_id: str, *execs: Union[Dict, Exec, "EncodedExec"]) -> None:
         self.id: str = job_id
-        self.execs: List[Dict] = []
+        self.execs: List[Union[Dict, EncodedExec]] = []
         for e in execs:
-            self.execs.append(e)
+            self.execs.append(e.data if isinstance(e, Exec) else e)
     def jrs(self) -> str:
         """
         Returns - json
         -------
         json of id and execs
         """
-        return json.dumps({'ID': self.id, 'Execs': self.execs})
+        if not any(isinstance(e, EncodedExec) for e in self.execs):
+            return codec.dumps({'ID': self.id, 'Execs': self.execs})
+        execs = ",".join(e.json if isinstance(e, EncodedExec) else codec.dumps(e) for e in self.execs)
+        return f'{{"ID":{codec.dumps(self.id)},"Execs":[{execs}]}}'
+
+def exec_job_ids(jrs: Sequence[Any]) -> List[str]:
+    """
+    Parameters
+    ----------
+    jrs : list
+        Requests, or their json or dict form
+
+    Returns : list
+    -------
+    job id of every exec in the requests, in order
+    """
+    ids: List[str] = []
+    for jr in jrs:
+        if isinstance(jr, Requests):
+            ids.extend([jr.id] * len(jr.execs))
+        else:
+            content = codec.loads(jr) if isinstance(jr, (str, bytes, memoryview)) else jr
+            ids.extend([content["ID"]] * len(content["Execs"]))
+    return ids
+def reply_execs(reply: Any, job_ids: List[str]) -> Optional[List[Tuple[str, dict]]]:
+    """Finds the execs in a dispatcher's reply to Solo, Batch, Chain or Chord
+    Parameters
+    ----------
+    reply : any
+        reply of the dispatcher - json or decoded
+    job_ids : list
+        exec_job_ids of the submitted requests, used for execs the reply doesn't give a job id for
+
+    Returns : list
+    -------
+    job id and exec of every exec in the reply - None if the reply doesn't describe its execs
+    """
+    if isinstance(reply, (str, bytes, memoryview)):
+        try:
+            reply = codec.loads(reply)
+        except ValueError:
+            return None
+    if isinstance(reply, dict):
+        reply = [reply]
+    if not isinstance(reply, list):
+        return None
+    found: List[Tuple[Optional[str], dict]] = []
+    for item in reply:
+        if not isinstance(item, dict):
+            return None
+        if "Execs" in item:
+            found.extend((item.get("ID"), e) for e in item["Execs"])
+        elif "Status" in item:
+            found.append((None, item))
+        else:
+            return None
+    if any(job_id is None for job_id, _ in found):
+        if len(found) != len(job_ids):
+            return None
+        found = [(job_id or job_ids[i], e) for i, (job_id, e) in enumerate(found)]
+    return found
@@ -0,0 +1,120 @@
+"""Limits enforced by dispatchers and client side validation of them
+The defaults are the limits the Gizo dispatcher enforces on Batch, retries and ttl. Dispatchers
+don't report their limits over rpc, so they are mirrored here - pass other Limits to Gizo if a
+network enforces different ones, or None to leave checking to the dispatcher
+"""
+from typing import List, NamedTuple, Optional, Any, Sequence
+import gizo.codec as codec
+from gizo.job import EncodedExec, Requests
+
+MAX_EXECS: int = 5
+"""Most execs a single Batch may hold"""
+MAX_RETRIES: int = 10
+"""Most retries an exec may have"""
+MAX_TTL: int = 60 * 60 * 10 ** 9
+"""Longest ttl an exec may have (nanoseconds)"""
+
+class Limits(NamedTuple):
+    """Limits requests are checked against before they are sent"""
+    max_execs: int = MAX_EXECS
+    """most execs a single Batch may hold"""
+    max_retries: int = MAX_RETRIES
+    """most retries an exec may have"""
+    max_ttl: int = MAX_TTL
+    """longest ttl an exec may have (nanoseconds)"""
+
+DEFAULT: Limits = Limits()
+"""Limits of the Gizo dispatcher"""
+
+class ChunkError(NamedTuple):
+    """Failure of one chunk of a BatchMany"""
+    index: int
+    """position of chunk in BatchResult.chunks"""
+    jrs: List[Requests]
+    error: Exception
+
+class BatchResult(NamedTuple):
+    """Outcome of a BatchMany"""
+    results: list
+    """reply of each chunk, in the order of chunks - None where the chunk failed"""
+    chunks: List[List[Requests]]
+    """requests of each Batch call"""
+    errors: List[ChunkError]
+    """chunks that failed, in submission order"""
+
+def validate(jrs: Sequence[Requests], max_execs: Optional[int]=None, max_retries: int=MAX_RETRIES, max_ttl: int=MAX_TTL) -> None:
+    """Checks requests against the limits dispatchers enforce on them, anything that isn't Requests is skipped
+    Parameters
+    ----------
+    jrs : list
+        list of Requests
+    max_execs : int
+        most execs the requests may hold together - None to not check
+    max_retries : int
+        most retries an exec may have
+    max_ttl : int
+        longest ttl an exec may have (nanoseconds)
+
+    Raises
+    ------
+    Exception
+        if the number of execs surpasses the limit
+        if the retries of an exec surpass the limit
+        if the ttl of an exec surpasses the limit
+    """
+    jrs = [jr for jr in jrs if isinstance(jr, Requests)]
+    if max_execs is not None:
+        count = sum(len(jr.execs) for jr in jrs)
+        if count > max_execs:
+            raise Exception(f"{count} execs, over the limit of {max_execs}")
+    for jr in jrs:
+        for i, e in enumerate(jr.execs):
+            if isinstance(e, EncodedExec):
+                e = e.data
+            if (e.get("Retries") or 0) > max_retries:
+                raise Exception(f"exec {i} of job {jr.id} has {e['Retries']} retries, over the limit of {max_retries}")
+            if (e.get("TTL") or 0) > max_ttl:
+                raise Exception(f"exec {i} of job {jr.id} has a ttl of {e['TTL']}ns, over the limit of {max_ttl}ns")
+def chunk(jrs: Sequence[Requests], max_execs: int=MAX_EXECS) -> List[List[Requests]]:
+    """Splits requests into chunks of at most max_execs execs, keeping exec order
+    Requests with more execs than fit in the current chunk are split into several Requests of the same job
+    Parameters
+    ----------
+    jrs : list
+        list of Requests
+    max_execs : int
+        most execs a chunk may hold
+
+    Returns : list
+    -------
+    list of chunks, each a list of Requests
+    """
+    if max_execs < 1:
+        raise Exception("max_execs must be at least 1")
+    chunks: List[List[Requests]] = []
+    current: List[Requests] = []
+    size = 0
+    for jr in jrs:
+        start = 0
+        while start < len(jr.execs):
+            take = min(max_execs - size, len(jr.execs) - start)
+            if start == 0 and take == len(jr.execs):
+                current.append(jr)
+            else:
+                current.append(Requests(jr.id, *jr.execs[start:start + take]))
+            start += take
+            size += take
+            if size == max_execs:
+                chunks.append(current)
+                current, size = [], 0
+    if current:
+        chunks.append(current)
+    return chunks
+def decode(reply: Any) -> Any:
+    """Decodes a Batch reply given as json, other replies are returned as they are"""
+    if isinstance(reply, (str, bytes)):
+        try:
+            return codec.loads(reply)
+        except ValueError:
+            pass
+    return reply
@@ -0,0 +1,335 @@
+"""Load generator measuring end-to-end exec throughput of one client
+
+Run with python -m gizo.loadgen, e.g against a local stand-in:
+
+    python -m gizo.loadgen --standin --rate 200 --duration 10
+    python -m gizo.loadgen --url gizo://pub@ip:port --concurrency 16 --mode batch --batch-size 5
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import gizo.codec as codec
+import gizo.status as status
+from gizo.env import Envs
+from gizo.job import Requests, exec_job_ids, reply_execs
+from gizo.utils import b64_to_bytes
+from gizo.watcher import ExecWatcher, Transition, ABANDONED
+
+SOLO: str = "solo"
+"""Submit every exec with Solo"""
+BATCH: str = "batch"
+"""Submit execs batch_size at a time with Batch"""
+
+JOB: str = "func Echo(n){\n    return n\n}\n"
+"""Job deployed when no job is given"""
+
+class Percentiles(NamedTuple):
+    """Summary of latency samples (seconds)"""
+    count: int
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+class LoadReport(NamedTuple):
+    """Outcome of a load run"""
+    mode: str
+    loop: str
+    """open - submissions at a target rate, closed - a fixed number of submissions in flight"""
+    submitted: int
+    """execs accepted by the dispatcher"""
+    completed: int
+    """execs that reached FINISHED"""
+    failed: int
+    """execs that reached TIMEOUT or CANCELLED, or were abandoned because their status polls kept failing"""
+    incomplete: int
+    """execs not done when the run stopped waiting"""
+    errors: int
+    """submission calls that raised"""
+    seconds: float
+    """from the first submission to the last exec done"""
+    submit: Percentiles
+    """latency of submission calls"""
+    end_to_end: Percentiles
+    """latency from submitting an exec to seeing it done"""
+    throughput: float
+    """completed execs per second"""
+    submit_rate: float
+    """submitted execs per second"""
+    def format(self) -> str:
+        """
+        Returns : str
+        -------
+        report as a human readable table
+        """
+        def row(name: str, p: Percentiles) -> str:
+            return f"{name:12} {p.count:8} {p.p50 * 1e3:10.2f} {p.p95 * 1e3:10.2f} {p.p99 * 1e3:10.2f} {p.max * 1e3:10.2f}"
+        return "\n".join([
+            f"{self.mode} {self.loop} loop - {self.submitted} submitted, {self.completed} completed, {self.failed} failed, {self.incomplete} incomplete, {self.errors} submission errors in {self.seconds:.2f}s",
+            f"throughput {self.throughput:.1f} execs/s, submitted {self.submit_rate:.1f} execs/s",
+            f"{'latency':12} {'count':>8} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}",
+            row("submit", self.submit),
+            row("end to end", self.end_to_end),
+        ])
+
+def percentiles(samples: Sequence[float]) -> Percentiles:
+    """
+    Parameters
+    ----------
+    samples : list
+        latencies (seconds)
+
+    Returns : Percentiles
+    -------
+    nearest-rank percentiles of samples - zeros if there are none
+    """
+    if not samples:
+        return Percentiles(0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    ordered = sorted(samples)
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, int(-(-p * len(ordered) // 100)) - 1))]
+    return Percentiles(len(ordered), sum(ordered) / len(ordered), rank(50), rank(95), rank(99), ordered[-1])
+
+class _Submission:
+    """Execs of one submission still being tracked"""
+    __slots__ = ("start", "left", "done")
+    def __init__(self, start: float) -> None:
+        self.start = start
+        self.left = 0
+        self.done = threading.Event()
+
+class LoadGenerator:
+    """Submits execs with Solo or Batch and tracks them to completion through ExecStatus
+    Open loop submits at a target rate regardless of how long submissions take, end-to-end latency is
+    measured from when a submission was due so queueing behind slow submissions is counted. Closed
+    loop keeps a fixed number of submissions in flight, each slot submits again once every exec of
+    its last submission is done
+    Parameters
+    ----------
+    gizo : Gizo
+        connected client to submit with
+    job_id : str
+        id of job execs run
+    mode : str
+        SOLO or BATCH
+    batch_size : int
+        execs per Batch call - Solo calls carry one exec
+    rate : float
+        submissions per second, for an open loop
+    concurrency : int
+        submissions in flight, for a closed loop
+    args : callable
+        takes the number of an exec and returns its args
+    poll : float
+        seconds between ExecStatus polls of an exec
+    workers : int
+        most submission and poll calls in flight at once
+    """
+    def __init__(self, gizo: Any, job_id: str, mode: str=SOLO, batch_size: int=1, rate: Optional[float]=None, concurrency: Optional[int]=None, args: Optional[Callable[[int], list]]=None, poll: float=0.05, workers: int=32) -> None:
+        if mode not in (SOLO, BATCH):
+            raise Exception(f"unknown mode {mode}")
+        if (rate is None) == (concurrency is None):
+            raise Exception("one of rate and concurrency must be given")
+        self.gizo = gizo
+        self.job_id = job_id
+        self.mode = mode
+        self.batch_size = batch_size if mode == BATCH else 1
+        self.rate = rate
+        self.concurrency = concurrency
+        self.args: Callable[[int], list] = args if args is not None else (lambda n: [n])
+        self.workers = workers
+        self.watcher = ExecWatcher(gizo, on_change=self.__on_change, workers=workers, min_interval=poll, max_interval=poll)
+        self.__lock = threading.Lock()
+        self.__tracked: Dict[Tuple[str, bytes], _Submission] = {}
+        self.__count = 0
+        self.__reset()
+    def __reset(self) -> None:
+        self.__submit: List[float] = []
+        self.__end_to_end: List[float] = []
+        self.__submitted = self.__completed = self.__failed = self.__errors = 0
+        self.__last = 0.0
+    def run(self, duration: Optional[float]=10.0, count: Optional[int]=None, drain_timeout: float=30.0) -> LoadReport:
+        """Generates load until duration passes or count submissions are made, then waits for outstanding execs
+        Parameters
+        ----------
+        duration : float
+            seconds to submit for - None to stop on count alone
+        count : int
+            most submissions to make - None to stop on duration alone
+        drain_timeout : float
+            seconds to wait for outstanding execs once submitting stops
+
+        Returns : LoadReport
+        -------
+        latencies and throughput of the run
+        """
+        if duration is None and count is None:
+            raise Exception("one of duration and count must be given")
+        self.__reset()
+        with self.__lock:
+            self.__tracked = {}
+        start = time.perf_counter()
+        deadline = None if duration is None else start + duration
+        numbers = iter(range(count)) if count is not None else iter(int, 1)
+        if self.rate is not None:
+            self.__open(start, deadline, numbers)
+        else:
+            self.__closed(deadline, numbers)
+        self.watcher.wait(drain_timeout)
+        self.watcher.stop()
+        with self.__lock:
+            incomplete = len(self.__tracked)
+            self.__tracked = {}
+            end = max(self.__last, start)
+            seconds = end - start
+            submitted, completed = self.__submitted, self.__completed
+            return LoadReport(
+                self.mode, "open" if self.rate is not None else "closed", submitted, completed, self.__failed, incomplete, self.__errors, seconds,
+                percentiles(self.__submit), percentiles(self.__end_to_end),
+                completed / seconds if seconds > 0 else 0.0, submitted / seconds if seconds > 0 else 0.0,
+            )
+    def __open(self, start: float, deadline: Optional[float], numbers: Any) -> None:
+        interval = 1.0 / self.rate
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for i, _ in enumerate(numbers):
+                due = start + i * interval
+                if deadline is not None and due >= deadline:
+                    break
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self.__submit_one, due)
+    def __closed(self, deadline: Optional[float], numbers: Any) -> None:
+        lock = threading.Lock()
+        def slot() -> None:
+            while deadline is None or time.perf_counter() < deadline:
+                with lock:
+                    if next(numbers, None) is None:
+                        return
+                submission = self.__submit_one(time.perf_counter())
+                if submission is not None:
+                    submission.done.wait(None if deadline is None else max(deadline - time.perf_counter(), 0))
+        threads = [threading.Thread(target=slot, name=f"gizo-loadgen-{i}", daemon=True) for i in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    def __requests(self) -> Requests:
+        with self.__lock:
+            first = self.__count
+            self.__count += self.batch_size
+        return Requests(self.job_id, *[self.gizo.BuildExec(self.args(first + n), 0, 0, 0, 0, 0, 0, Envs()) for n in range(self.batch_size)])
+    def __submit_one(self, due: float) -> Optional[_Submission]:
+        """Makes one submission and starts tracking its execs - returns None if it failed"""
+        jr = self.__requests()
+        submission = _Submission(due)
+        called = time.perf_counter()
+        try:
+            reply = self.gizo.Solo(jr) if self.mode == SOLO else self.gizo.Batch([jr])
+            execs = reply_execs(reply, exec_job_ids([jr])) or []
+        except Exception:
+            with self.__lock:
+                self.__errors += 1
+            return None
+        now = time.perf_counter()
+        tracked = []
+        with self.__lock:
+            self.__submit.append(now - called)
+            self.__submitted += len(execs)
+            for job_id, e in execs:
+                exec_hash = e.get("Hash")
+                if isinstance(exec_hash, str):
+                    exec_hash = b64_to_bytes(exec_hash)
+                if e.get("Status") in status.TERMINAL or not exec_hash:
+                    self.__finish(submission, e.get("Status"), now)
+                    continue
+                submission.left += 1
+                self.__tracked[(job_id, bytes(exec_hash))] = submission
+                tracked.append((job_id, exec_hash))
+            if not submission.left:
+                submission.done.set()
+        for job_id, exec_hash in tracked:
+            self.watcher.watch(job_id, exec_hash)
+        return submission
+    def __on_change(self, transition: Transition) -> None:
+        if transition.status not in status.TERMINAL and transition.status != ABANDONED:
+            return
+        now = time.perf_counter()
+        with self.__lock:
+            submission = self.__tracked.pop((transition.job_id, bytes(transition.exec_hash)), None)
+            if submission is None:
+                return
+            submission.left -= 1
+            self.__finish(submission, transition.status, now)
+            if not submission.left:
+                submission.done.set()
+    def __finish(self, submission: _Submission, state: Optional[str], now: float) -> None:
+        """Counts an exec as done - called holding the lock"""
+        self.__end_to_end.append(now - submission.start)
+        self.__last = max(self.__last, now)
+        if state == status.FINISHED:
+            self.__completed += 1
+        else:
+            self.__failed += 1
+
+def main(argv: Optional[List[str]]=None) -> None:
+    """Runs a load test from the command line and prints its report"""
+    from gizo.gizo import Gizo
+    from gizo.standin import StandIn
+    parser = argparse.ArgumentParser(prog="python -m gizo.loadgen", description="Measure end-to-end exec throughput")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="url of dispatcher to load")
+    target.add_argument("--centrum", help="url of centrum to find a dispatcher through")
+    target.add_argument("--test", action="store_true", help="connect to the test network")
+    target.add_argument("--standin", action="store_true", help="load a local stand-in dispatcher")
+    loop = parser.add_mutually_exclusive_group(required=True)
+    loop.add_argument("--rate", type=float, help="submissions per second (open loop)")
+    loop.add_argument("--concurrency", type=int, help="submissions in flight (closed loop)")
+    parser.add_argument("--mode", choices=(SOLO, BATCH), default=SOLO)
+    parser.add_argument("--batch-size", type=int, default=5, help="execs per Batch call")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to submit for")
+    parser.add_argument("--count", type=int, default=None, help="most submissions to make")
+    parser.add_argument("--drain-timeout", type=float, default=30.0, help="seconds to wait for outstanding execs")
+    parser.add_argument("--poll", type=float, default=0.05, help="seconds between ExecStatus polls of an exec")
+    parser.add_argument("--workers", type=int, default=32, help="most calls in flight at once")
+    parser.add_argument("--job", help="anko file of job to run - defaults to a job returning its argument")
+    parser.add_argument("--name", default="Echo", help="name of job's main function")
+    parser.add_argument("--config", help="config file of the client")
+    parser.add_argument("--standin-workers", type=int, default=64, help="workers of the stand-in")
+    parser.add_argument("--standin-exec-seconds", type=float, default=0.01, help="seconds a stand-in worker takes per exec")
+    parser.add_argument("--standin-latency", type=float, default=0.0, help="seconds the stand-in adds to every request")
+    parser.add_argument("--json", action="store_true", help="print the report as json")
+    args = parser.parse_args(argv)
+    scratch = tempfile.mkdtemp(prefix="gizo-loadgen-")
+    standin = None
+    if args.standin:
+        standin = StandIn(workers=args.standin_workers, exec_seconds=args.standin_exec_seconds, latency=args.standin_latency).start()
+        gizo = Gizo(url=standin.url, export_file=args.config or os.path.join(scratch, ".gizo"), pool_size=args.workers)
+    else:
+        gizo = Gizo(url=args.url, export_file=args.config, test=args.test, centrum=args.centrum, pool_size=args.workers)
+    job = args.job
+    if job is None:
+        job = os.path.join(scratch, "echo.ank")
+        with open(job, "w") as f:
+            f.write(JOB)
+    try:
+        generator = LoadGenerator(gizo, gizo.NewJob(job, args.name, False), args.mode, args.batch_size, args.rate, args.concurrency, poll=args.poll, workers=args.workers)
+        report = generator.run(args.duration, args.count, args.drain_timeout)
+    finally:
+        if standin is not None:
+            standin.stop()
+    if args.json:
+        content = report._asdict()
+        content["submit"] = report.submit._asdict()
+        content["end_to_end"] = report.end_to_end._asdict()
+        print(codec.dumps_pretty(content))
+    else:
+        print(report.format())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Rpc call metrics"""
+import bisect
+import os
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Default upper bounds of latency histogram buckets (seconds)"""
+
+class Call(NamedTuple):
+    """One rpc call, as passed to hooks"""
+    method: str
+    dispatcher: str
+    """ip:port of dispatcher"""
+    seconds: float
+    error: Optional[BaseException]
+    """exception raised by the call - None if it succeeded"""
+    sent: int
+    """bytes of request body"""
+    received: int
+    """bytes of response body"""
+
+class _Series:
+    """Counters of one method on one dispatcher"""
+    __slots__ = ("calls", "errors", "seconds", "sent", "received", "buckets")
+    def __init__(self, size: int) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.sent = 0
+        self.received = 0
+        self.buckets = [0] * size
+
+class Metrics:
+    """Counts, errors, latency histograms and payload sizes of rpc calls per method and dispatcher
+    Recording a call is a few additions under a lock, hooks are called with every Call after it is
+    recorded
+    Parameters
+    ----------
+    buckets : list
+        upper bounds of latency histogram buckets (seconds)
+    """
+    def __init__(self, buckets: Sequence[float]=BUCKETS) -> None:
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.hooks: List[Callable[[Call], None]] = []
+        """called with every Call - exceptions raised by hooks are ignored"""
+        self.__series: Dict[Tuple[str, str], _Series] = {}
+        self.__lock = threading.Lock()
+    def add_hook(self, hook: Callable[[Call], None]) -> None:
+        """Calls hook with every recorded Call"""
+        self.hooks.append(hook)
+    def remove_hook(self, hook: Callable[[Call], None]) -> None:
+        """Stops calling hook"""
+        self.hooks.remove(hook)
+    def record(self, method: str, dispatcher: str, seconds: float, error: Optional[BaseException]=None, sent: int=0, received: int=0) -> None:
+        """Records one rpc call
+        Parameters
+        ----------
+        method : str
+            name of rpc method
+        dispatcher : str
+            ip:port of dispatcher
+        seconds : float
+            duration of call
+        error : Exception
+            exception raised by the call - None if it succeeded
+        sent : int
+            bytes of request body
+        received : int
+            bytes of response body
+        """
+        bucket = bisect.bisect_left(self.buckets, seconds)
+        with self.__lock:
+            series = self.__series.get((method, dispatcher))
+            if series is None:
+                series = self.__series[(method, dispatcher)] = _Series(len(self.buckets) + 1)
+            series.calls += 1
+            series.seconds += seconds
+            series.sent += sent
+            series.received += received
+            series.buckets[bucket] += 1
+            if error is not None:
+                series.errors += 1
+        if self.hooks:
+            call = Call(method, dispatcher, seconds, error, sent, received)
+            for hook in list(self.hooks):
+                try:
+                    hook(call)
+                except Exception:
+                    pass
+    def snapshot(self) -> Dict[Tuple[str, str], dict]:
+        """
+        Returns : dict
+        -------
+        counters of every (method, dispatcher) - calls, errors, seconds, sent, received and buckets,
+        where buckets maps each upper bound to the number of calls at or below it
+        """
+        with self.__lock:
+            series = [(key, s.calls, s.errors, s.seconds, s.sent, s.received, list(s.buckets)) for key, s in self.__series.items()]
+        snapshot = {}
+        for key, calls, errors, seconds, sent, received, counts in sorted(series):
+            cumulative, total = {}, 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                total += count
+                cumulative[bound] = total
+            snapshot[key] = {"calls": calls, "errors": errors, "seconds": seconds, "sent": sent, "received": received, "buckets": cumulative}
+        return snapshot
+    def reset(self) -> None:
+        """Drops every counter"""
+        with self.__lock:
+            self.__series = {}
+    def prometheus(self, prefix: str="gizo_rpc") -> str:
+        """
+        Parameters
+        ----------
+        prefix : str
+            prefix of metric names
+
+        Returns : str
+        -------
+        counters in prometheus text exposition format
+        """
+        snapshot = self.snapshot()
+        lines = []
+        def family(name: str, kind: str, doc: str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {doc}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+        def labels(key: Tuple[str, str], le: Optional[str]=None) -> str:
+            method, dispatcher = key
+            bound = "" if le is None else f',le="{le}"'
+            return f'{{method="{_escape(method)}",dispatcher="{_escape(dispatcher)}"{bound}}}'
+        family("calls_total", "counter", "Rpc calls made")
+        lines.extend(f"{prefix}_calls_total{labels(key)} {s['calls']}" for key, s in snapshot.items())
+        family("errors_total", "counter", "Rpc calls that raised")
+        lines.extend(f"{prefix}_errors_total{labels(key)} {s['errors']}" for key, s in snapshot.items())
+        family("request_bytes_total", "counter", "Bytes of rpc request bodies")
+        lines.extend(f"{prefix}_request_bytes_total{labels(key)} {s['sent']}" for key, s in snapshot.items())
+        family("response_bytes_total", "counter", "Bytes of rpc response bodies")
+        lines.extend(f"{prefix}_response_bytes_total{labels(key)} {s['received']}" for key, s in snapshot.items())
+        family("duration_seconds", "histogram", "Rpc call latency")
+        for key, s in snapshot.items():
+            for bound, count in s["buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{prefix}_duration_seconds_bucket{labels(key, le)} {count}")
+            lines.append(f"{prefix}_duration_seconds_sum{labels(key)} {s['seconds']!r}")
+            lines.append(f"{prefix}_duration_seconds_count{labels(key)} {s['calls']}")
+        return "\n".join(lines) + "\n"
+    def write_prometheus(self, path: str, prefix: str="gizo_rpc") -> None:
+        """Writes counters in prometheus text format atomically, e.g for node exporter's textfile collector
+        Parameters
+        ----------
+        path : str
+            file to write
+        prefix : str
+            prefix of metric names
+        """
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "w") as f:
+            f.write(self.prometheus(prefix))
+        os.replace(temp, path)
+
+def _escape(value: str) -> str:
+    """Escapes a prometheus label value"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+METRICS: Metrics = Metrics()
+"""Metrics clients record to unless given their own"""
@@ -0,0 +1,259 @@
+"""Typed records returned by the SDK"""
+import base64
+from typing import NamedTuple, Optional, Any, List, Union
+from gizo.utils import ExecHash
+import gizo.codec as codec
+
+class ExecDetails(NamedTuple):
+    """Every field of an exec in one record
+    Durations (duration, backoff, ttl) are in nanoseconds, times (timestamp, execution_time) are unix
+    Fields the dispatcher doesn't expose over rpc (retries, pub, envs) are None when the exec
+    couldn't be read from the job's execs
+    """
+    job_id: str
+    hash: List[int]
+    status: Optional[str]
+    timestamp: Optional[int]
+    duration: Optional[int]
+    args: Optional[list]
+    err: Any
+    priority: Optional[int]
+    result: Any
+    retries: Optional[int]
+    retries_count: Optional[int]
+    backoff: Optional[int]
+    execution_time: Optional[int]
+    interval: Optional[int]
+    by: Optional[str]
+    ttl: Optional[int]
+    pub: Optional[str]
+    envs: Optional[str]
+    @classmethod
+    def from_exec(cls, job_id: str, e: dict) -> "ExecDetails":
+        """
+        Parameters
+        ----------
+        job_id : str
+            id of job exec ran
+        e : dict
+            exec as returned by JobExecs
+
+        Returns : ExecDetails
+        -------
+        record of exec
+        """
+        return cls(
+            job_id=job_id,
+            hash=list(base64.b64decode(e["Hash"])) if e.get("Hash") else None,
+            status=e.get("Status"),
+            timestamp=e.get("Timestamp"),
+            duration=e.get("Duration"),
+            args=e.get("Args"),
+            err=e.get("Err"),
+            priority=e.get("Priority"),
+            result=e.get("Result"),
+            retries=e.get("Retries"),
+            retries_count=e.get("RetriesCount"),
+            backoff=e.get("Backoff"),
+            execution_time=e.get("ExecutionTime"),
+            interval=e.get("Interval"),
+            by=e.get("By"),
+            ttl=e.get("TTL"),
+            pub=e.get("Pub"),
+            envs=e.get("Envs"),
+        )
+
+class _Field:
+    """Reads a key of a model's payload"""
+    __slots__ = ("key",)
+    def __init__(self, key: str) -> None:
+        self.key = key
+    def __get__(self, model: Any, owner: type) -> Any:
+        if model is None:
+            return self
+        return model.data.get(self.key)
+
+class _Bytes:
+    """Decodes a base64 key of a model's payload on first access and caches it"""
+    __slots__ = ("key", "hex")
+    def __init__(self, key: str, hex: bool=False) -> None:
+        self.key = key
+        self.hex = hex
+    def __get__(self, model: Any, owner: type) -> Any:
+        if model is None:
+            return self
+        if model._cache is None:
+            model._cache = {}
+        name = (self.key, self.hex)
+        if name not in model._cache:
+            value = model.data.get(self.key)
+            if value is not None:
+                value = base64.b64decode(value)
+                if self.hex:
+                    value = value.hex()
+            model._cache[name] = value
+        return model._cache[name]
+
+class _Model:
+    """Payload kept as returned by the dispatcher and decoded on first access
+    Parameters
+    ----------
+    payload : str
+        json as returned by the dispatcher, or the already decoded dict
+    """
+    __slots__ = ("_raw", "_data", "_cache")
+    def __init__(self, payload: Union[str, bytes, memoryview, dict]) -> None:
+        if isinstance(payload, dict):
+            self._raw = None
+            self._data = payload
+        else:
+            self._raw = payload.tobytes() if isinstance(payload, memoryview) else payload
+            self._data = None
+        self._cache: Optional[dict] = None
+    @property
+    def data(self) -> dict:
+        """decoded payload"""
+        if self._data is None:
+            self._data = codec.loads(self._raw)
+        return self._data
+    @property
+    def raw(self) -> Union[str, bytes]:
+        """json of payload - encoded from data if the model was built from a dict"""
+        return self._raw if self._raw is not None else codec.dumps(self._data)
+    def get(self, key: str, default: Any=None) -> Any:
+        """Reads a key of the decoded payload"""
+        return self.data.get(key, default)
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.data!r})"
+
+class Exec(_Model):
+    """Exec as returned by NewExec, JobExecs and JobLatestExec
+    Durations (duration, backoff, ttl) are in nanoseconds, times (timestamp, execution_time) are unix
+    """
+    __slots__ = ("_hash",)
+    def __init__(self, payload: Union[str, bytes, memoryview, dict]) -> None:
+        super(Exec, self).__init__(payload)
+        self._hash: Optional[ExecHash] = None
+    timestamp = _Field("Timestamp")
+    duration = _Field("Duration")
+    args = _Field("Args")
+    err = _Field("Err")
+    priority = _Field("Priority")
+    result = _Field("Result")
+    status = _Field("Status")
+    retries = _Field("Retries")
+    retries_count = _Field("RetriesCount")
+    backoff = _Field("Backoff")
+    execution_time = _Field("ExecutionTime")
+    interval = _Field("Interval")
+    by = _Field("By")
+    ttl = _Field("TTL")
+    pub = _Field("Pub")
+    envs = _Field("Envs")
+    @property
+    def hash(self) -> Optional[ExecHash]:
+        """hash of exec - None until the dispatcher has assigned one"""
+        if self._hash is None and self.data.get("Hash"):
+            self._hash = ExecHash.from_b64(self.data["Hash"])
+        return self._hash
+    def details(self, job_id: str) -> ExecDetails:
+        """
+        Parameters
+        ----------
+        job_id : str
+            id of job exec ran
+
+        Returns : ExecDetails
+        -------
+        record of exec
+        """
+        return ExecDetails.from_exec(job_id, self.data)
+
+class Job(_Model):
+    """Job as returned by Job and found in blocks, its execs are wrapped on first access"""
+    __slots__ = ("_execs",)
+    def __init__(self, payload: Union[str, bytes, memoryview, dict]) -> None:
+        super(Job, self).__init__(payload)
+        self._execs: Optional[List[Exec]] = None
+    id = _Field("ID")
+    name = _Field("Name")
+    task = _Field("Task")
+    private = _Field("Private")
+    submission_time = _Field("SubmissionTime")
+    hash_bytes = _Bytes("Hash")
+    hash_hex = _Bytes("Hash", hex=True)
+    signature = _Bytes("Signature")
+    @property
+    def execs(self) -> List[Exec]:
+        """execs of job"""
+        if self._execs is None:
+            self._execs = [Exec(e) for e in self.data.get("Execs") or []]
+        return self._execs
+
+class BlockHeader(_Model):
+    """Header of a block, hashes are decoded from base64 on first access"""
+    __slots__ = ()
+    timestamp = _Field("Timestamp")
+    nonce = _Field("Nonce")
+    difficulty = _Field("Difficulty")
+    hash_bytes = _Bytes("Hash")
+    hash_hex = _Bytes("Hash", hex=True)
+    prev_block_hash_bytes = _Bytes("PrevBlockHash")
+    prev_block_hash_hex = _Bytes("PrevBlockHash", hex=True)
+    merkle_root_bytes = _Bytes("MerkleRoot")
+    merkle_root_hex = _Bytes("MerkleRoot", hex=True)
+
+class Block(_Model):
+    """Block as returned by the dispatcher
+    A block built from its json only keeps the json, its height and its header - the rest of the block
+    is decoded again whenever data or jobs is read, so cached blocks stay close to the size of their json.
+    Reading "Height" and "Header" by key works as on the decoded dict, so blocks can go in a BlockCache
+    or BlockStore
+    """
+    __slots__ = ("_height", "_header", "_jobs")
+    def __init__(self, payload: Union[str, bytes, memoryview, dict]) -> None:
+        super(Block, self).__init__(payload)
+        self._height: Optional[int] = None
+        self._header: Optional[BlockHeader] = None
+        self._jobs: Optional[List[Job]] = None
+    @property
+    def data(self) -> dict:
+        """decoded block"""
+        if self._data is not None:
+            data = self._data
+        else:
+            data = codec.loads(self._raw)
+        if self._header is None:
+            self._height = data["Height"]
+            self._header = BlockHeader(data["Header"])
+        return data
+    @property
+    def height(self) -> int:
+        """height of block"""
+        if self._header is None:
+            self.data
+        return self._height
+    @property
+    def header(self) -> BlockHeader:
+        """header of block"""
+        if self._header is None:
+            self.data
+        return self._header
+    @property
+    def hash_hex(self) -> str:
+        """hex hash of block"""
+        return self.header.hash_hex
+    @property
+    def jobs(self) -> List[Job]:
+        """jobs in block"""
+        if self._jobs is None:
+            self._jobs = [Job(j) for j in self.data.get("Jobs") or []]
+        return self._jobs
+    def __getitem__(self, key: str) -> Any:
+        if key == "Height":
+            return self.height
+        if key == "Header":
+            return self.header.data
+        return self.data[key]
@@ -0,0 +1,182 @@
+"""Persistent registry of deployed jobs"""
+import hashlib
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, MutableMapping, Optional, Tuple
+import gizo.codec as codec
+
+class JobRegistry(MutableMapping):
+    """Job names and ids kept in an sqlite database shared across processes
+    Behaves like a dict of job name to job id. Lookups go to the database when made, so jobs deployed
+    by other processes are seen and nothing is loaded up front - the database isn't opened until the
+    registry is first used. Every write is atomic, writes made inside batch() are coalesced into one
+    transaction. Deploys are also recorded by the hash of the job's source, so an unchanged job isn't
+    deployed again
+    Parameters
+    ----------
+    path : str
+        database file - created on first use if missing
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.__db: Optional[sqlite3.Connection] = None
+        self.__lock = threading.RLock()
+        self.__pending: Optional[Dict[str, Optional[str]]] = None
+        self.__pending_deploys: Dict[Tuple[str, str, int], str] = {}
+        """deploys recorded inside batch(), written in the same transaction as the pending jobs"""
+    @property
+    def __conn(self) -> sqlite3.Connection:
+        """connection to the database - opened and set up on first use"""
+        with self.__lock:
+            if self.__db is None:
+                conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("CREATE TABLE IF NOT EXISTS jobs (name TEXT PRIMARY KEY, id TEXT NOT NULL)")
+                conn.execute("CREATE TABLE IF NOT EXISTS deploys (source TEXT NOT NULL, name TEXT NOT NULL, private INTEGER NOT NULL, id TEXT NOT NULL, PRIMARY KEY (source, name, private))")
+                self.__db = conn
+            return self.__db
+    def __getitem__(self, name: str) -> str:
+        with self.__lock:
+            if self.__pending is not None and name in self.__pending:
+                job_id = self.__pending[name]
+            else:
+                row = self.__conn.execute("SELECT id FROM jobs WHERE name = ?", (name,)).fetchone()
+                job_id = None if row is None else row[0]
+        if job_id is None:
+            raise KeyError(name)
+        return job_id
+    def __setitem__(self, name: str, job_id: str) -> None:
+        self.__write({name: job_id})
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self.__write({name: None})
+    def __iter__(self) -> Iterator[str]:
+        return iter([name for name, _ in self.__items()])
+    def __len__(self) -> int:
+        return len(self.__items())
+    def __repr__(self) -> str:
+        return f"JobRegistry({dict(self.__items())!r})"
+    @contextmanager
+    def batch(self) -> Iterator["JobRegistry"]:
+        """Coalesces writes and recorded deploys made while the block is open, from any thread, into one transaction written when it exits"""
+        with self.__lock:
+            outer = self.__pending is None
+            if outer:
+                self.__pending = {}
+        try:
+            yield self
+        finally:
+            if outer:
+                with self.__lock:
+                    pending, self.__pending = self.__pending, None
+                    deploys, self.__pending_deploys = self.__pending_deploys, {}
+                    self.__write(pending, deploys)
+    def update_missing(self, jobs: Dict[str, str]) -> None:
+        """Adds jobs in one transaction, keeping the id of names already registered
+        Parameters
+        ----------
+        jobs : dict
+            job name and job id pairs
+        """
+        with self.__lock:
+            self.__transaction(("INSERT OR IGNORE INTO jobs (name, id) VALUES (?, ?)", list(jobs.items())))
+    def deployed(self, source: str, name: str, priv: bool) -> Optional[str]:
+        """
+        Parameters
+        ----------
+        source : str
+            source_hash of job's source
+        name : str
+            name of main function - entry point into job
+        priv : bool
+            specified if job is private / public
+
+        Returns : str
+        -------
+        id of the job deployed from the same source, name and privacy - None if there is none
+        """
+        with self.__lock:
+            if (source, name, int(priv)) in self.__pending_deploys:
+                return self.__pending_deploys[(source, name, int(priv))]
+            row = self.__conn.execute("SELECT id FROM deploys WHERE source = ? AND name = ? AND private = ?", (source, name, int(priv))).fetchone()
+        return None if row is None else row[0]
+    def record_deploy(self, source: str, name: str, priv: bool, job_id: str) -> None:
+        """Registers a deployed job under its name and remembers it was deployed from source, in one transaction
+        Parameters
+        ----------
+        source : str
+            source_hash of job's source
+        name : str
+            name of main function - entry point into job
+        priv : bool
+            specified if job is private / public
+        job_id : str
+            id of deployed job
+        """
+        self.__write({name: job_id}, {(source, name, int(priv)): job_id})
+    def close(self) -> None:
+        """Closes the database if it was opened"""
+        with self.__lock:
+            if self.__db is not None:
+                self.__db.close()
+                self.__db = None
+    def __items(self) -> list:
+        with self.__lock:
+            items = dict(self.__conn.execute("SELECT name, id FROM jobs ORDER BY name").fetchall())
+            if self.__pending is not None:
+                items.update(self.__pending)
+        return sorted((name, job_id) for name, job_id in items.items() if job_id is not None)
+    def __write(self, jobs: Dict[str, Optional[str]], deploys: Optional[Dict[Tuple[str, str, int], str]]=None) -> None:
+        deploys = deploys or {}
+        with self.__lock:
+            if self.__pending is not None:
+                self.__pending.update(jobs)
+                self.__pending_deploys.update(deploys)
+                return
+            self.__transaction(
+                ("INSERT OR REPLACE INTO deploys (source, name, private, id) VALUES (?, ?, ?, ?)", [(*k, v) for k, v in deploys.items()]),
+                ("INSERT OR REPLACE INTO jobs (name, id) VALUES (?, ?)", [(k, v) for k, v in jobs.items() if v is not None]),
+                ("DELETE FROM jobs WHERE name = ?", [(k,) for k, v in jobs.items() if v is None]),
+            )
+    def __transaction(self, *statements: tuple) -> None:
+        """Runs statements, each with its rows, in one transaction"""
+        statements = tuple((statement, rows) for statement, rows in statements if rows)
+        if not statements:
+            return
+        self.__conn.execute("BEGIN IMMEDIATE")
+        try:
+            for statement, rows in statements:
+                self.__conn.executemany(statement, rows)
+        except BaseException:
+            self.__conn.execute("ROLLBACK")
+            raise
+        self.__conn.execute("COMMIT")
+
+def source_hash(task: str) -> str:
+    """
+    Parameters
+    ----------
+    task : str
+        source of job
+
+    Returns : str
+    -------
+    hex sha256 of source
+    """
+    return hashlib.sha256(task.encode("utf-8")).hexdigest()
+def write_config(path: str, content: dict) -> None:
+    """Writes a config file atomically so readers never see it half written
+    Parameters
+    ----------
+    path : str
+        config file
+    content : dict
+        config
+    """
+    temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp, "w") as f:
+        f.write(codec.dumps_pretty(content))
+    os.replace(temp, path)
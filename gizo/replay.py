@@ -0,0 +1,180 @@
+"""Recording and replaying of rpc traffic"""
+import base64
+import collections
+import gzip
+import threading
+import time
+from typing import Any, Deque, Dict, IO, Optional, Tuple
+from hprose import HproseException
+import gizo.codec as codec
+from gizo.metrics import Metrics, METRICS
+
+_TAGS = ("$b", "$m")
+"""Keys marking values _plain converted"""
+
+def _open(path: str, mode: str) -> IO[str]:
+    """Opens a recording, gzip compressed if path ends with .gz"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+def _plain(value: Any) -> Any:
+    """Converts rpc arguments and results into values json can hold
+    Bytes become {"$b": base64} and dicts with keys json can't hold become {"$m": [[key, value], ...]},
+    so _restore can give back the types that were recorded
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        if all(isinstance(k, str) for k in value) and not (len(value) == 1 and next(iter(value)) in _TAGS):
+            return {k: _plain(v) for k, v in value.items()}
+        return {"$m": [[_plain(k), _plain(v)] for k, v in value.items()]}
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"$b": base64.b64encode(bytes(value)).decode("utf-8")}
+    if hasattr(value, "__dict__"):
+        return _plain(vars(value))
+    if hasattr(value, "__slots__"):
+        return {k: _plain(getattr(value, k, None)) for k in value.__slots__}
+    return repr(value)
+def _restore(value: Any) -> Any:
+    """Reverses _plain for recorded results"""
+    if isinstance(value, list):
+        return [_restore(v) for v in value]
+    if isinstance(value, dict):
+        if len(value) == 1:
+            if "$b" in value:
+                return base64.b64decode(value["$b"])
+            if "$m" in value:
+                return {_hashable(_restore(k)): _restore(v) for k, v in value["$m"]}
+        return {k: _restore(v) for k, v in value.items()}
+    return value
+def _hashable(value: Any) -> Any:
+    return tuple(_hashable(v) for v in value) if isinstance(value, list) else value
+
+class Recorder:
+    """Writes every rpc call made through a transport to a file, one json line per call
+    Lines hold the method, arguments, result or error and duration
+    Parameters
+    ----------
+    path : str
+        file to write - gzip compressed if it ends with .gz
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.calls: int = 0
+        """number of calls written"""
+        self.__file = _open(path, "w")
+        self.__lock = threading.Lock()
+    def __enter__(self) -> "Recorder":
+        return self
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+    def write(self, method: str, args: Any, result: Any, error: Optional[BaseException], seconds: float) -> None:
+        """Writes one call
+        Parameters
+        ----------
+        method : str
+            name of rpc method
+        args : list
+            arguments passed to rpc method
+        result : any
+            result of call
+        error : Exception
+            exception raised by the call - None if it succeeded
+        seconds : float
+            duration of call
+        """
+        call = {"m": method, "a": _plain(args), "s": round(seconds, 6)}
+        if error is not None:
+            call["e"] = str(error)
+        else:
+            call["r"] = _plain(result)
+        line = codec.dumps(call) + "\n"
+        with self.__lock:
+            self.__file.write(line)
+            self.calls += 1
+    def close(self) -> None:
+        """Flushes and closes the file"""
+        with self.__lock:
+            self.__file.close()
+
+class ReplayClient:
+    """Serves rpc calls from a recording without any network
+    A call is answered with the next recorded response to the same method and arguments, or failing
+    that the next recorded response to the same method. Recorded errors are raised again
+    Parameters
+    ----------
+    path : str
+        recording written by Recorder
+    speed : float
+        replay durations divided by speed, e.g 1 for original speed, 10 for ten times faster - None
+        to answer immediately
+    metrics : Metrics
+        metrics calls are recorded to - defaults to metrics.METRICS
+    """
+    def __init__(self, path: str, speed: Optional[float]=1.0, metrics: Optional[Metrics]=None) -> None:
+        self.path = path
+        self.speed = speed
+        self.timeout = 30
+        self.metrics: Metrics = metrics if metrics is not None else METRICS
+        self.dispatcher: str = "replay"
+        self.__exact: Dict[Tuple[str, str], Deque[dict]] = collections.defaultdict(collections.deque)
+        self.__methods: Dict[str, Deque[dict]] = collections.defaultdict(collections.deque)
+        self.__lock = threading.Lock()
+        with _open(path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                call = codec.loads(line)
+                call["used"] = False
+                self.__exact[(call["m"], codec.dumps(call["a"]))].append(call)
+                self.__methods[call["m"]].append(call)
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *args: self.invoke(name, list(args))
+    def invoke(self, name: str, args: Any=()) -> Any:
+        """Answers a call from the recording
+        Parameters
+        ----------
+        name : str
+            name of rpc method
+        args : list
+            arguments passed to rpc method
+
+        Returns
+        -------
+        recorded result
+
+        Raises
+        ------
+        HproseException
+            if the recorded call raised, or no call to the method is left in the recording
+        """
+        start = time.perf_counter()
+        call = self.__next(name, codec.dumps(_plain(list(args))))
+        error = None
+        try:
+            if call is None:
+                raise HproseException(f"no recorded call to {name} left")
+            if self.speed:
+                time.sleep(call["s"] / self.speed)
+            if "e" in call:
+                raise HproseException(call["e"])
+            return _restore(call["r"])
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.metrics.record(name, self.dispatcher, time.perf_counter() - start, error)
+    def __next(self, name: str, args: str) -> Optional[dict]:
+        """Takes the next unused recorded call matching the arguments, then the method"""
+        with self.__lock:
+            for queue in (self.__exact.get((name, args)), self.__methods.get(name)):
+                while queue:
+                    call = queue.popleft()
+                    if not call["used"]:
+                        call["used"] = True
+                        return call
+        return None
@@ -0,0 +1,473 @@
+"""Local stand-in for a dispatcher and centrum, for tests and benchmarks without a network"""
+import argparse
+import base64
+import datetime
+import hashlib
+import heapq
+import random
+import threading
+import time
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Dict, List, Optional
+from wsgiref.simple_server import make_server, WSGIRequestHandler, WSGIServer
+import hprose
+import gizo.codec as codec
+import gizo.status as status
+from gizo.job import Requests
+
+_SECOND: int = 10 ** 9
+"""Nanoseconds per unit of backoff the dispatcher's NewExec takes - kept apart from gizo.builder so tests comparing the two check its units"""
+_MINUTE: int = 60 * 10 ** 9
+"""Nanoseconds per unit of ttl the dispatcher's NewExec takes"""
+
+class _Requests:
+    """Requests as decoded from the arguments of Batch, Chain and Chord"""
+    def __init__(self) -> None:
+        self.id: str = ""
+        self.execs: List[dict] = []
+
+hprose.HproseClassManager.register(_Requests, hprose.HproseClassManager.getClassAlias(Requests))
+
+class _Server(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args: Any) -> None:
+        pass
+
+class _Exec:
+    """Exec submitted to the stand-in and when a worker runs it"""
+    __slots__ = ("job_id", "data", "start", "finish", "cancelled")
+    def __init__(self, job_id: str, data: dict, start: float, finish: float) -> None:
+        self.job_id = job_id
+        self.data = data
+        self.start = start
+        self.finish = finish
+        self.cancelled = False
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("utf-8")
+def _time_string(ns: int) -> str:
+    return datetime.datetime.fromtimestamp(ns / 1e9, datetime.timezone.utc).isoformat()
+
+class StandIn:
+    """Dispatcher and centrum served over http from a background thread
+    Speaks hprose like a dispatcher, serves /status and centrum's /v1/dispatchers, and implements the
+    rpc methods Gizo calls. Execs are run by simulated workers - each takes exec_seconds of a worker,
+    execs wait in the queue while every worker is busy. Stand-ins given a chain share its blocks and
+    jobs, like dispatchers of one network, while each runs and answers for its own execs. Latency,
+    error_rate and available can be changed while serving
+    Parameters
+    ----------
+    host : str
+        address to listen on
+    port : int
+        port to listen on - 0 picks a free one
+    latency : float
+        seconds added to every request
+    jitter : float
+        most extra seconds added at random to every request
+    error_rate : float
+        fraction of rpc calls that raise
+    chain_size : int
+        number of blocks in the chain when starting
+    workers : int
+        number of simulated workers
+    exec_seconds : float
+        seconds a worker takes to run an exec
+    score : float
+        benchmark score reported
+    result : callable
+        takes job name and exec args and returns the exec's result - defaults to returning the args
+    dispatchers : list
+        urls centrum lists - defaults to this stand-in's url
+    seed : int
+        seed of keys, latency jitter and errors
+    chain : StandIn
+        stand-in whose blocks and jobs are shared - chain_size is then ignored
+    """
+    def __init__(self, host: str="127.0.0.1", port: int=0, latency: float=0.0, jitter: float=0.0, error_rate: float=0.0, chain_size: int=16, workers: int=8, exec_seconds: float=0.0, score: float=1.0, result: Optional[Callable[[str, list], Any]]=None, dispatchers: Optional[List[str]]=None, seed: Optional[int]=None, chain: Optional["StandIn"]=None) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.workers = workers
+        self.exec_seconds = exec_seconds
+        self.score = score
+        self.result: Callable[[str, list], Any] = result if result is not None else (lambda name, args: args)
+        self.available: bool = True
+        """when False every request is answered with 503, as if the dispatcher went down"""
+        self.__random = random.Random(seed)
+        self.priv: str = "%064x" % self.__random.getrandbits(256)
+        self.pub: str = "%0128x" % self.__random.getrandbits(512)
+        self.__execs: Dict[str, _Exec] = {}
+        self.__active: List[_Exec] = []
+        self.__free: List[float] = [0.0] * workers
+        self.__count = 0
+        if chain is not None:
+            self.__lock: threading.Lock = chain.__lock
+            self.__blocks: List[dict] = chain.__blocks
+            self.__block_json: List[str] = chain.__block_json
+            self.__heights: Dict[str, int] = chain.__heights
+            self.__jobs: Dict[str, dict] = chain.__jobs
+        else:
+            self.__lock = threading.Lock()
+            self.__blocks = []
+            self.__block_json = []
+            self.__heights = {}
+            self.__jobs = {}
+            for _ in range(chain_size):
+                self.__add_block([])
+        self.__service = hprose.HttpService()
+        for name in dir(self):
+            if name[:1].isupper():
+                self.__service.addFunction(self.__rpc(getattr(self, name)), name)
+        self.__server = make_server(host, port, self.__app, server_class=_Server, handler_class=_QuietHandler)
+        self.host: str = host
+        self.port: int = self.__server.server_port
+        self.dispatchers: List[str] = dispatchers if dispatchers is not None else [self.url]
+        self.__thread: Optional[threading.Thread] = None
+    @property
+    def url(self) -> str:
+        """gizo url of the stand-in"""
+        return f"gizo://{self.pub}@{self.host}:{self.port}"
+    @property
+    def centrum(self) -> str:
+        """url to pass as centrum to Gizo"""
+        return f"http://{self.host}:{self.port}"
+    def start(self) -> "StandIn":
+        """Starts serving from a background thread"""
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__server.serve_forever, name="gizo-standin", daemon=True)
+            self.__thread.start()
+        return self
+    def stop(self) -> None:
+        """Stops serving"""
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.__server.server_close()
+    def __enter__(self) -> "StandIn":
+        return self.start()
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+    def __delay(self) -> None:
+        delay = self.latency
+        if self.jitter:
+            with self.__lock:
+                delay += self.__random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+    def __app(self, environ: dict, start_response: Callable) -> List[bytes]:
+        """Answers /status and /v1/dispatchers, hands everything else to the hprose service"""
+        self.__delay()
+        if not self.available:
+            start_response("503 Service Unavailable", [("Content-Type", "text/plain")])
+            return [b"unavailable"]
+        path = environ.get("PATH_INFO", "")
+        if path == "/status":
+            start_response("200 OK", [("Content-Type", "text/plain")])
+            return [b"OK"]
+        if path == "/v1/dispatchers":
+            start_response("200 OK", [("Content-Type", "application/json")])
+            return [codec.dumps(self.dispatchers).encode("utf-8")]
+        return self.__service(environ, start_response)
+    def __rpc(self, method: Callable) -> Callable:
+        """Wraps a method to raise at error_rate"""
+        def call(*args: Any) -> Any:
+            if self.error_rate:
+                with self.__lock:
+                    fail = self.__random.random() < self.error_rate
+                if fail:
+                    raise Exception("stand-in error")
+            return method(*args)
+        return call
+
+    def __add_block(self, jobs: List[dict]) -> None:
+        height = len(self.__blocks)
+        prev = base64.b64decode(self.__blocks[-1]["Header"]["Hash"]) if self.__blocks else bytes(32)
+        merkle = hashlib.sha256(codec.dumps(jobs).encode("utf-8")).digest()
+        digest = hashlib.sha256(prev + merkle + height.to_bytes(8, "big")).digest()
+        block = {
+            "Header": {"Timestamp": time.time_ns(), "PrevBlockHash": _b64(prev), "MerkleRoot": _b64(merkle), "Nonce": height, "Difficulty": 1, "Hash": _b64(digest)},
+            "Jobs": jobs,
+            "Height": height,
+            "ReceivedAt": time.time_ns(),
+            "By": self.pub,
+        }
+        self.__blocks.append(block)
+        self.__block_json.append(codec.dumps(block))
+        self.__heights[digest.hex()] = height
+    def __job(self, job_id: str) -> dict:
+        job = self.__jobs.get(job_id)
+        if job is None:
+            raise Exception("job not found")
+        return job
+    def __exec(self, exec_hash: Any) -> _Exec:
+        e = self.__execs.get(_b64(bytes(exec_hash)))
+        if e is None:
+            raise Exception("exec not found")
+        self.__refresh(e, time.time())
+        return e
+    def __refresh(self, e: _Exec, now: float) -> None:
+        """Brings an exec's status up to now"""
+        if e.data["Status"] in status.TERMINAL:
+            return
+        if e.cancelled:
+            e.data["Status"] = status.CANCELLED
+        elif now < e.start:
+            e.data["Status"] = status.QUEUED
+        elif now < e.finish:
+            e.data["Status"] = status.RUNNING
+            e.data["By"] = self.pub
+        else:
+            e.data["Status"] = status.FINISHED
+            e.data["By"] = self.pub
+            e.data["Duration"] = int((e.finish - e.start) * 1e9)
+            e.data["Result"] = self.result(self.__jobs[e.job_id]["Name"], e.data["Args"])
+    def __counts(self) -> tuple:
+        """Returns the number of running and queued execs, dropping finished ones from the active list"""
+        now = time.time()
+        with self.__lock:
+            for e in self.__active:
+                self.__refresh(e, now)
+            self.__active = [e for e in self.__active if e.data["Status"] not in status.TERMINAL]
+            running = sum(1 for e in self.__active if e.data["Status"] == status.RUNNING)
+            return running, len(self.__active) - running
+    def __submit(self, jr: Any, after: float=0.0) -> tuple:
+        """Schedules the execs of one Requests one after the other starting no earlier than after
+        Returns the reply describing them and when the last one finishes
+        """
+        if isinstance(jr, (str, bytes)):
+            jr = codec.loads(jr)
+        job_id, execs = (jr["ID"], jr["Execs"]) if isinstance(jr, dict) else (jr.id, jr.execs)
+        now = time.time()
+        submitted = []
+        with self.__lock:
+            job = self.__job(job_id)
+            for data in execs:
+                data = dict(data)
+                self.__count += 1
+                digest = hashlib.sha256(f"{self.pub}:{job_id}:{self.__count}".encode("utf-8")).digest()
+                free = heapq.heappop(self.__free)
+                start = max(now, free, after, data.get("ExecutionTime") or 0)
+                finish = start + self.exec_seconds
+                heapq.heappush(self.__free, finish)
+                data.update({"Hash": _b64(digest), "Timestamp": int(now * 1e9), "Status": status.QUEUED})
+                e = _Exec(job_id, data, start, finish)
+                self.__execs[data["Hash"]] = e
+                self.__active.append(e)
+                job["Execs"].append(data)
+                submitted.append(dict(data))
+                after = finish
+        return {"ID": job_id, "Execs": submitted}, after
+
+    def Version(self) -> str:
+        with self.__lock:
+            return codec.dumps({"Version": 1, "Height": len(self.__blocks) - 1, "Blocks": list(self.__heights)})
+    def PeerCount(self) -> int:
+        return 0
+    def Score(self) -> float:
+        return self.score
+    def Peers(self) -> list:
+        return []
+    def PublicKey(self) -> str:
+        return self.pub
+    def KeyPair(self) -> str:
+        return codec.dumps({"priv": self.priv, "pub": self.pub})
+    def BlockByHash(self, hash: str) -> str:
+        with self.__lock:
+            height = self.__heights.get(hash)
+            if height is None:
+                raise Exception("block not found")
+            return self.__block_json[height]
+    def BlockByHeight(self, height: int) -> str:
+        with self.__lock:
+            if not 0 <= height < len(self.__blocks):
+                raise Exception("block not found")
+            return self.__block_json[height]
+    def Latest15Blocks(self) -> str:
+        with self.__lock:
+            return "[" + ",".join(reversed(self.__block_json[-15:])) + "]"
+    def LatestBlock(self) -> str:
+        with self.__lock:
+            return self.__block_json[-1]
+    def LatestBlockHeight(self) -> int:
+        with self.__lock:
+            return len(self.__blocks) - 1
+    def BlockHashesHex(self) -> list:
+        with self.__lock:
+            return list(self.__heights)
+    def PendingCount(self) -> int:
+        return sum(self.__counts())
+    def WorkersCount(self) -> int:
+        return self.workers
+    def WorkersCountBusy(self) -> int:
+        return min(self.__counts()[0], self.workers)
+    def WorkersCountNotBusy(self) -> int:
+        return self.workers - self.WorkersCountBusy()
+    def JobQueueCount(self) -> int:
+        return self.__counts()[1]
+    def NewJob(self, task: str, name: str, priv: bool, priv_key: str) -> str:
+        with self.__lock:
+            self.__count += 1
+            digest = hashlib.sha256(f"{self.pub}:{name}:{task}:{self.__count}".encode("utf-8")).digest()
+            job = {"ID": digest.hex(), "Hash": _b64(digest), "Execs": [], "Name": name, "Task": task, "Signature": _b64(hashlib.sha256(priv_key.encode("utf-8")).digest()), "SubmissionTime": time.time_ns(), "Private": priv}
+            self.__jobs[job["ID"]] = job
+            self.__add_block([dict(job)])
+        return job["ID"]
+    def NewExec(self, args: list, retries: int, priority: int, backoff: int, exec_time: int, interval: int, ttl: int, pub: str, envs: str) -> str:
+        return codec.dumps({
+            "Hash": None,
+            "Timestamp": 0,
+            "Duration": 0,
+            "Args": args,
+            "Err": None,
+            "Priority": priority,
+            "Result": None,
+            "Status": status.STARTED,
+            "Retries": retries,
+            "RetriesCount": 0,
+            "Backoff": backoff * _SECOND,
+            "ExecutionTime": exec_time,
+            "Interval": interval,
+            "By": "",
+            "TTL": ttl * _MINUTE,
+            "Pub": pub,
+            "Envs": _b64(envs.encode("utf-8")),
+        })
+    def Solo(self, jr: str) -> str:
+        return codec.dumps(self.__submit(jr)[0])
+    def Batch(self, jrs: list) -> str:
+        return codec.dumps([self.__submit(jr)[0] for jr in jrs])
+    def Chain(self, jrs: list) -> str:
+        replies, after = [], 0.0
+        for jr in jrs:
+            reply, after = self.__submit(jr, after)
+            replies.append(reply)
+        return codec.dumps(replies)
+    def Chord(self, jrs: list, callback_jr: Any) -> str:
+        replies, after = [], 0.0
+        for jr in jrs:
+            reply, after = self.__submit(jr, after)
+            replies.append(reply)
+        replies.append(self.__submit(callback_jr, after)[0])
+        return codec.dumps(replies)
+    def CancelExec(self, exec_hash: list) -> None:
+        with self.__lock:
+            e = self.__exec(exec_hash)
+            if e.data["Status"] in status.TERMINAL:
+                raise Exception("exec isn't running")
+            e.cancelled = True
+            self.__refresh(e, time.time())
+    def ExecStatus(self, job_id: str, exec_hash: list) -> str:
+        with self.__lock:
+            return self.__exec(exec_hash).data["Status"]
+    def ExecTimestamp(self, job_id: str, exec_hash: list) -> int:
+        with self.__lock:
+            return self.__exec(exec_hash).data["Timestamp"]
+    def ExecTimestampString(self, job_id: str, exec_hash: list) -> str:
+        return _time_string(self.ExecTimestamp(job_id, exec_hash))
+    def ExecDurationNanoseconds(self, job_id: str, exec_hash: list) -> int:
+        with self.__lock:
+            return self.__exec(exec_hash).data["Duration"]
+    def ExecDurationSeconds(self, job_id: str, exec_hash: list) -> float:
+        return self.ExecDurationNanoseconds(job_id, exec_hash) / 1e9
+    def ExecDurationMinutes(self, job_id: str, exec_hash: list) -> float:
+        return self.ExecDurationSeconds(job_id, exec_hash) / 60
+    def ExecDurationString(self, job_id: str, exec_hash: list) -> str:
+        return f"{self.ExecDurationSeconds(job_id, exec_hash)}s"
+    def ExecArgs(self, job_id: str, exec_hash: list) -> list:
+        with self.__lock:
+            return self.__exec(exec_hash).data["Args"]
+    def ExecErr(self, job_id: str, exec_hash: list) -> Any:
+        with self.__lock:
+            return self.__exec(exec_hash).data["Err"]
+    def ExecPriority(self, job_id: str, exec_hash: list) -> int:
+        with self.__lock:
+            return self.__exec(exec_hash).data["Priority"]
+    def ExecResult(self, job_id: str, exec_hash: list) -> Any:
+        with self.__lock:
+            return self.__exec(exec_hash).data["Result"]
+    def ExecRetries(self, job_id: str, exec_hash: list) -> int:
+        with self.__lock:
+            return self.__exec(exec_hash).data["RetriesCount"]
+    def ExecBackoff(self, job_id: str, exec_hash: list) -> float:
+        with self.__lock:
+            return self.__exec(exec_hash).data["Backoff"] / 1e9
+    def ExecExecutionTime(self, job_id: str, exec_hash: list) -> int:
+        with self.__lock:
+            return self.__exec(exec_hash).data["ExecutionTime"]
+    def ExecExecutionTimeString(self, job_id: str, exec_hash: list) -> str:
+        return _time_string(self.ExecExecutionTime(job_id, exec_hash) * 10 ** 9)
+    def ExecInterval(self, job_id: str, exec_hash: list) -> int:
+        with self.__lock:
+            return self.__exec(exec_hash).data["Interval"]
+    def ExecBy(self, job_id: str, exec_hash: list) -> str:
+        with self.__lock:
+            return self.__exec(exec_hash).data["By"]
+    def ExecTtlNanoseconds(self, job_id: str, exec_hash: list) -> int:
+        with self.__lock:
+            return self.__exec(exec_hash).data["TTL"]
+    def ExecTtlSeconds(self, job_id: str, exec_hash: list) -> float:
+        return self.ExecTtlNanoseconds(job_id, exec_hash) / 1e9
+    def ExecTtlMinutes(self, job_id: str, exec_hash: list) -> float:
+        return self.ExecTtlSeconds(job_id, exec_hash) / 60
+    def ExecTtlHours(self, job_id: str, exec_hash: list) -> float:
+        return self.ExecTtlMinutes(job_id, exec_hash) / 60
+    def ExecTtlString(self, job_id: str, exec_hash: list) -> str:
+        return f"{self.ExecTtlSeconds(job_id, exec_hash)}s"
+    def Job(self, job_id: str) -> str:
+        self.__counts()
+        with self.__lock:
+            return codec.dumps(self.__job(job_id))
+    def JobSubmisstionTimeUnix(self, job_id: str) -> int:
+        with self.__lock:
+            return self.__job(job_id)["SubmissionTime"] // 10 ** 9
+    def JobSubmisstionTimeString(self, job_id: str) -> str:
+        with self.__lock:
+            return _time_string(self.__job(job_id)["SubmissionTime"])
+    def IsJobPrivate(self, job_id: str) -> bool:
+        with self.__lock:
+            return self.__job(job_id)["Private"]
+    def JobName(self, job_id: str) -> str:
+        with self.__lock:
+            return self.__job(job_id)["Name"]
+    def JobLatestExec(self, job_id: str) -> str:
+        self.__counts()
+        with self.__lock:
+            execs = self.__job(job_id)["Execs"]
+            if not execs:
+                raise Exception("job has no execs")
+            return codec.dumps(execs[-1])
+    def JobExecs(self, job_id: str) -> str:
+        self.__counts()
+        with self.__lock:
+            return codec.dumps(self.__job(job_id)["Execs"])
+
+def main(argv: Optional[List[str]]=None) -> None:
+    """Serves a stand-in until interrupted"""
+    parser = argparse.ArgumentParser(prog="python -m gizo.standin", description="Serve a local stand-in dispatcher and centrum")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="most extra seconds added at random to every request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of rpc calls that raise")
+    parser.add_argument("--chain-size", type=int, default=16, help="number of blocks in the chain")
+    parser.add_argument("--workers", type=int, default=8, help="number of simulated workers")
+    parser.add_argument("--exec-seconds", type=float, default=0.0, help="seconds a worker takes to run an exec")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    standin = StandIn(args.host, args.port, args.latency, args.jitter, args.error_rate, args.chain_size, args.workers, args.exec_seconds, seed=args.seed)
+    print(f"dispatcher {standin.url}", flush=True)
+    print(f"centrum {standin.centrum}", flush=True)
+    standin.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        standin.stop()
+
+if __name__ == "__main__":
+    main()
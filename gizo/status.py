@@ -15,3 +15,6 @@ DISPATHCHED = "DISPATCHED"
 """job dispatched to worker"""
 STARTED     = "STARTED"
 """job received by dispatcher (prior to dispatch)"""
+
+TERMINAL = (FINISHED, TIMEOUT, CANCELLED)
+"""statuses an exec doesn't leave"""
@@ -0,0 +1,249 @@
+"""Memory-mapped on-disk block store"""
+import mmap
+import os
+import struct
+import threading
+from typing import NamedTuple, Optional, Tuple
+from gizo.utils import b64_to_hex
+import gizo.codec as codec
+try:
+    import fcntl
+except ImportError: # pragma: no cover - windows
+    fcntl = None
+
+HASH_SIZE: int = 32
+"""Width of a block hash in the hash index (bytes)"""
+_HEIGHT = struct.Struct("<QI")
+"""Height index record - offset and length of the block in the data file"""
+_HEADER = struct.Struct("<QQ")
+"""Hash index header - capacity and number of used slots"""
+_SLOT = struct.Struct(f"<{HASH_SIZE}sQI")
+"""Hash index slot - block hash, offset and length of the block in the data file (length 0 marks an empty slot)"""
+
+class _View(NamedTuple):
+    """Memory map of a file as it was when mapped"""
+    map: Optional[mmap.mmap]
+    inode: int
+    size: int
+
+_EMPTY = _View(None, -1, 0)
+
+class _Mapped:
+    """Read only memory map of a file that is remapped once the file grows or is replaced
+    Readers take view once and use it for the whole lookup. A refresh maps the file anew and swaps
+    the view in, the old map is left to readers still holding it and unmapped once collected
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.view: _View = _EMPTY
+        self.__lock = threading.Lock()
+    def refresh(self) -> _View:
+        with self.__lock:
+            view = self.view
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return view
+            if stat.st_ino == view.inode and stat.st_size == view.size:
+                return view
+            if stat.st_size == 0:
+                view = _EMPTY
+            else:
+                with open(self.path, "rb") as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    view = _View(mapped, os.fstat(f.fileno()).st_ino, len(mapped))
+            self.view = view
+            return view
+    def close(self) -> None:
+        with self.__lock:
+            view, self.view = self.view, _EMPTY
+        if view.map is not None:
+            view.map.close()
+
+class BlockStore:
+    """Append-only block store shared across processes
+    Blocks are appended to a data file and located through two fixed-width indexes - one addressed
+    by height, one an open addressing hash table keyed by block hash. Readers memory map the files,
+    so processes share one page cache copy and a lookup is one index probe and one slice
+    Parameters
+    ----------
+    directory : str
+        directory holding the store's files - created if missing
+    """
+    def __init__(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.__data = _Mapped(os.path.join(directory, "blocks.dat"))
+        self.__heights = _Mapped(os.path.join(directory, "heights.idx"))
+        self.__hashes = _Mapped(os.path.join(directory, "hashes.idx"))
+        self.__lock = threading.Lock()
+        self.__refresh()
+    def __len__(self) -> int:
+        """number of height index records - the highest stored height + 1"""
+        return self.__heights.refresh().size // _HEIGHT.size
+    def raw_by_height(self, height: int) -> Optional[bytes]:
+        """
+        Parameters
+        ----------
+        height : int
+            height of block
+
+        Returns : bytes
+        -------
+        json of block - None if not stored
+        """
+        location = self.__locate(height)
+        if location is None:
+            self.__refresh()
+            location = self.__locate(height)
+        return self.__slice(location)
+    def raw_by_hash(self, hash: str) -> Optional[bytes]:
+        """
+        Parameters
+        ----------
+        hash : str
+            hex hash of block
+
+        Returns : bytes
+        -------
+        json of block - None if not stored
+        """
+        key = bytes.fromhex(hash).ljust(HASH_SIZE, b"\0")
+        location = self.__probe(key)[1]
+        if location is None:
+            self.__refresh()
+            location = self.__probe(key)[1]
+        return self.__slice(location)
+    def get_by_height(self, height: int) -> Optional[dict]:
+        """
+        Parameters
+        ----------
+        height : int
+            height of block
+
+        Returns : dict
+        -------
+        block - None if not stored
+        """
+        raw = self.raw_by_height(height)
+        return None if raw is None else codec.loads(raw)
+    def get_by_hash(self, hash: str) -> Optional[dict]:
+        """
+        Parameters
+        ----------
+        hash : str
+            hex hash of block
+
+        Returns : dict
+        -------
+        block - None if not stored
+        """
+        raw = self.raw_by_hash(hash)
+        return None if raw is None else codec.loads(raw)
+    def put(self, block: dict, raw: Optional[bytes]=None) -> None:
+        """Appends a block, replacing any block stored at the same height
+        Parameters
+        ----------
+        block : dict
+            block as returned by the dispatcher
+        raw : bytes
+            json of block as returned by the dispatcher - re-encoded from block if not given
+        """
+        if raw is None:
+            raw = codec.dumps(block).encode("utf-8")
+        elif isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        key = bytes.fromhex(b64_to_hex(block["Header"]["Hash"])).ljust(HASH_SIZE, b"\0")
+        height = block["Height"]
+        with self.__lock, open(os.path.join(self.directory, "lock"), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            with open(self.__data.path, "ab") as f:
+                offset = f.tell()
+                f.write(raw)
+            with open(self.__heights.path, "r+b" if os.path.exists(self.__heights.path) else "w+b") as f:
+                f.seek(height * _HEIGHT.size)
+                f.write(_HEIGHT.pack(offset, len(raw)))
+            self.__insert(key, offset, len(raw))
+        self.__refresh()
+    def close(self) -> None:
+        """Unmaps the store's files - not to be called while other threads read the store"""
+        self.__data.close()
+        self.__heights.close()
+        self.__hashes.close()
+    def __refresh(self) -> None:
+        self.__data.refresh()
+        self.__heights.refresh()
+        self.__hashes.refresh()
+    def __locate(self, height: int) -> Optional[Tuple[int, int]]:
+        """offset and length of a block in the data file from the height index"""
+        view = self.__heights.view
+        start = height * _HEIGHT.size
+        if height < 0 or view.map is None or start + _HEIGHT.size > view.size:
+            return None
+        offset, length = _HEIGHT.unpack_from(view.map, start)
+        return None if length == 0 else (offset, length)
+    def __slice(self, location: Optional[Tuple[int, int]]) -> Optional[bytes]:
+        if location is None:
+            return None
+        offset, length = location
+        view = self.__data.view
+        if offset + length > view.size:
+            view = self.__data.refresh()
+        if view.map is None or offset + length > view.size:
+            return None
+        return view.map[offset:offset + length]
+    def __probe(self, key: bytes, table: Optional[mmap.mmap]=None) -> Tuple[int, Optional[Tuple[int, int]]]:
+        """Finds the slot of a hash by linear probing
+        Returns : tuple
+        -------
+        index of the slot holding key or of the first empty slot, and the stored offset and length (None if absent)
+        """
+        table = table if table is not None else self.__hashes.view.map
+        if table is None:
+            return -1, None
+        capacity = _HEADER.unpack_from(table, 0)[0]
+        slot = int.from_bytes(key[:8], "little") % capacity
+        for _ in range(capacity):
+            stored, offset, length = _SLOT.unpack_from(table, _HEADER.size + slot * _SLOT.size)
+            if length == 0:
+                return slot, None
+            if stored == key:
+                return slot, (offset, length)
+            slot = (slot + 1) % capacity
+        return -1, None
+    def __insert(self, key: bytes, offset: int, length: int) -> None:
+        """Adds a hash to the hash index, doubling the table once it is half full"""
+        path = self.__hashes.path
+        if not os.path.exists(path):
+            self.__rebuild(path, 1024, [])
+        with open(path, "r+b") as f:
+            table = mmap.mmap(f.fileno(), 0)
+            try:
+                capacity, count = _HEADER.unpack_from(table, 0)
+                slot, stored = self.__probe(key, table)
+                _SLOT.pack_into(table, _HEADER.size + slot * _SLOT.size, key, offset, length)
+                if stored is None:
+                    count += 1
+                    _HEADER.pack_into(table, 0, capacity, count)
+                entries = None
+                if count * 2 > capacity:
+                    entries = [_SLOT.unpack_from(table, _HEADER.size + i * _SLOT.size) for i in range(capacity)]
+            finally:
+                table.close()
+        if entries is not None:
+            self.__rebuild(path, capacity * 2, [e for e in entries if e[2] != 0])
+    def __rebuild(self, path: str, capacity: int, entries: list) -> None:
+        """Writes a new hash table and swaps it in atomically so readers keep a consistent view"""
+        temp = f"{path}.tmp"
+        with open(temp, "w+b") as f:
+            f.truncate(_HEADER.size + capacity * _SLOT.size)
+            table = mmap.mmap(f.fileno(), 0)
+            try:
+                _HEADER.pack_into(table, 0, capacity, len(entries))
+                for key, offset, length in entries:
+                    slot = self.__probe(key, table)[0]
+                    _SLOT.pack_into(table, _HEADER.size + slot * _SLOT.size, key, offset, length)
+            finally:
+                table.close()
+        os.replace(temp, path)
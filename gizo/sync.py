@@ -0,0 +1,126 @@
+"""Resumable chain sync"""
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Dict, Iterator, Any
+from gizo.utils import b64_to_hex
+
+class ChainSync:
+    """Mirrors the chain in height order, fetching ahead concurrently and resuming from a checkpoint
+    Parameters
+    ----------
+    gizo : Gizo
+        connected client to read blocks with
+    checkpoint : str
+        file the last synced height and recent block hashes are kept in
+    concurrency : int
+        maximum number of blocks fetched at once
+    window : int
+        number of recent block hashes kept in the checkpoint to detect reorgs with
+    checkpoint_every : int
+        number of blocks between checkpoint writes - the checkpoint is also written when sync stops
+    on_reorg : callable
+        called with the height of the last block still on the chain when the chain reorganized
+        past the checkpoint - blocks above it should be discarded (-1 if none are left)
+    """
+    def __init__(self, gizo: Any, checkpoint: str, concurrency: int=8, window: int=64, checkpoint_every: int=100, on_reorg: Optional[Callable[[int], None]]=None) -> None:
+        self.gizo = gizo
+        self.checkpoint = checkpoint
+        self.concurrency = concurrency
+        self.window = window
+        self.checkpoint_every = checkpoint_every
+        self.on_reorg = on_reorg
+        self.height: int = -1
+        """height of the last synced block"""
+        self.reorgs: int = 0
+        """number of reorgs detected"""
+        self.__hashes: Dict[int, str] = {}
+        self.__load()
+    def blocks(self, until: Optional[int]=None) -> Iterator[dict]:
+        """Yields blocks after the checkpoint in height order
+        A block counts as synced once the next block is asked for, so a block the loop broke out on
+        is yielded again on resume
+        Parameters
+        ----------
+        until : int
+            last height to sync - defaults to the chain's latest height
+
+        Returns : iterator
+        -------
+        blocks in height order
+        """
+        self.__check_reorg()
+        if until is None:
+            until = self.gizo.LatestBlockHeight()
+        start = self.height + 1
+        if start > until:
+            return
+        heights = iter(range(start, until + 1))
+        pending: deque = deque()
+        synced = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            try:
+                for height in heights:
+                    pending.append(pool.submit(self.gizo.BlockByHeight, height))
+                    if len(pending) >= self.concurrency * 2:
+                        break
+                while pending:
+                    block = pending.popleft().result()
+                    nxt = next(heights, None)
+                    if nxt is not None:
+                        pending.append(pool.submit(self.gizo.BlockByHeight, nxt))
+                    yield block
+                    self.__record(block)
+                    synced += 1
+                    if synced % self.checkpoint_every == 0:
+                        self.save()
+            finally:
+                for future in pending:
+                    future.cancel()
+                self.save()
+    def reset(self) -> None:
+        """Forgets the checkpoint so the next sync starts from the genesis block"""
+        self.height = -1
+        self.__hashes = {}
+        self.save()
+    def save(self) -> None:
+        """Writes the checkpoint atomically
+        Raises
+        ------
+        IOError
+            If the file could not be written.
+        """
+        temp = f"{self.checkpoint}.tmp"
+        with open(temp, "w") as f:
+            f.write(json.dumps({"height": self.height, "hashes": self.__hashes}))
+        os.replace(temp, self.checkpoint)
+    def __load(self) -> None:
+        """Reads the checkpoint if there is one"""
+        if not os.path.isfile(self.checkpoint):
+            return
+        with open(self.checkpoint, "r") as f:
+            content = json.loads(f.read())
+        self.height = content["height"]
+        self.__hashes = {int(h): v for h, v in content["hashes"].items()}
+    def __record(self, block: dict) -> None:
+        """Marks a block as synced"""
+        self.height = block["Height"]
+        self.__hashes[self.height] = b64_to_hex(block["Header"]["Hash"])
+        stale = self.height - self.window
+        if stale in self.__hashes:
+            del self.__hashes[stale]
+    def __check_reorg(self) -> None:
+        """Rolls the checkpoint back to the last recorded block still on the chain"""
+        if not self.__hashes:
+            return
+        chain = set(self.gizo.BlockHashesHex())
+        if self.__hashes.get(self.height) in chain:
+            return
+        self.reorgs += 1
+        kept = [h for h, v in self.__hashes.items() if v in chain]
+        self.height = max(kept) if kept else -1
+        self.__hashes = {h: v for h, v in self.__hashes.items() if h <= self.height}
+        self.save()
+        if self.on_reorg is not None:
+            self.on_reorg(self.height)
@@ -0,0 +1,67 @@
+"""Compiled exec templates"""
+from typing import Iterable, Union
+import gizo.codec as codec
+from gizo.job import EncodedExec, Requests
+from gizo.models import Exec
+
+_ARGS: str = "__gizo_template_args__"
+"""Placeholder encoded in place of args while compiling a template"""
+
+class ExecTemplate:
+    """Exec with every field but args fixed, compiled once into json
+    The exec is encoded once with a placeholder for args, stamping out an exec only encodes its
+    args and joins them between the encoded halves - envs and the shared fields aren't encoded again
+    Parameters
+    ----------
+    job_id : str
+        id of job execs run
+    exec : dict
+        exec as returned by NewExec, its args are ignored
+    """
+    def __init__(self, job_id: str, exec: Union[dict, Exec]) -> None:
+        self.job_id: str = job_id
+        self.exec: dict = dict(exec.data if isinstance(exec, Exec) else exec)
+        self.exec["Args"] = _ARGS
+        encoded = codec.dumps(self.exec)
+        placeholder = codec.dumps(_ARGS)
+        if encoded.count(placeholder) != 1:
+            raise Exception("unable to compile exec template")
+        self.__prefix, self.__suffix = encoded.split(placeholder)
+        del self.exec["Args"]
+    def json(self, args: list) -> str:
+        """
+        Parameters
+        ----------
+        args : list
+            parameters passed into job
+
+        Returns : str
+        -------
+        json of exec with args
+        """
+        return self.__prefix + codec.dumps(args) + self.__suffix
+    def encode(self, args: list) -> EncodedExec:
+        """
+        Parameters
+        ----------
+        args : list
+            parameters passed into job
+
+        Returns : EncodedExec
+        -------
+        exec with args, ready to add to Requests
+        """
+        return EncodedExec(self.json(args))
+    def requests(self, args: Iterable[list]) -> Requests:
+        """
+        Parameters
+        ----------
+        args : list
+            parameters of each exec
+
+        Returns : Requests
+        -------
+        requests of one exec per args
+        """
+        prefix, suffix, dumps = self.__prefix, self.__suffix, codec.dumps
+        return Requests(self.job_id, *[EncodedExec(prefix + dumps(a) + suffix) for a in args])
@@ -0,0 +1,197 @@
+"""Pooled keep-alive http transport for dispatcher connections"""
+import threading
+import time
+import requests
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from hprose import HproseClient, HproseException
+from gizo.dispatcher import Dispatcher
+from gizo.metrics import Metrics, METRICS
+from gizo.replay import Recorder
+
+POOL_SIZE: int = 10
+"""Default number of keep-alive connections kept open per dispatcher"""
+IDLE_TIMEOUT: float = 90.0
+"""Default seconds a pool may sit unused before its connections are dropped"""
+
+class Pool:
+    """Keep-alive http session shared by every client of one dispatcher
+    Once unused for idle_timeout, the session is replaced with a new one and the old one is closed when
+    its last request in flight finishes
+    Parameters
+    ----------
+    pool_size : int
+        number of connections kept open
+    idle_timeout : float
+        seconds the pool may sit unused before its connections are dropped
+    """
+    def __init__(self, pool_size: int=POOL_SIZE, idle_timeout: float=IDLE_TIMEOUT) -> None:
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.__lock = threading.Lock()
+        self.__last_used = time.monotonic()
+        self.__in_flight: Dict[requests.Session, int] = {}
+        """Requests in flight on each session that has any"""
+        self.session = self.__session()
+    def __session(self) -> requests.Session:
+        """
+        Returns : Session
+        -------
+        new session keeping up to pool_size connections open
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+    def __replace(self) -> None:
+        """Swaps in a new session, closing the old one now if it has no requests in flight - call with the lock held"""
+        old = self.session
+        self.session = self.__session()
+        if old not in self.__in_flight:
+            old.close()
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Sends a request over a pooled connection
+        Parameters
+        ----------
+        method : str
+            http method
+        url : str
+            url to request
+        kwargs
+            passed to requests.Session.request
+
+        Returns : Response
+        -------
+        response of request
+        """
+        with self.__lock:
+            now = time.monotonic()
+            if now - self.__last_used > self.idle_timeout:
+                self.__replace()
+            self.__last_used = now
+            session = self.session
+            self.__in_flight[session] = self.__in_flight.get(session, 0) + 1
+        try:
+            return session.request(method, url, **kwargs)
+        finally:
+            with self.__lock:
+                self.__in_flight[session] -= 1
+                if not self.__in_flight[session]:
+                    del self.__in_flight[session]
+                    if session is not self.session:
+                        session.close()
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Sends a GET request over a pooled connection"""
+        return self.request("GET", url, **kwargs)
+    def drop_idle(self) -> bool:
+        """Drops the pool's connections if it sat unused longer than idle_timeout
+        Returns : bool
+        -------
+        True if the connections were dropped - False if the pool was used recently or has requests in flight
+        """
+        with self.__lock:
+            if self.__in_flight or time.monotonic() - self.__last_used <= self.idle_timeout:
+                return False
+            self.__replace()
+            return True
+    def close(self) -> None:
+        """Closes every connection in the pool"""
+        self.session.close()
+
+class HttpTransport(HproseClient):
+    """Hprose client that sends calls over a shared keep-alive pool and records them to metrics
+    Parameters
+    ----------
+    uri : str
+        rpc endpoint of dispatcher
+    pool : Pool
+        pool to send requests through
+    metrics : Metrics
+        metrics calls are recorded to - defaults to metrics.METRICS
+    recorder : Recorder
+        recorder every call is written to - None to not record
+    """
+    def __init__(self, uri: str, pool: Pool, metrics: Optional[Metrics]=None, recorder: Optional[Recorder]=None) -> None:
+        self.pool = pool
+        self.timeout = 30
+        self.metrics: Metrics = metrics if metrics is not None else METRICS
+        self.recorder: Optional[Recorder] = recorder
+        self.dispatcher: str = urlsplit(uri).netloc
+        self.__sizes = threading.local()
+        super(HttpTransport, self).__init__(uri)
+    def invoke(self, name: str, args: Any=(), callback: Any=None, *rest: Any, **kwargs: Any) -> Any:
+        if callback is not None:
+            return super(HttpTransport, self).invoke(name, args, callback, *rest, **kwargs)
+        sizes = self.__sizes
+        sizes.sent = sizes.received = 0
+        result = error = None
+        start = time.perf_counter()
+        try:
+            result = super(HttpTransport, self).invoke(name, args, callback, *rest, **kwargs)
+            return result
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            self.metrics.record(name, self.dispatcher, seconds, error, sizes.sent, sizes.received)
+            if self.recorder is not None:
+                self.recorder.write(name, args, result, error, seconds)
+    def _sendAndReceive(self, data: bytes) -> bytes:
+        self.__sizes.sent = len(data)
+        r = self.pool.request("POST", self._uri, data=data, timeout=self.timeout, headers={"Content-Type": "application/hprose"})
+        self.__sizes.received = len(r.content)
+        if r.status_code != 200:
+            raise HproseException(f"{r.status_code}:{r.reason}")
+        return r.content
+
+_pools: Dict[str, Pool] = {}
+_pools_lock = threading.Lock()
+
+def pool(dispatcher: Dispatcher, pool_size: int=POOL_SIZE, idle_timeout: float=IDLE_TIMEOUT) -> Pool:
+    """
+    Parameters
+    ----------
+    dispatcher : Dispatcher
+        dispatcher the pool connects to
+    pool_size : int
+        number of connections kept open - only used when the pool is created
+    idle_timeout : float
+        seconds the pool may sit unused before its connections are dropped - only used when the pool is created
+
+    Returns : Pool
+    -------
+    pool shared by every client of dispatcher
+
+    Pools left unused longer than their idle_timeout are dropped here, clients still holding one keep
+    working over a new session
+    """
+    key = f"{dispatcher.ip}:{dispatcher.port}"
+    with _pools_lock:
+        for idle in [k for k, p in _pools.items() if k != key and p.drop_idle()]:
+            del _pools[idle]
+        if key not in _pools:
+            _pools[key] = Pool(pool_size, idle_timeout)
+        return _pools[key]
+def connect(dispatcher: Dispatcher, pool_size: int=POOL_SIZE, idle_timeout: float=IDLE_TIMEOUT, metrics: Optional[Metrics]=None, recorder: Optional[Recorder]=None) -> HttpTransport:
+    """
+    Parameters
+    ----------
+    dispatcher : Dispatcher
+        dispatcher to connect to
+    pool_size : int
+        number of connections kept open
+    idle_timeout : float
+        seconds the pool may sit unused before its connections are dropped
+    metrics : Metrics
+        metrics calls are recorded to - defaults to metrics.METRICS
+    recorder : Recorder
+        recorder every call is written to - None to not record
+
+    Returns : HttpTransport
+    -------
+    hprose client sending calls over the dispatcher's shared pool
+    """
+    return HttpTransport(dispatcher.rpc(), pool(dispatcher, pool_size, idle_timeout), metrics, recorder)
@@ -1,6 +1,7 @@
 """Helper functions provided by Gizo"""
 import binascii
 import base64
+from typing import Iterable, Iterator, List, Union, Any
 
 def b64_to_hex(value: str) -> str:
     """
@@ -25,7 +26,7 @@ def b64_to_bytes(value: str) -> list:
     -------
     bytes list of base64 encoded string
     """
-    return hex_to_bytes(b64_to_hex(value))
+    return list(base64.b64decode(value))
 def bytes_to_hex(bytes_arr: bytes) -> str:
     """
     Paramerters
@@ -51,4 +52,120 @@ def hex_to_bytes(value: str) -> list:
     bytes array of hex value
     """
     return list(binascii.unhexlify(value))
-    
\ No newline at end of file
+
+class ExecHash:
+    """Exec hash backed by bytes
+    Hashable and comparable so it can key dicts and sets, its hex and base64 forms are worked out on
+    first use and cached. Accepted by every Exec* method in place of a byte array, the list rpc
+    methods take is built per call and not kept
+    Parameters
+    ----------
+    value : bytes
+        raw exec hash
+    """
+    __slots__ = ("bytes", "_hex", "_b64")
+    def __init__(self, value: Union[bytes, bytearray, List[int]]) -> None:
+        self.bytes: bytes = bytes(value)
+        self._hex = None
+        self._b64 = None
+    @classmethod
+    def from_hex(cls, value: str) -> "ExecHash":
+        """
+        Parameters
+        ----------
+        value : str
+            hex encoded exec hash
+
+        Returns : ExecHash
+        -------
+        exec hash
+        """
+        return cls(binascii.unhexlify(value))
+    @classmethod
+    def from_b64(cls, value: str) -> "ExecHash":
+        """
+        Parameters
+        ----------
+        value : str
+            base64 encoded exec hash
+
+        Returns : ExecHash
+        -------
+        exec hash
+        """
+        return cls(base64.b64decode(value))
+    @property
+    def hex(self) -> str:
+        """hex value of exec hash"""
+        if self._hex is None:
+            self._hex = self.bytes.hex()
+        return self._hex
+    @property
+    def b64(self) -> str:
+        """base64 value of exec hash"""
+        if self._b64 is None:
+            self._b64 = base64.b64encode(self.bytes).decode("utf-8")
+        return self._b64
+    @property
+    def list(self) -> List[int]:
+        """bytes list of exec hash - the form rpc methods take"""
+        return list(self.bytes)
+    def __bytes__(self) -> bytes:
+        return self.bytes
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.bytes)
+    def __len__(self) -> int:
+        return len(self.bytes)
+    def __hash__(self) -> int:
+        return hash(self.bytes)
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ExecHash):
+            return self.bytes == other.bytes
+        if isinstance(other, (bytes, bytearray)):
+            return self.bytes == other
+        if isinstance(other, list):
+            return list(self.bytes) == other
+        return NotImplemented
+    def __repr__(self) -> str:
+        return f"ExecHash({self.hex})"
+
+def hex_to_exec_hashes(values: Iterable[str]) -> List[ExecHash]:
+    """
+    Parameters
+    ----------
+    values : list
+        hex encoded exec hashes
+
+    Returns : list
+    -------
+    ExecHash of every value
+    """
+    unhexlify = binascii.unhexlify
+    return [ExecHash(unhexlify(value)) for value in values]
+def b64_to_exec_hashes(values: Iterable[str]) -> List[ExecHash]:
+    """
+    Parameters
+    ----------
+    values : list
+        base64 encoded exec hashes
+
+    Returns : list
+    -------
+    ExecHash of every value
+    """
+    b64decode = base64.b64decode
+    return [ExecHash(b64decode(value)) for value in values]
+def hash_arg(exec_hash: Union[List[int], ExecHash]) -> List[int]:
+    """
+    Parameters
+    ----------
+    exec_hash : list
+        byte array of exec hash or ExecHash
+
+    Returns : list
+    -------
+    byte array of exec hash as rpc methods take it
+    """
+    if isinstance(exec_hash, ExecHash):
+        return list(exec_hash.bytes)
+    return exec_hash
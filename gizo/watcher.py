@@ -0,0 +1,315 @@
+"""Exec status watcher"""
+import asyncio
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, Callable, Dict, List, NamedTuple, Iterator, Tuple
+import gizo.status as status
+
+ABANDONED = "ABANDONED"
+"""Status of the Transition emitted when an exec stops being watched because its polls keep failing"""
+_logger = logging.getLogger(__name__)
+_STOPPED = object()
+"""Queued by stop() so transitions() and async iteration end"""
+
+class Transition(NamedTuple):
+    """Change of an exec's status"""
+    job_id: str
+    exec_hash: list
+    previous: Optional[str]
+    """status before the change - None the first time the exec is seen"""
+    status: str
+
+class _Watched:
+    """Polling state of one exec"""
+    __slots__ = ("job_id", "exec_hash", "status", "interval", "due", "ttl", "execution_time", "backoff", "failures")
+    def __init__(self, job_id: str, exec_hash: list, due: float) -> None:
+        self.job_id = job_id
+        self.exec_hash = exec_hash
+        self.status: Optional[str] = None
+        self.interval: float = 0.0
+        self.due = due
+        self.ttl: Optional[float] = None
+        self.execution_time: Optional[int] = None
+        self.backoff: Optional[float] = None
+        self.failures: int = 0
+        """ExecStatus calls in a row that raised"""
+
+class ExecWatcher:
+    """Tracks the status of many execs from one scheduler thread
+    Each exec is polled on its own adaptive interval - the interval resets when its status changes and
+    backs off while it doesn't, a queued exec isn't polled before its scheduled execution time,
+    a running exec is polled at a fraction of its ttl and a retrying one after its backoff.
+    Execs that are due together are polled concurrently in one batch, and an exec watched more than
+    once is only polled once. Polling stops when an exec reaches FINISHED, TIMEOUT or CANCELLED, or
+    when ExecStatus has raised for it max_failures times in a row - a Transition to ABANDONED is emitted
+    then, so it is the last transition of an exec either way
+    Parameters
+    ----------
+    gizo : Gizo
+        connected client to poll with
+    on_change : callable
+        called with each Transition from the scheduler thread - when not given transitions are
+        queued for transitions() and async iteration instead, every async iteration in progress gets
+        each transition
+    workers : int
+        maximum number of polls in flight at once
+    min_interval : float
+        seconds between polls right after a status change
+    max_interval : float
+        longest seconds between polls of an exec
+    max_failures : int
+        ExecStatus calls in a row that may raise before an exec stops being watched
+
+    Failed polls, including the execution time, ttl and backoff reads, and exceptions raised by
+    on_change are logged to the gizo.watcher logger
+    """
+    def __init__(self, gizo: Any, on_change: Optional[Callable[[Transition], None]]=None, workers: int=8, min_interval: float=0.5, max_interval: float=30.0, max_failures: int=10) -> None:
+        self.gizo = gizo
+        self.on_change = on_change
+        self.workers = workers
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_failures = max_failures
+        self.polls: int = 0
+        """number of ExecStatus calls made"""
+        self.__watched: Dict[Tuple[str, bytes], _Watched] = {}
+        self.__heap: List[Tuple[float, int, Tuple[str, bytes]]] = []
+        self.__seq = itertools.count()
+        self.__events: "queue.Queue[Any]" = queue.Queue()
+        self.__readers: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Queue[Any]"]] = []
+        """event loops and queues of async iterations in progress"""
+        self.__readers_lock = threading.Lock()
+        self.__cond = threading.Condition()
+        self.__thread: Optional[threading.Thread] = None
+        self.__stopped = False
+    def __len__(self) -> int:
+        """number of execs still being watched"""
+        return len(self.__watched)
+    def watch(self, job_id: str, exec_hash: list) -> None:
+        """Starts watching an exec - starts the scheduler thread if it isn't running
+        Parameters
+        ----------
+        job_id : str
+            id of job exec ran
+        exec_hash : list
+            byte array of exec hash
+        """
+        key = (job_id, bytes(exec_hash))
+        with self.__cond:
+            if key in self.__watched:
+                return
+            watched = _Watched(job_id, exec_hash, time.monotonic())
+            self.__watched[key] = watched
+            self.__schedule(key, watched)
+            self.__cond.notify()
+        self.start()
+    def unwatch(self, job_id: str, exec_hash: list) -> None:
+        """Stops watching an exec
+        Parameters
+        ----------
+        job_id : str
+            id of job exec ran
+        exec_hash : list
+            byte array of exec hash
+        """
+        with self.__cond:
+            self.__watched.pop((job_id, bytes(exec_hash)), None)
+            self.__cond.notify_all()
+    def status(self, job_id: str, exec_hash: list) -> Optional[str]:
+        """
+        Returns : str
+        -------
+        last polled status of a watched exec - None if not polled yet or not watched
+        """
+        watched = self.__watched.get((job_id, bytes(exec_hash)))
+        return None if watched is None else watched.status
+    def start(self) -> None:
+        """Starts the scheduler thread"""
+        with self.__cond:
+            if self.__thread is not None and self.__thread.is_alive():
+                return
+            self.__stopped = False
+            self.__thread = threading.Thread(target=self.__run, name="gizo-exec-watcher", daemon=True)
+            self.__thread.start()
+    def stop(self) -> None:
+        """Stops the scheduler thread and ends transitions() and async iteration, watched execs are kept"""
+        with self.__cond:
+            self.__stopped = True
+            self.__cond.notify_all()
+        with self.__readers_lock:
+            self.__events.put(_STOPPED)
+            for reader in self.__readers:
+                self.__deliver(reader, _STOPPED)
+        if self.__thread is not None:
+            self.__thread.join()
+    def wait(self, timeout: Optional[float]=None) -> bool:
+        """Blocks until every watched exec has stopped being watched
+        Parameters
+        ----------
+        timeout : float
+            seconds to wait - None to wait forever
+
+        Returns : bool
+        -------
+        True if no execs are left
+        """
+        with self.__cond:
+            return self.__cond.wait_for(lambda: not self.__watched, timeout)
+    def transitions(self, timeout: Optional[float]=None) -> Iterator[Transition]:
+        """Yields queued transitions as they happen, until none arrive within timeout or the watcher is stopped
+        Parameters
+        ----------
+        timeout : float
+            seconds to wait for the next transition - None to wait forever
+        """
+        while True:
+            try:
+                event = self.__events.get(timeout=timeout)
+            except queue.Empty:
+                return
+            if event is _STOPPED:
+                if self.__ended():
+                    return
+                continue
+            yield event
+    async def __aiter__(self):
+        """Yields transitions as they happen, starting with those already queued, until the watcher is stopped"""
+        reader = (asyncio.get_running_loop(), asyncio.Queue())
+        with self.__readers_lock:
+            while True:
+                try:
+                    event = self.__events.get_nowait()
+                except queue.Empty:
+                    break
+                if event is not _STOPPED:
+                    reader[1].put_nowait(event)
+            with self.__cond:
+                if self.__stopped:
+                    self.__events.put(_STOPPED)
+                    reader[1].put_nowait(_STOPPED)
+            self.__readers.append(reader)
+        try:
+            while True:
+                event = await reader[1].get()
+                if event is _STOPPED:
+                    return
+                yield event
+        finally:
+            with self.__readers_lock:
+                self.__readers.remove(reader)
+    @staticmethod
+    def __deliver(reader: Tuple[asyncio.AbstractEventLoop, "asyncio.Queue[Any]"], event: Any) -> None:
+        """Hands an event to an async iteration from any thread"""
+        loop, events = reader
+        try:
+            loop.call_soon_threadsafe(events.put_nowait, event)
+        except RuntimeError:
+            pass
+    def __ended(self) -> bool:
+        """Handles a queued stop - requeues it for other readers if the watcher is still stopped
+        Returns : bool
+        -------
+        True if the reader should end, False if the watcher was started again since
+        """
+        with self.__cond:
+            if not self.__stopped:
+                return False
+        self.__events.put(_STOPPED)
+        return True
+    def __schedule(self, key: Tuple[str, bytes], watched: _Watched) -> None:
+        heapq.heappush(self.__heap, (watched.due, next(self.__seq), key))
+    def __run(self) -> None:
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                with self.__cond:
+                    due: List[_Watched] = []
+                    while not self.__stopped:
+                        now = time.monotonic()
+                        while self.__heap and self.__heap[0][0] <= now:
+                            _, _, key = heapq.heappop(self.__heap)
+                            watched = self.__watched.get(key)
+                            if watched is not None and watched.due <= now:
+                                due.append(watched)
+                        if due:
+                            break
+                        self.__cond.wait(self.__heap[0][0] - now if self.__heap else None)
+                    if self.__stopped:
+                        return
+                    self.polls += len(due)
+                for watched, (previous, current) in zip(due, pool.map(self.__poll, due)):
+                    if current is not None and current != previous:
+                        self.__emit(Transition(watched.job_id, watched.exec_hash, previous, current))
+                abandoned: List[_Watched] = []
+                with self.__cond:
+                    for watched in due:
+                        key = (watched.job_id, bytes(watched.exec_hash))
+                        if self.__watched.get(key) is not watched:
+                            continue
+                        if watched.status in status.TERMINAL:
+                            del self.__watched[key]
+                        elif watched.failures >= self.max_failures:
+                            _logger.error("stopped watching exec %s of job %s after %d failed polls", bytes(watched.exec_hash).hex(), watched.job_id, watched.failures)
+                            del self.__watched[key]
+                            abandoned.append(watched)
+                        else:
+                            self.__schedule(key, watched)
+                for watched in abandoned:
+                    self.__emit(Transition(watched.job_id, watched.exec_hash, watched.status, ABANDONED))
+                with self.__cond:
+                    self.__cond.notify_all()
+    def __poll(self, watched: _Watched) -> Tuple[Optional[str], Optional[str]]:
+        """Polls an exec's status and works out when to poll it next
+        Returns : tuple
+        -------
+        previous and current status
+        """
+        previous = watched.status
+        try:
+            current = self.gizo.ExecStatus(watched.job_id, watched.exec_hash)
+            watched.failures = 0
+        except Exception:
+            current = None
+            watched.failures += 1
+            _logger.warning("polling exec %s of job %s failed (%d in a row)", bytes(watched.exec_hash).hex(), watched.job_id, watched.failures, exc_info=True)
+        if current is not None:
+            watched.status = current
+        if current is None or current == previous:
+            watched.interval = min(max(watched.interval * 2, self.min_interval), self.max_interval)
+        else:
+            watched.interval = self.min_interval
+        delay = watched.interval
+        try:
+            if current in (status.QUEUED, status.STARTED):
+                if watched.execution_time is None:
+                    watched.execution_time = self.gizo.ExecExecutionTime(watched.job_id, watched.exec_hash)
+                delay = max(delay, min(watched.execution_time - time.time(), self.max_interval))
+            elif current == status.RUNNING:
+                if watched.ttl is None:
+                    watched.ttl = self.gizo.ExecTtlSeconds(watched.job_id, watched.exec_hash)
+                if watched.ttl:
+                    delay = min(delay, max(watched.ttl / 10, self.min_interval))
+            elif current == status.RETRYING:
+                if watched.backoff is None:
+                    watched.backoff = self.gizo.ExecBackoff(watched.job_id, watched.exec_hash)
+                delay = min(max(delay, watched.backoff), self.max_interval)
+        except Exception:
+            _logger.warning("reading the schedule of exec %s of job %s failed", bytes(watched.exec_hash).hex(), watched.job_id, exc_info=True)
+        watched.due = time.monotonic() + delay
+        return previous, current
+    def __emit(self, transition: Transition) -> None:
+        if self.on_change is not None:
+            try:
+                self.on_change(transition)
+            except Exception:
+                _logger.exception("on_change raised for %s", transition)
+        else:
+            with self.__readers_lock:
+                if not self.__readers:
+                    self.__events.put(transition)
+                for reader in self.__readers:
+                    self.__deliver(reader, transition)
@@ -0,0 +1,99 @@
+"""Test for admission control"""
+import pytest
+import sys
+import os
+import threading
+import time
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.admission import AdmissionController
+from gizo.env import Envs
+from gizo.gizo import Gizo
+from gizo.job import Requests
+from gizo.standin import StandIn
+
+class Gauged:
+    """Client with fixed gauges"""
+    def __init__(self, idle=0, busy=0, queued=0, pending=0):
+        self.idle, self.busy, self.queued, self.pending = idle, busy, queued, pending
+        self.submitted = []
+    def WorkersCountNotBusy(self):
+        return self.idle
+    def WorkersCountBusy(self):
+        return self.busy
+    def JobQueueCount(self):
+        return self.queued
+    def PendingCount(self):
+        return self.pending
+    def Solo(self, jr):
+        self.submitted.append(jr)
+        return "ok"
+    def Batch(self, jrs):
+        self.submitted.extend(jrs)
+        return "ok"
+    def Version(self):
+        return {"Version": 1}
+
+class TestAdmission(object):
+    def test_rate(self):
+        controller = AdmissionController(Gauged(idle=100), rate=50, burst=5, interval=0.01)
+        start = time.monotonic()
+        for _ in range(15):
+            controller.Solo(Requests("job", {}))
+        expect(time.monotonic() - start >= 0.15).to.be.true()
+        expect(controller.stats()["admitted"]) == 15
+        controller.stop()
+    def test_queue_target(self):
+        gizo = Gauged(idle=2, busy=0, queued=0)
+        controller = AdmissionController(gizo, queue_target=1, interval=0.05)
+        controller.Batch([Requests("job", {}, {}, {})])
+        expect(controller.acquire(1, timeout=0.02)).to.be.false()
+        gizo.queued = 5
+        time.sleep(0.1)
+        expect(controller.acquire(1, timeout=0.1)).to.be.false()
+        gizo.queued = 0
+        expect(controller.acquire(1, timeout=1)).to.be.true()
+        expect(controller.stats()["timeouts"]) == 2
+        controller.stop()
+    def test_pending_target(self):
+        gizo = Gauged(idle=10, pending=20)
+        controller = AdmissionController(gizo, pending_target=10, interval=0.05, timeout=0.1)
+        with pytest.raises(Exception, match="admission"):
+            controller.Solo(Requests("job", {}))
+        gizo.pending = 0
+        expect(controller.Solo(Requests("job", {}))) == "ok"
+        controller.stop()
+    def test_unreachable(self):
+        gizo = Gauged()
+        gizo.JobQueueCount = None
+        controller = AdmissionController(gizo, interval=0.05)
+        expect(controller.acquire(100, timeout=1)).to.be.true()
+        expect(controller.gauges is None).to.be.true()
+        expect(controller.stats()["failures"] >= 1).to.be.true()
+        controller.stop()
+    def test_passthrough(self):
+        controller = AdmissionController(Gauged())
+        expect(controller.Version()) == {"Version": 1}
+    def test_standin(self, tmpdir):
+        standin = StandIn(workers=2, exec_seconds=0.05, seed=6).start()
+        try:
+            gizo = Gizo(url=standin.url, export_file=str(tmpdir.join(".gizo")))
+            job_id = gizo.NewJob(os.path.join(myPath, "../tmp/test.ank"), "Factorial", False)
+            _exec = gizo.BuildExec([1], 0, 0, 0, 0, 0, 0, Envs())
+            controller = AdmissionController(gizo, queue_target=2, interval=0.02)
+            depths = []
+            def submit():
+                controller.Solo(Requests(job_id, _exec))
+                depths.append(standin.JobQueueCount())
+            threads = [threading.Thread(target=submit) for _ in range(12)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            controller.stop()
+            expect(controller.stats()["admitted"]) == 12
+            expect(controller.stats()["waited"] > 0).to.be.true()
+            expect(max(depths) <= 4).to.be.true()
+        finally:
+            standin.stop()
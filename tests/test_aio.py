@@ -0,0 +1,160 @@
+"""Test for aio"""
+import pytest
+import sys
+import os
+import asyncio
+import json
+import threading
+import time
+from wsgiref.simple_server import make_server, WSGIRequestHandler
+import hprose
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.aio import AsyncClient, AsyncGizo, _encode_call, _decode_reply
+from gizo.env import Envs
+from gizo.job import Requests
+from gizo.standin import StandIn
+from gizo.utils import b64_to_bytes
+import gizo.codec as codec
+import gizo.models as models
+import gizo.priorities as priorities
+import gizo.status as status
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+service = hprose.HttpService()
+service.addFunction(lambda a, b: a + b, "Add")
+service.addFunction(lambda: 7, "PeerCount")
+server = make_server("127.0.0.1", 0, service, handler_class=QuietHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+uri = f"http://127.0.0.1:{server.server_port}/rpc"
+job = os.path.join(myPath, "../tmp/test.ank")
+
+@pytest.fixture(scope="module")
+def standin():
+    standin = StandIn(exec_seconds=0.01, seed=12).start()
+    yield standin
+    standin.stop()
+
+def connected(export_file):
+    with open(export_file) as f:
+        return json.load(f)
+async def wait(client, job_id, exec_hash, timeout=5):
+    deadline = time.time() + timeout
+    while await client.ExecStatus(job_id, exec_hash) not in status.TERMINAL and time.time() < deadline:
+        await asyncio.sleep(0.01)
+    return await client.ExecStatus(job_id, exec_hash)
+
+class TestCodec(object):
+    def test_encode_call(self):
+        expect(_encode_call("PeerCount", [])) == b'Cs9"PeerCount"z'
+    def test_decode_reply(self):
+        expect(_decode_reply(b'R7z')) == 7
+    def test_decode_error(self):
+        with pytest.raises(hprose.HproseException):
+            _decode_reply(b'Es5"broke"z')
+
+class TestAsyncClient(object):
+    def test_invoke(self):
+        async def run():
+            client = AsyncClient(uri)
+            result = await client.invoke("PeerCount")
+            await client.close()
+            return result
+        expect(asyncio.run(run())) == 7
+    def test_many_in_flight(self):
+        async def run():
+            client = AsyncClient(uri, max_connections=8)
+            results = await asyncio.gather(*[client.invoke("Add", (i, 1)) for i in range(50)])
+            await client.close()
+            return results
+        expect(asyncio.run(run())) == [i + 1 for i in range(50)]
+
+class TestAsyncGizo(object):
+    def test_connect_url(self, standin, tmpdir):
+        export_file = str(tmpdir.join(".gizo"))
+        async def run():
+            async with AsyncGizo(url=standin.url, export_file=export_file) as client:
+                return await client.Version()
+        expect(asyncio.run(run())).to.contain("Version", "Height", "Blocks")
+        config = connected(export_file)
+        expect(config["dispatcher"]) == standin.url
+        expect(config["keys"]).to.contain("pub", "priv")
+    def test_connect_centrum(self, standin, tmpdir):
+        export_file = str(tmpdir.join(".gizo"))
+        down = StandIn(seed=13).start()
+        centrum = StandIn(dispatchers=[standin.url]).start()
+        try:
+            async def run(client):
+                async with client:
+                    return await client.PeerCount()
+            expect(asyncio.run(run(AsyncGizo(centrum=centrum.centrum, export_file=export_file)))).to.be.an.integer()
+            expect(connected(export_file)["dispatcher"]) == standin.url
+            down.available = False
+            with pytest.raises(Exception, match="unable to connect to dispatcher"):
+                asyncio.run(run(AsyncGizo(url=down.url, export_file=str(tmpdir.join(".gizo-down")))))
+            centrum.available = False
+            with pytest.raises(Exception, match="unable to connect to centrum"):
+                asyncio.run(run(AsyncGizo(centrum=centrum.centrum, export_file=str(tmpdir.join(".gizo-centrum")))))
+        finally:
+            down.stop()
+            centrum.stop()
+    def test_config(self, standin, tmpdir):
+        export_file = str(tmpdir.join(".gizo"))
+        down = StandIn(seed=14).start()
+        centrum = StandIn(dispatchers=[standin.url]).start()
+        try:
+            async def run(client):
+                async with client:
+                    return await client.PublicKey()
+            asyncio.run(run(AsyncGizo(url=down.url, export_file=export_file)))
+            keys = connected(export_file)["keys"]
+            expect(asyncio.run(run(AsyncGizo(export_file=export_file, centrum=centrum.centrum)))) == down.PublicKey()
+            down.available = False
+            expect(asyncio.run(run(AsyncGizo(export_file=export_file, centrum=centrum.centrum)))) == standin.PublicKey()
+            expect(connected(export_file)["dispatcher"]) == standin.url
+            expect(connected(export_file)["keys"]) == keys
+        finally:
+            down.stop()
+            centrum.stop()
+    def test_not_connected(self, tmpdir):
+        client = AsyncGizo(export_file=str(tmpdir.join(".gizo")))
+        with pytest.raises(Exception, match="not connected"):
+            asyncio.run(client.PeerCount())
+    def test_rpc(self, standin, tmpdir):
+        async def run():
+            async with AsyncGizo(url=standin.url, export_file=str(tmpdir.join(".gizo"))) as client:
+                job_id = await client.NewJob(job, "Factorial", False)
+                expect(await client.NewJob(job, "Factorial", False)) == job_id
+                expect(client.jobs["Factorial"]) == job_id
+                _exec = await client.NewExec([5], 0, priorities.NORMAL, 0, 0, 0, 0, Envs())
+                expect(_exec).to.contain("Args", "Envs")
+                reply = await client.Solo(Requests(job_id, _exec))
+                exec_hash = b64_to_bytes(codec.loads(reply)["Execs"][0]["Hash"])
+                expect(await wait(client, job_id, exec_hash)) == status.FINISHED
+                expect(await client.ExecResult(job_id, exec_hash)) == [5]
+                expect(await client.ExecArgs(job_id, exec_hash)) == [5]
+                expect(await client.JobName(job_id)) == "Factorial"
+                expect(await client.IsJobPrivate(job_id)).to.be.false()
+                expect((await client.JobLatestExec(job_id))["Status"]) == status.FINISHED
+                expect(await client.gather("ExecArgs", [(job_id, exec_hash)] * 3)) == [[5]] * 3
+                expect(await client.Batch([Requests(job_id, _exec, _exec)])).to.be.a.string()
+                expect((await client.BlockByHeight(0))["Height"]) == 0
+                expect(await client.LatestBlockHeight()).to.be.an.integer()
+                with pytest.raises(Exception, match="job not found"):
+                    await client.JobName("missing")
+                return job_id, exec_hash
+        job_id, exec_hash = asyncio.run(run())
+        async def typed():
+            async with AsyncGizo(url=standin.url, export_file=str(tmpdir.join(".gizo-typed")), typed=True) as client:
+                return await client.JobLatestExec(job_id), await client.JobExecs(job_id)
+        latest, execs = asyncio.run(typed())
+        expect(isinstance(latest, models.Exec)).to.be.true()
+        expect(all(isinstance(e, models.Exec) for e in execs)).to.be.true()
+        async def raw():
+            async with AsyncGizo(url=standin.url, export_file=str(tmpdir.join(".gizo-raw")), payloads=codec.BYTES) as client:
+                return await client.JobLatestExec(job_id)
+        expect(isinstance(asyncio.run(raw()), bytes)).to.be.true()
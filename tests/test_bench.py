@@ -0,0 +1,34 @@
+"""Test for benchmarks"""
+import pytest
+import sys
+import os
+import json
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../benchmarks')
+import bench
+
+def results(**medians):
+    return {"results": {name: {"median_ns": median} for name, median in medians.items()}}
+
+class TestBench(object):
+    def test_compare(self, capsys):
+        current = results(slower=120.0, faster=80.0, steady=105.0, added=10.0)
+        baseline = results(slower=100.0, faster=100.0, steady=100.0, removed=100.0)
+        expect(bench.compare(current, baseline, 0.1)) == ["slower"]
+        out = capsys.readouterr().out
+        expect(out).to.contain("REGRESSION", "faster", "new")
+        expect(bench.compare(current, baseline, 0.25)) == []
+    def test_main(self, tmpdir):
+        output = str(tmpdir.join("results.json"))
+        args = ["--filter", "utils.b64_to_bytes", "--repeat", "1", "--min-time", "0.001"]
+        expect(bench.main(args + ["--output", output])) == 0
+        with open(output) as f:
+            expect(list(json.load(f)["results"])) == ["utils.b64_to_bytes"]
+        baseline = str(tmpdir.join("baseline.json"))
+        with open(baseline, "w") as f:
+            json.dump(results(**{"utils.b64_to_bytes": 1e-6}), f)
+        expect(bench.main(args + ["--output", output, "--baseline", baseline])) == 1
+        with open(baseline, "w") as f:
+            json.dump(results(**{"utils.b64_to_bytes": 1e9}), f)
+        expect(bench.main(args + ["--output", output, "--baseline", baseline])) == 0
@@ -0,0 +1,75 @@
+"""Test for builder"""
+import pytest
+import sys
+import os
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.builder import ExecBuilder
+from gizo.env import Env, Envs
+from gizo.gizo import Gizo
+from gizo.standin import StandIn
+import gizo.priorities as priorities
+
+_pub = "304e301006072a8648ce3d020106052b81040021033a000473ed48af27222301e8907ce4031b6811b6ce0a0edb0b40426e57180468312985aefdd3e340eac3349a42225514c39231f4b733d8e07b7f2e"
+_envs = "tsjvpJgFyhn+7arBKeRz4lFv9qihC5aJE6V23sCdeoALUCL3gMpfwxf+RA0lgmNwAG15"
+_new_exec = {
+    "Hash": None,
+    "Timestamp": 0,
+    "Duration": 0,
+    "Args": [0],
+    "Err": None,
+    "Priority": 0,
+    "Result": None,
+    "Status": "STARTED",
+    "Retries": 5,
+    "RetriesCount": 0,
+    "Backoff": 0,
+    "ExecutionTime": 0,
+    "Interval": 0,
+    "By": "",
+    "TTL": 0,
+    "Pub": _pub,
+    "Envs": _envs
+}
+"""NewExec([0], 5, NORMAL, 0, 0, 0, 0, Envs(Env("test", "test"))) as returned by a dispatcher"""
+
+@pytest.fixture(scope="module")
+def gizo(tmpdir_factory):
+    standin = StandIn(seed=14).start()
+    yield Gizo(url=standin.url, export_file=str(tmpdir_factory.mktemp("builder").join(".gizo")))
+    standin.stop()
+
+class TestExecBuilder(object):
+    def test_matches_new_exec(self):
+        builder = ExecBuilder(_pub, lambda envs: _envs)
+        e = builder.build([0], 5, priorities.NORMAL, 0, 0, 0, 0, Envs(Env("test", "test")))
+        expect(e) == _new_exec
+        expect(list(e)) == list(_new_exec)
+    def test_durations(self):
+        e = ExecBuilder(_pub, lambda envs: _envs).build([0], 0, priorities.HIGH, 2, 100, 5, 3, Envs())
+        expect(e["Backoff"]) == 2 * 10 ** 9
+        expect(e["TTL"]) == 3 * 60 * 10 ** 9
+        expect(e["ExecutionTime"]) == 100
+        expect(e["Priority"]) == priorities.HIGH
+    def test_envs_encrypted_once(self):
+        calls = []
+        def encrypt(envs):
+            calls.append(envs)
+            return f"encrypted-{len(calls)}"
+        builder = ExecBuilder(_pub, encrypt)
+        for n in range(100):
+            builder.build([n], 0, 0, 0, 0, 0, 0, Envs(Env("test", "test")))
+        other = builder.build([0], 0, 0, 0, 0, 0, 0, Envs(Env("test", "other")))
+        expect(len(calls)) == 2
+        expect(other["Envs"]) == "encrypted-2"
+    @pytest.mark.parametrize("args, retries, priority, backoff, exec_time, interval, ttl, envs", [
+        ([0], 5, priorities.NORMAL, 0, 0, 0, 0, Envs(Env("test", "test"))),
+        (["a", {"b": 1}], 10, priorities.HIGH, 2, 1700000000, 60, 3, Envs()),
+        ([], 1, priorities.LOW, 30, 0, 5, 60, Envs(Env("k", 1), Env("l", [1, 2]))),
+    ])
+    def test_conforms_to_rpc(self, gizo, args, retries, priority, backoff, exec_time, interval, ttl, envs):
+        remote = gizo.NewExec(args, retries, priority, backoff, exec_time, interval, ttl, envs)
+        local = gizo.BuildExec(args, retries, priority, backoff, exec_time, interval, ttl, envs)
+        expect(local) == remote
+        expect(list(local)) == list(remote)
@@ -0,0 +1,55 @@
+"""Test for cache"""
+import pytest
+import sys
+import os
+import base64
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.cache import BlockCache
+
+def block(height, tag=0):
+    return {"Header": {"Hash": base64.b64encode(bytes([height, tag])).decode("utf-8")}, "Height": height}
+
+class TestBlockCache(object):
+    def test_dual_index(self):
+        cache = BlockCache()
+        cache.put(block(1), 10)
+        cache.put(block(2), 10)
+        expect(cache.get_by_hash("0100")["Height"]) == 1
+        expect(cache.get_by_height(1)["Height"]) == 1
+        expect(cache.stats()["hits"]) == 2
+    def test_tip_not_served_by_height(self):
+        cache = BlockCache()
+        cache.put(block(5), 10)
+        expect(cache.get_by_height(5)).to.be.none()
+        expect(cache.get_by_hash("0500")["Height"]) == 5
+        cache.observe_tip(6)
+        expect(cache.get_by_height(5)["Height"]) == 5
+    def test_reorg_replaces_height(self):
+        cache = BlockCache()
+        cache.put(block(3), 10)
+        cache.put(block(3, 1), 10)
+        cache.observe_tip(4)
+        expect(cache.get_by_height(3)["Header"]["Hash"]) == block(3, 1)["Header"]["Hash"]
+        expect(cache.get_by_hash("0300")).to.be.none()
+        expect(len(cache)) == 1
+    def test_evicts_least_recently_used(self):
+        cache = BlockCache(max_blocks=2)
+        cache.put(block(1), 10)
+        cache.put(block(2), 10)
+        cache.get_by_hash("0100")
+        cache.put(block(3), 10)
+        expect(cache.get_by_hash("0200")).to.be.none()
+        expect(cache.get_by_hash("0100")).not_to.be.none()
+        expect(cache.evictions) == 1
+    def test_byte_limit(self):
+        cache = BlockCache(max_bytes=25)
+        for h in range(5):
+            cache.put(block(h), 10)
+        expect(len(cache)) == 2
+        expect(cache.size) == 20
+    def test_disabled(self):
+        cache = BlockCache(max_blocks=0)
+        cache.put(block(1), 10)
+        expect(len(cache)) == 0
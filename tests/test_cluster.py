@@ -0,0 +1,113 @@
+"""Test for multi-dispatcher routing"""
+import pytest
+import sys
+import os
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.cluster import GizoCluster
+from gizo.env import Envs
+from gizo.job import Requests
+from gizo.standin import StandIn
+from gizo.utils import b64_to_bytes
+import gizo.codec as codec
+
+job = os.path.join(myPath, "../tmp/test.ank")
+
+@pytest.fixture
+def standins():
+    small = StandIn(workers=2, exec_seconds=0.5, score=1.0, seed=7).start()
+    large = StandIn(workers=8, exec_seconds=0.5, score=2.0, seed=8, chain=small).start()
+    centrum = StandIn(dispatchers=[small.url, large.url], seed=9).start()
+    yield small, large, centrum
+    for standin in (small, large, centrum):
+        standin.stop()
+
+def hashes(reply):
+    return [b64_to_bytes(e["Hash"]) for e in codec.loads(reply)["Execs"]]
+
+class TestCluster(object):
+    def test_members(self, standins, tmpdir):
+        small, large, centrum = standins
+        cluster = GizoCluster(centrum=centrum.centrum, export_file=str(tmpdir.join(".gizo")))
+        expect([m.url for m in cluster.members]) == [small.url, large.url]
+        expect([m.idle for m in cluster.members]) == [2, 8]
+        expect(cluster.members[1].score) == 2.0
+        expect(cluster.Version()).to.contain("Version", "Height", "Blocks")
+    def test_routing(self, standins, tmpdir):
+        small, large, _ = standins
+        cluster = GizoCluster(urls=[small.url, large.url], export_file=str(tmpdir.join(".gizo")), interval=60)
+        job_id = cluster.NewJob(job, "Factorial", False)
+        _exec = cluster.BuildExec([1], 0, 0, 0, 0, 0, 0, Envs())
+        replies = [cluster.Solo(Requests(job_id, _exec)) for _ in range(10)]
+        stats = cluster.stats()
+        expect(stats[large.url]["submitted"]) == 8
+        expect(stats[small.url]["submitted"]) == 2
+        cluster.stop()
+        for reply in replies:
+            exec_hash = hashes(reply)[0]
+            expect(cluster.ExecStatus(job_id, exec_hash) is not None).to.be.true()
+            expect(cluster.ExecArgs(job_id, exec_hash)) == [1]
+        details = cluster.ExecDetailsMany(job_id, [hashes(r)[0] for r in replies])
+        expect([d.args for d in details]) == [[1]] * 10
+    def test_batch(self, standins, tmpdir):
+        small, large, _ = standins
+        cluster = GizoCluster(urls=[small.url, large.url], export_file=str(tmpdir.join(".gizo")), interval=60)
+        job_id = cluster.NewJob(job, "Factorial", False)
+        _exec = cluster.BuildExec([1], 0, 0, 0, 0, 0, 0, Envs())
+        result = cluster.BatchMany([Requests(job_id, *([_exec] * 12))], max_execs=4)
+        expect(result.errors) == []
+        stats = cluster.stats()
+        expect(stats[large.url]["submitted"]) == 8
+        expect(stats[small.url]["submitted"]) == 4
+        cluster.stop()
+    def test_failover(self, standins, tmpdir):
+        small, large, _ = standins
+        cluster = GizoCluster(urls=[small.url, large.url], export_file=str(tmpdir.join(".gizo")), interval=60)
+        job_id = cluster.NewJob(job, "Factorial", False)
+        _exec = cluster.BuildExec([1], 0, 0, 0, 0, 0, 0, Envs())
+        large.available = False
+        reply = cluster.Solo(Requests(job_id, _exec))
+        stats = cluster.stats()
+        expect(stats[large.url]["healthy"]).to.be.false()
+        expect(stats[small.url]["submitted"]) == 1
+        expect(cluster.ExecArgs(job_id, hashes(reply)[0])) == [1]
+        small.stop()
+        with pytest.raises(Exception, match="no dispatchers"):
+            cluster.Solo(Requests(job_id, _exec))
+        large.available = True
+        cluster.sample()
+        expect(cluster.stats()[large.url]["healthy"]).to.be.true()
+        expect(cluster.stats()[small.url]["healthy"]).to.be.false()
+        cluster.Solo(Requests(job_id, _exec))
+        expect(cluster.stats()[large.url]["submitted"]) == 1
+        cluster.stop()
+    def test_cancel(self, standins, tmpdir):
+        small, large, _ = standins
+        cluster = GizoCluster(urls=[small.url, large.url], export_file=str(tmpdir.join(".gizo")), interval=60)
+        job_id = cluster.NewJob(job, "Factorial", False)
+        _exec = cluster.BuildExec([1], 0, 0, 0, 0, 0, 0, Envs())
+        exec_hash = hashes(cluster.Solo(Requests(job_id, _exec)))[0]
+        expect(cluster.stats()[large.url]["submitted"]) == 1
+        cluster.CancelExec(exec_hash)
+        expect(cluster.ExecStatus(job_id, exec_hash)) == "CANCELLED"
+        cluster.stop()
+    def test_first_down(self, standins, tmpdir):
+        small, large, _ = standins
+        small.available = False
+        cluster = GizoCluster(urls=[small.url, large.url], export_file=str(tmpdir.join(".gizo")), interval=60)
+        expect([m.url for m in cluster.members]) == [large.url]
+        expect(cluster.Version()).to.contain("Version")
+        small.stop()
+        large.stop()
+        with pytest.raises(Exception, match="no dispatchers"):
+            GizoCluster(urls=[small.url, large.url], export_file=str(tmpdir.join(".gizo")))
+    def test_job_not_visible(self, standins, tmpdir):
+        small, _, _ = standins
+        other = StandIn(seed=10).start()
+        try:
+            cluster = GizoCluster(urls=[small.url, other.url], export_file=str(tmpdir.join(".gizo")), interval=60)
+            with pytest.raises(Exception, match="not visible on " + other.url):
+                cluster.NewJob(job, "Factorial", False, timeout=0.2)
+        finally:
+            other.stop()
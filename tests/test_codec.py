@@ -0,0 +1,48 @@
+"""Test for codec"""
+import pytest
+import sys
+import os
+import json
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+import gizo.codec as codec
+from gizo.env import Env, Envs
+from gizo.job import Requests
+
+_block = '{"Height": 3, "Header": {"Hash": "dGVzdGluZw=="}, "Jobs": []}'
+
+class TestCodec(object):
+    def test_backend(self):
+        expect(codec.BACKEND in ("orjson", "ujson", "json")).to.be.true()
+    def test_loads(self):
+        expected = json.loads(_block)
+        expect(codec.loads(_block)) == expected
+        expect(codec.loads(_block.encode("utf-8"))) == expected
+        expect(codec.loads(memoryview(_block.encode("utf-8")))) == expected
+    def test_dumps(self):
+        value = {"a": [1, 2.5, None, True], "b": "ü/"}
+        expect(json.loads(codec.dumps(value))) == value
+    def test_dumps_pretty(self):
+        value = {"b": 1, "a": {"c": [1]}}
+        expect(codec.dumps_pretty(value)) == json.dumps(value, indent=4, separators=(',', ': '), sort_keys=True)
+    def test_decode(self):
+        expect(codec.decode(_block)) == json.loads(_block)
+        raw = codec.decode(_block, codec.BYTES)
+        expect(raw) == _block.encode("utf-8")
+        view = codec.decode(_block, codec.MEMORYVIEW)
+        expect(isinstance(view, memoryview)).to.be.true()
+        expect(view.tobytes()) == _block.encode("utf-8")
+        expect(codec.decode(view, codec.BYTES)) == _block.encode("utf-8")
+    def test_unknown_mode(self):
+        with pytest.raises(Exception):
+            codec.decode(_block, "text")
+    def test_requests(self):
+        jr = Requests("job", {"Hash": None, "Status": "STARTED"})
+        expect(json.loads(jr.jrs())) == {"ID": "job", "Execs": [{"Hash": None, "Status": "STARTED"}]}
+    def test_non_str_keys(self):
+        jr = Requests("j", {"Args": [{1: "a"}]})
+        expect(json.loads(jr.jrs())) == {"ID": "j", "Execs": [{"Args": [{"1": "a"}]}]}
+    def test_wide_integers(self):
+        envs = Envs(Env("k", 2 ** 70)).envs
+        expect(json.loads(codec.dumps(envs))) == [{"k": 2 ** 70}]
@@ -0,0 +1,130 @@
+"""Test for futures"""
+import pytest
+import sys
+import os
+import json
+import base64
+import threading
+import time
+from concurrent.futures import as_completed
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.futures import Submitter, ExecError
+from gizo.job import Requests
+from gizo.watcher import ABANDONED
+import gizo.status as status
+
+def encode(exec_hash):
+    return base64.b64encode(bytes(exec_hash)).decode("utf-8")
+
+class Dispatcher(object):
+    """Queues every exec it is sent, each finishes on its second status poll with its first arg doubled"""
+    def __init__(self):
+        self.polls = {}
+        self.args = {}
+        self.lock = threading.Lock()
+    def submit(self, jrs):
+        reply = []
+        for jr in jrs:
+            execs = []
+            for e in jr.execs:
+                h = [len(self.args) + 1]
+                self.args[bytes(h)] = e["Args"]
+                execs.append({"Hash": encode(h), "Status": status.QUEUED})
+            reply.append({"ID": jr.id, "Execs": execs})
+        return json.dumps(reply)
+    def Solo(self, jr):
+        return self.submit([jr])
+    def Batch(self, jrs):
+        return self.submit(jrs)
+    def ExecStatus(self, job_id, exec_hash):
+        with self.lock:
+            n = self.polls[bytes(exec_hash)] = self.polls.get(bytes(exec_hash), 0) + 1
+        if n < 2:
+            return status.RUNNING
+        return status.CANCELLED if self.args[bytes(exec_hash)][0] < 0 else status.FINISHED
+    def ExecResult(self, job_id, exec_hash):
+        return self.args[bytes(exec_hash)][0] * 2
+    def ExecErr(self, job_id, exec_hash):
+        return "cancelled"
+    def ExecExecutionTime(self, job_id, exec_hash):
+        return 0
+    def ExecTtlSeconds(self, job_id, exec_hash):
+        return 0
+
+class TestSubmitter(object):
+    def test_batch(self):
+        submitter = Submitter(Dispatcher())
+        submitter.watcher.min_interval = 0.01
+        futures = [submitter.Solo(Requests("job", {"Args": [i]})) for i in range(5)]
+        futures.append(submitter.Batch([Requests("job", {"Args": [10]}, {"Args": [20]})]))
+        results = sorted(f.result(timeout=5) for f in as_completed(futures, timeout=5))
+        expect(results) == [[0], [2], [4], [6], [8], [20, 40]]
+        submitter.shutdown()
+    def test_exec_error(self):
+        submitter = Submitter(Dispatcher())
+        submitter.watcher.min_interval = 0.01
+        future = submitter.Solo(Requests("job", {"Args": [-1]}))
+        with pytest.raises(ExecError) as e:
+            future.result(timeout=5)
+        expect(e.value.status) == status.CANCELLED
+        submitter.shutdown()
+    def test_terminal_reply(self):
+        class Done(Dispatcher):
+            def Solo(self, jr):
+                return json.dumps([{"Hash": encode([9]), "Status": status.FINISHED, "Result": 3, "Err": None}])
+        submitter = Submitter(Done())
+        expect(submitter.Solo(Requests("job", {"Args": [1]})).result(timeout=5)) == [3]
+        submitter.shutdown()
+    def test_unparsed_reply(self):
+        class Opaque(Dispatcher):
+            def Solo(self, jr):
+                return "accepted"
+        submitter = Submitter(Opaque())
+        with pytest.raises(Exception, match="doesn't describe"):
+            submitter.Solo(Requests("job", {"Args": [1]})).result(timeout=5)
+        submitter.shutdown()
+    def test_timeout(self):
+        class Stuck(Dispatcher):
+            def ExecStatus(self, job_id, exec_hash):
+                return status.RUNNING
+        submitter = Submitter(Stuck(), timeout=0.2)
+        submitter.watcher.min_interval = 0.01
+        submitter.watcher.max_interval = 0.05
+        future = submitter.Batch([Requests("job", {"Args": [1]}, {"Args": [2]})])
+        with pytest.raises(TimeoutError, match="2 execs"):
+            future.result(timeout=5)
+        expect(submitter.watcher.wait(timeout=1)).to.be.true()
+        submitter.shutdown()
+    def test_abandoned(self):
+        class Lost(Dispatcher):
+            def ExecStatus(self, job_id, exec_hash):
+                raise Exception("exec not found")
+        submitter = Submitter(Lost())
+        submitter.watcher.min_interval = 0.01
+        submitter.watcher.max_interval = 0.02
+        submitter.watcher.max_failures = 2
+        future = submitter.Batch([Requests("job", {"Args": [1]}, {"Args": [2]})])
+        with pytest.raises(ExecError, match="abandoned") as e:
+            future.result(timeout=5)
+        expect(e.value.status) == ABANDONED
+        expect(len(submitter.watcher)) == 0
+        submitter.shutdown()
+    def test_one_deadline_thread(self):
+        class Stuck(Dispatcher):
+            def ExecStatus(self, job_id, exec_hash):
+                return status.RUNNING
+        threads = threading.active_count()
+        submitter = Submitter(Stuck(), workers=4, timeout=0.5)
+        submitter.watcher.workers = 4
+        futures = [submitter.Solo(Requests("job", {"Args": [i]})) for i in range(100)]
+        deadline = time.time() + 5
+        while len(submitter.watcher) < 100 and time.time() < deadline:
+            time.sleep(0.01)
+        expect(threading.active_count() - threads <= 4 + 4 + 2).to.be.true()
+        for future in futures:
+            with pytest.raises(TimeoutError):
+                future.result(timeout=5)
+        submitter.shutdown()
+        expect(threading.active_count()) == threads
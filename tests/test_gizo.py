@@ -1,38 +1,171 @@
-# requires node to be active
+"""Test for gizo"""
+import pytest
+import sys, os, json, tempfile, time
+import hprose
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.gizo import Gizo
+from gizo.job import Requests
+from gizo.standin import StandIn
+from gizo.utils import b64_to_hex, b64_to_bytes
+from gizo.env import Env, Envs
+import gizo.priorities as priorities
+import gizo.status as status
 
-# import pytest
-# import sys, os, base64
-# from robber import expect
-# myPath = os.path.dirname(os.path.abspath(__file__))
-# sys.path.insert(0, myPath + '/../')
-# from gizo.gizo import Gizo
-# from gizo.utils import to_bytes, to_hex
-# from gizo.env import Env, Envs
-# import gizo.priorities as priorities
+standin = StandIn(exec_seconds=0.01, seed=1).start()
+config = tempfile.mkdtemp()
+test = Gizo(centrum=standin.centrum, export_file=os.path.join(config, ".gizo"))
+job = os.path.join(myPath, "../tmp/test.ank")
 
-# test = Gizo()
+class Unsupported(object):
+    """Forwards to the stand-in as a dispatcher without JobExecs would"""
+    def __init__(self, url):
+        self.client = hprose.HttpClient(url)
+    def JobExecs(self, job_id):
+        return self.client.JobExecsNotServed(job_id)
+    def __getattr__(self, name):
+        return getattr(self.client, name)
 
-# class TestGizo(object):
-#     def test_node(self):
-#         expect(test.Version()).to.contain("Version", "Height", "Blocks")
-#         expect(test.PeerCount()).to.be.an.integer()
-#         expect(test.Score()).to.be.a.float()
-#         expect(test.Peers()).to.be.a.list()
-#         expect(test.PublicKey()).to.be.a.string()
-#         expect(test.WorkersCount()).to.be.an.integer()
-#         expect(test.WorkersCountBusy()).to.be.an.integer()
-#         expect(test.WorkersCountNotBusy()).to.be.an.integer()
-#         expect(test.JobQueueCount()).to.be.an.integer()
-#     def test_job(self):
-#         expect(test.NewJob("../tmp/test.anko", "Factorial", False)).to.be.a.string()
-#         expect(test.NewExec(["test", "test"], 0, priorities.NORMAL, 0, 0, 0, 0, Envs(Env("test", "test")))).to.contain("Args", "Envs")
-#     def test_block(self):
-#         block = test.BlockByHeight(0)
-#         expect(block).to.contain("Header")
-#         expect(test.BlockByHash(to_hex(base64.b64decode(block["Header"]["Hash"])))['Height']) == block['Height'] #! json encodes byte arrays to base64 so to use the hash value we have to decode then convert to hex
-#         expect(test.LatestBlockHeight()).to.be.an.integer()
-#         expect(test.Latest15Blocks()).to.be.a.list()
-#         expect(test.BlockHashesHex()).to.be.a.list()
-#         expect(test.LatestBlock()).to.be.a.dict()
-#         expect(test.KeyPair()).to.be.a.dict()
-    
\ No newline at end of file
+def connected(export_file):
+    with open(export_file) as f:
+        return json.load(f)["dispatcher"]
+def wait(job_id, exec_hash, timeout=5):
+    deadline = time.time() + timeout
+    while test.ExecStatus(job_id, exec_hash) not in status.TERMINAL and time.time() < deadline:
+        time.sleep(0.01)
+    return test.ExecStatus(job_id, exec_hash)
+
+class TestGizo(object):
+    def test_node(self):
+        expect(test.Version()).to.contain("Version", "Height", "Blocks")
+        expect(test.PeerCount()).to.be.an.integer()
+        expect(test.Score()).to.be.a.float()
+        expect(test.Peers()).to.be.a.list()
+        expect(test.PublicKey()).to.be.a.string()
+        expect(test.WorkersCount()).to.be.an.integer()
+        expect(test.WorkersCountBusy()).to.be.an.integer()
+        expect(test.WorkersCountNotBusy()).to.be.an.integer()
+        expect(test.JobQueueCount()).to.be.an.integer()
+        expect(connected(os.path.join(config, ".gizo"))) == standin.url
+    def test_job(self):
+        expect(test.NewJob(job, "Factorial", False)).to.be.a.string()
+        expect(test.NewExec(["test", "test"], 0, priorities.NORMAL, 0, 0, 0, 0, Envs(Env("test", "test")))).to.contain("Args", "Envs")
+        remote = test.NewExec(["test", "test"], 1, priorities.HIGH, 2, 0, 0, 3, Envs(Env("test", "test")))
+        local = test.BuildExec(["test", "test"], 1, priorities.HIGH, 2, 0, 0, 3, Envs(Env("test", "test")))
+        expect({k: v for k, v in local.items() if k != "Envs"}) == {k: v for k, v in remote.items() if k != "Envs"}
+    def test_block(self):
+        block = test.BlockByHeight(0)
+        expect(block).to.contain("Header")
+        expect(test.BlockByHash(b64_to_hex(block["Header"]["Hash"]))['Height']) == block['Height'] #! json encodes byte arrays to base64 so to use the hash value we have to decode then convert to hex
+        expect(test.LatestBlockHeight()).to.be.an.integer()
+        expect(test.Latest15Blocks()).to.be.a.list()
+        expect(test.BlockHashesHex()).to.be.a.list()
+        expect(test.LatestBlock()).to.be.a.dict()
+        expect(test.KeyPair()).to.be.a.dict()
+    def test_exec(self):
+        job_id = test.NewJob(job, "Factorial", False, force=True)
+        _exec = test.NewExec([5], 0, priorities.NORMAL, 0, 0, 0, 0, Envs())
+        reply = test.Solo(Requests(job_id, _exec))
+        exec_hash = b64_to_bytes(json.loads(reply)["Execs"][0]["Hash"])
+        expect(wait(job_id, exec_hash)) == status.FINISHED
+        expect(test.ExecResult(job_id, exec_hash)) == [5]
+        expect(test.ExecArgs(job_id, exec_hash)) == [5]
+        expect(test.JobName(job_id)) == "Factorial"
+        expect(test.IsJobPrivate(job_id)).to.be.false()
+        expect(test.JobLatestExec(job_id)["Status"]) == status.FINISHED
+        expect(test.ExecDetails(job_id, exec_hash).result) == [5]
+    def test_exec_details_many(self):
+        job_id = test.NewJob(job, "Factorial", False, force=True)
+        result = test.BatchMany([Requests(job_id, *[test.NewExec([i], 0, priorities.NORMAL, 0, 0, 0, 0, Envs()) for i in range(4)])])
+        exec_hashes = [b64_to_bytes(e["Hash"]) for chunk in result.results for reply in chunk for e in reply["Execs"]]
+        for exec_hash in exec_hashes:
+            expect(wait(job_id, exec_hash)) == status.FINISHED
+        details = test.ExecDetailsMany(job_id, list(reversed(exec_hashes)))
+        expect([d.args for d in details]) == [[3], [2], [1], [0]]
+        expect([d.status for d in details]) == [status.FINISHED] * 4
+        fallback = Gizo(export_file=os.path.join(config, ".gizo-fallback"), client=Unsupported(standin.url))
+        expect([d.args for d in fallback.ExecDetailsMany(job_id, exec_hashes)]) == [[0], [1], [2], [3]]
+        with pytest.raises(Exception, match="job not found"):
+            test.ExecDetailsMany("missing", exec_hashes)
+    def test_batch(self):
+        job_id = test.NewJob(job, "Factorial", False)
+        _exec = test.NewExec([1], 0, priorities.NORMAL, 0, 0, 0, 0, Envs())
+        result = test.BatchMany([Requests(job_id, *[_exec] * 12)])
+        expect(result.errors) == []
+        expect(sum(len(reply["Execs"]) for chunk in result.results for reply in chunk)) == 12
+        expect(test.Chain([Requests(job_id, _exec)])).to.be.a.string()
+        expect(test.Chord([Requests(job_id, _exec)], Requests(job_id, _exec))).to.be.a.string()
+    def test_failover(self):
+        down = StandIn(seed=2).start()
+        up = StandIn(seed=3).start()
+        centrum = StandIn(dispatchers=[down.url, up.url]).start()
+        down.available = False
+        try:
+            Gizo(centrum=centrum.centrum, export_file=os.path.join(config, ".gizo-failover"))
+            expect(connected(os.path.join(config, ".gizo-failover"))) == up.url
+            down.available = True
+            up.available = False
+            Gizo(centrum=centrum.centrum, export_file=os.path.join(config, ".gizo-failover"))
+            expect(connected(os.path.join(config, ".gizo-failover"))) == down.url
+        finally:
+            for s in (down, up, centrum):
+                s.stop()
+    def test_ranking(self):
+        fast = StandIn(score=1.0, seed=5).start()
+        scored = StandIn(score=5.0, seed=6).start()
+        slow = StandIn(latency=0.05, score=9.0, seed=7).start()
+        down = StandIn(score=20.0, seed=8).start()
+        centrum = StandIn(dispatchers=[slow.url, down.url, fast.url, scored.url]).start()
+        down.available = False
+        export_file = os.path.join(config, ".gizo-ranking")
+        try:
+            client = Gizo(centrum=centrum.centrum, export_file=export_file)
+            expect(connected(export_file)) == scored.url
+            client.reconnect()
+            expect(connected(export_file)) == fast.url
+            client.reconnect()
+            expect(connected(export_file)) == slow.url
+        finally:
+            for s in (fast, scored, slow, down, centrum):
+                s.stop()
+    def test_reconnect(self):
+        first = StandIn(seed=9).start()
+        second = StandIn(latency=0.02, seed=10).start()
+        late = StandIn(latency=0.04, seed=11).start()
+        centrum = StandIn(dispatchers=[first.url, second.url, late.url]).start()
+        late.available = False
+        export_file = os.path.join(config, ".gizo-reconnect")
+        try:
+            client = Gizo(centrum=centrum.centrum, export_file=export_file)
+            expect(connected(export_file)) == first.url
+            client.reconnect()
+            expect(connected(export_file)) == second.url
+            late.available = True
+            client.reconnect()
+            expect(connected(export_file)) == late.url
+            expect(client.PeerCount()).to.be.an.integer()
+            client.reconnect()
+            expect(connected(export_file)) == first.url
+            first.stop()
+            second.stop()
+            late.stop()
+            with pytest.raises(Exception, match="no dispatchers"):
+                client.reconnect()
+        finally:
+            for s in (first, second, late, centrum):
+                s.stop()
+    def test_errors(self):
+        flaky = StandIn(seed=4).start()
+        try:
+            client = Gizo(url=flaky.url, export_file=os.path.join(config, ".gizo-errors"))
+            flaky.error_rate = 1.0
+            with pytest.raises(Exception):
+                client.PeerCount()
+            flaky.error_rate = 0.0
+            flaky.latency = 0.05
+            start = time.perf_counter()
+            client.PeerCount()
+            expect(time.perf_counter() - start >= 0.05).to.be.true()
+        finally:
+            flaky.stop()
@@ -1,14 +1,24 @@
-
 import pytest
 import sys
 import os
 import base64
+import json
 from robber import expect
 myPath = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, myPath + '/../')
-from gizo.job import JobRequest
+from gizo.job import Requests, EncodedExec, exec_job_ids, reply_execs
 
 class TestJob(object):
     def test_jr(self):
-        jr = JobRequest("test", {'test': 'test'})
-        expect(jr.jr()).to.contain("ID", "Exec")
\ No newline at end of file
+        jr = Requests("test", {'test': 'test'})
+        expect(jr.jrs()).to.contain("ID", "Exec")
+    def test_encoded(self):
+        jr = Requests("test", {'test': 1}, EncodedExec('{"test":2}'))
+        expect(json.loads(jr.jrs())) == {"ID": "test", "Execs": [{"test": 1}, {"test": 2}]}
+    def test_reply_execs(self):
+        jrs = [Requests("a", {"Args": [1]}, {"Args": [2]}), '{"ID": "b", "Execs": [{"Args": [3]}]}']
+        expect(exec_job_ids(jrs)) == ["a", "a", "b"]
+        reply = json.dumps([{"ID": "a", "Execs": [{"Hash": "1"}, {"Hash": "2"}]}, {"ID": "b", "Execs": [{"Hash": "3"}]}])
+        expect(reply_execs(reply, exec_job_ids(jrs))) == [("a", {"Hash": "1"}), ("a", {"Hash": "2"}), ("b", {"Hash": "3"})]
+        expect(reply_execs([{"Status": "QUEUED"}] * 3, exec_job_ids(jrs))[2]) == ("b", {"Status": "QUEUED"})
+        expect(reply_execs("accepted", exec_job_ids(jrs))).to.be.none()
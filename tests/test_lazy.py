@@ -0,0 +1,56 @@
+"""Test for lazy construction"""
+import pytest
+import sys
+import os
+import json
+import threading
+from wsgiref.simple_server import make_server, WSGIRequestHandler
+import hprose
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.gizo import Gizo
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+calls = []
+service = hprose.HttpService()
+service.addFunction(lambda: calls.append("KeyPair") or json.dumps({"priv": "priv", "pub": "pub"}), "KeyPair")
+service.addFunction(lambda: calls.append("PeerCount") or 3, "PeerCount")
+def app(environ, start_response):
+    if environ["PATH_INFO"] == "/status":
+        calls.append("status")
+    return service(environ, start_response)
+server = make_server("127.0.0.1", 0, app, handler_class=QuietHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = f"gizo://test@127.0.0.1:{server.server_port}"
+
+class TestLazy(object):
+    def setup_method(self):
+        del calls[:]
+    def test_connects_on_first_rpc(self, tmpdir):
+        gizo = Gizo(url=url, export_file=str(tmpdir.join(".gizo")), lazy=True)
+        expect(calls) == []
+        expect(gizo.PeerCount()) == 3
+        expect(calls) == ["status", "KeyPair", "PeerCount"]
+        expect(os.path.isfile(str(tmpdir.join(".gizo")))).to.be.true()
+    def test_warmup(self, tmpdir):
+        gizo = Gizo(url=url, export_file=str(tmpdir.join(".gizo")), lazy=True)
+        expect(gizo.warmup() is gizo).to.be.true()
+        expect(calls) == ["status", "KeyPair"]
+        gizo.PeerCount()
+        expect(calls) == ["status", "KeyPair", "PeerCount"]
+    def test_config_validated_in_background(self, tmpdir):
+        config = str(tmpdir.join(".gizo"))
+        Gizo(url=url, export_file=config)
+        del calls[:]
+        gizo = Gizo(export_file=config, lazy=True)
+        gizo.warmup()
+        expect(calls) == ["status"]
+        expect(gizo.PeerCount()) == 3
+    def test_bad_url(self, tmpdir):
+        gizo = Gizo(url="gizo://test@127.0.0.1:1", export_file=str(tmpdir.join(".gizo")), lazy=True)
+        with pytest.raises(Exception):
+            gizo.PeerCount()
@@ -0,0 +1,100 @@
+"""Test for limits"""
+import pytest
+import sys
+import os
+import json
+import threading
+from wsgiref.simple_server import make_server, WSGIRequestHandler
+import hprose
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+import gizo.limits as limits
+from gizo.gizo import Gizo
+from gizo.job import Requests, EncodedExec
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+def batch(jrs, calls=None):
+    execs = [e for jr in jrs for e in jr.execs]
+    if calls is not None:
+        calls.append(len(execs))
+    if len(execs) > limits.MAX_EXECS:
+        raise Exception("too many execs")
+    if any(e["Args"] == ["fail"] for e in execs):
+        raise Exception("chunk failed")
+    return json.dumps([e["Args"][0] for e in execs])
+
+def connect(tmpdir, name=".gizo"):
+    gizo = Gizo(url=f"gizo://test@127.0.0.1:{server.server_port}", export_file=str(tmpdir.join(name)))
+    gizo.Batch = batch
+    return gizo
+
+service = hprose.HttpService()
+service.addFunction(lambda: json.dumps({"priv": "priv", "pub": "pub"}), "KeyPair")
+server = make_server("127.0.0.1", 0, service, handler_class=QuietHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+def _execs(*args):
+    return [{"Args": [a], "Retries": 0, "TTL": 0} for a in args]
+
+class TestLimits(object):
+    def test_validate(self):
+        limits.validate([Requests("job", *_execs(1, 2))], max_execs=2)
+        with pytest.raises(Exception):
+            limits.validate([Requests("job", *_execs(1, 2, 3))], max_execs=2)
+        with pytest.raises(Exception):
+            limits.validate([Requests("job", {"Retries": limits.MAX_RETRIES + 1})])
+        with pytest.raises(Exception):
+            limits.validate([Requests("job", EncodedExec(json.dumps({"TTL": limits.MAX_TTL + 1})))])
+        limits.validate(['{"ID": "job", "Execs": []}'], max_execs=0)
+    def test_chunk(self):
+        jrs = [Requests("a", *_execs(0, 1, 2)), Requests("b", *_execs(3, 4, 5, 6, 7, 8)), Requests("c", *_execs(9))]
+        chunks = limits.chunk(jrs, 4)
+        expect([sum(len(jr.execs) for jr in c) for c in chunks]) == [4, 4, 2]
+        expect([[jr.id for jr in c] for c in chunks]) == [["a", "b"], ["b"], ["b", "c"]]
+        expect(chunks[0][0] is jrs[0]).to.be.true()
+        expect([e["Args"][0] for c in chunks for jr in c for e in jr.execs]) == list(range(10))
+    def test_decode(self):
+        expect(limits.decode("[3]")) == [3]
+        expect(limits.decode("accepted")) == "accepted"
+        expect(limits.decode(4)) == 4
+    def test_batch_many(self, tmpdir):
+        gizo = connect(tmpdir)
+        result = gizo.BatchMany([Requests("job", *_execs(*range(20))), Requests("other", *_execs(20, 21, 22))], workers=4)
+        expect(result.results) == [list(range(i, min(i + 5, 23))) for i in range(0, 23, 5)]
+        expect(len(result.chunks)) == 5
+        expect(result.errors) == []
+    def test_batch_many_errors(self, tmpdir):
+        gizo = connect(tmpdir)
+        result = gizo.BatchMany([Requests("job", *_execs(0, 1, "fail", 3, 4, 5))], max_execs=2)
+        expect(result.results) == [[0, 1], None, [4, 5]]
+        expect(len(result.errors)) == 1
+        expect(result.errors[0].index) == 1
+        expect(str(result.errors[0].error)).to.contain("chunk failed")
+    def test_batch_many_targets(self, tmpdir):
+        gizo, other = connect(tmpdir), connect(tmpdir, ".other")
+        calls = []
+        other.Batch = lambda jrs: batch(jrs, calls)
+        result = gizo.BatchMany([Requests("job", *_execs(*range(12)))], max_execs=3, targets=[other])
+        expect([r for reply in result.results for r in reply]) == list(range(12))
+        expect(calls) == [3, 3]
+    def test_batch_validates(self, tmpdir):
+        gizo = Gizo(url=f"gizo://test@127.0.0.1:{server.server_port}", export_file=str(tmpdir.join(".gizo")))
+        with pytest.raises(Exception, match="over the limit"):
+            gizo.Batch([Requests("job", *_execs(*range(limits.MAX_EXECS + 1)))])
+    def test_custom_limits(self, tmpdir):
+        gizo = Gizo(url=f"gizo://test@127.0.0.1:{server.server_port}", export_file=str(tmpdir.join(".gizo")), limits=limits.Limits(max_execs=2, max_retries=1))
+        with pytest.raises(Exception, match="over the limit of 2"):
+            gizo.Batch([Requests("job", *_execs(1, 2, 3))])
+        with pytest.raises(Exception, match="over the limit of 1"):
+            gizo.BatchMany([Requests("job", {"Args": [1], "Retries": 2})])
+        expect(len(limits.chunk([Requests("job", *_execs(*range(5)))], gizo.limits.max_execs))) == 3
+    def test_no_limits(self, tmpdir):
+        class Client(object):
+            def Batch(self, jrs):
+                return json.dumps([e["Args"][0] for jr in jrs for e in jr.execs])
+        gizo = Gizo(export_file=str(tmpdir.join(".gizo")), client=Client(), limits=None)
+        expect(json.loads(gizo.Batch([Requests("job", *_execs(*range(limits.MAX_EXECS + 1)))]))) == list(range(limits.MAX_EXECS + 1))
@@ -0,0 +1,64 @@
+"""Test for load generator"""
+import pytest
+import sys
+import os
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.gizo import Gizo
+from gizo.loadgen import LoadGenerator, percentiles, main, SOLO, BATCH
+from gizo.standin import StandIn
+
+job = os.path.join(myPath, "../tmp/test.ank")
+
+@pytest.fixture(scope="module")
+def gizo(tmpdir_factory):
+    standin = StandIn(workers=16, exec_seconds=0.005, seed=5).start()
+    yield Gizo(url=standin.url, export_file=str(tmpdir_factory.mktemp("loadgen").join(".gizo")))
+    standin.stop()
+
+class TestLoadgen(object):
+    def test_percentiles(self):
+        p = percentiles([i / 100 for i in range(1, 101)])
+        expect(p.count) == 100
+        expect(p.p50) == 0.5
+        expect(p.p95) == 0.95
+        expect(p.p99) == 0.99
+        expect(p.max) == 1.0
+        expect(percentiles([]).count) == 0
+    def test_arguments(self, gizo):
+        with pytest.raises(Exception):
+            LoadGenerator(gizo, "job", rate=1, concurrency=1)
+        with pytest.raises(Exception):
+            LoadGenerator(gizo, "job", mode="chain", rate=1)
+    def test_open_loop(self, gizo):
+        generator = LoadGenerator(gizo, gizo.NewJob(job, "Factorial", False), SOLO, rate=200, poll=0.01)
+        report = generator.run(duration=None, count=20)
+        expect(report.loop) == "open"
+        expect(report.submitted) == 20
+        expect(report.completed) == 20
+        expect(report.submit.count) == 20
+        expect(report.end_to_end.count) == 20
+        expect(report.throughput > 0).to.be.true()
+        expect(report.format()).to.contain("end to end")
+    def test_closed_loop(self, gizo):
+        generator = LoadGenerator(gizo, gizo.NewJob(job, "Factorial", False), BATCH, batch_size=3, concurrency=2, poll=0.01)
+        report = generator.run(duration=None, count=4)
+        expect(report.loop) == "closed"
+        expect(report.submitted) == 12
+        expect(report.completed) == 12
+        expect(report.submit.count) == 4
+    def test_abandoned(self, gizo):
+        class Lost(object):
+            def __getattr__(self, name):
+                return getattr(gizo, name)
+            def ExecStatus(self, job_id, exec_hash):
+                raise Exception("exec not found")
+        generator = LoadGenerator(Lost(), gizo.NewJob(job, "Factorial", False), SOLO, concurrency=1, poll=0.01)
+        generator.watcher.max_failures = 2
+        report = generator.run(duration=None, count=2, drain_timeout=5)
+        expect(report.failed) == 2
+        expect(report.incomplete) == 0
+    def test_main(self, capsys):
+        main(["--standin", "--rate", "50", "--count", "5", "--duration", "5", "--poll", "0.01", "--json"])
+        expect(capsys.readouterr().out).to.contain('"completed": 5')
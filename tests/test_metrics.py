@@ -0,0 +1,83 @@
+"""Test for metrics"""
+import pytest
+import sys
+import os
+import asyncio
+import threading
+from wsgiref.simple_server import make_server, WSGIRequestHandler
+import hprose
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+import gizo.transport as transport
+from gizo.aio import AsyncClient
+from gizo.dispatcher import Dispatcher
+from gizo.metrics import Metrics, Call
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+def fail():
+    raise Exception("broke")
+
+service = hprose.HttpService()
+service.addFunction(lambda a, b: a + b, "Add")
+service.addFunction(fail, "Fail")
+server = make_server("127.0.0.1", 0, service, handler_class=QuietHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+dispatcher = Dispatcher(f"gizo://test@127.0.0.1:{server.server_port}")
+address = f"127.0.0.1:{server.server_port}"
+
+class TestMetrics(object):
+    def test_record(self):
+        metrics = Metrics(buckets=[0.1, 1])
+        metrics.record("Version", "a:1", 0.05, None, 10, 20)
+        metrics.record("Version", "a:1", 0.5, Exception(), 10, 0)
+        metrics.record("Version", "b:1", 5)
+        snapshot = metrics.snapshot()
+        expect(snapshot[("Version", "a:1")]["calls"]) == 2
+        expect(snapshot[("Version", "a:1")]["errors"]) == 1
+        expect(snapshot[("Version", "a:1")]["sent"]) == 20
+        expect(snapshot[("Version", "a:1")]["buckets"]) == {0.1: 1, 1: 2, float("inf"): 2}
+        expect(snapshot[("Version", "b:1")]["buckets"]) == {0.1: 0, 1: 0, float("inf"): 1}
+        metrics.reset()
+        expect(metrics.snapshot()) == {}
+    def test_hooks(self):
+        metrics = Metrics()
+        calls = []
+        metrics.add_hook(calls.append)
+        metrics.add_hook(lambda call: 1 / 0)
+        metrics.record("PeerCount", "a:1", 0.01)
+        expect(calls) == [Call("PeerCount", "a:1", 0.01, None, 0, 0)]
+    def test_prometheus(self, tmpdir):
+        metrics = Metrics(buckets=[0.1])
+        metrics.record("Version", 'a"1', 0.05, None, 10, 20)
+        text = metrics.prometheus()
+        expect(text).to.contain('# TYPE gizo_rpc_duration_seconds histogram')
+        expect(text).to.contain('gizo_rpc_calls_total{method="Version",dispatcher="a\\"1"} 1')
+        expect(text).to.contain('gizo_rpc_duration_seconds_bucket{method="Version",dispatcher="a\\"1",le="0.1"} 1')
+        expect(text).to.contain('gizo_rpc_duration_seconds_bucket{method="Version",dispatcher="a\\"1",le="+Inf"} 1')
+        expect(text).to.contain('gizo_rpc_response_bytes_total{method="Version",dispatcher="a\\"1"} 20')
+        path = str(tmpdir.join("gizo.prom"))
+        metrics.write_prometheus(path)
+        expect(open(path).read()) == text
+    def test_transport(self):
+        metrics = Metrics()
+        client = transport.connect(dispatcher, metrics=metrics)
+        expect(client.Add(1, 2)) == 3
+        with pytest.raises(Exception):
+            client.Fail()
+        snapshot = metrics.snapshot()
+        expect(snapshot[("Add", address)]["calls"]) == 1
+        expect(snapshot[("Add", address)]["sent"] > 0).to.be.true()
+        expect(snapshot[("Add", address)]["received"] > 0).to.be.true()
+        expect(snapshot[("Fail", address)]["errors"]) == 1
+    def test_async_client(self):
+        metrics = Metrics()
+        async def run():
+            client = AsyncClient(dispatcher.rpc(), metrics=metrics)
+            await client.invoke("Add", [2, 2])
+            await client.close()
+        asyncio.run(run())
+        expect(metrics.snapshot()[("Add", address)]["calls"]) == 1
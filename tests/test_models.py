@@ -0,0 +1,96 @@
+"""Test for models"""
+import pytest
+import sys
+import os
+import json
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.cache import BlockCache
+from gizo.job import Requests
+from gizo.models import ExecDetails, Block, Exec
+from gizo.utils import ExecHash
+
+_exec = {
+    "Hash": "dGVzdGluZw==",
+    "Timestamp": 1530000000,
+    "Duration": 2000,
+    "Args": [0],
+    "Err": None,
+    "Priority": 0,
+    "Result": 1,
+    "Status": "FINISHED",
+    "Retries": 5,
+    "RetriesCount": 0,
+    "Backoff": 0,
+    "ExecutionTime": 0,
+    "Interval": 0,
+    "By": "test",
+    "TTL": 0,
+    "Pub": "test",
+    "Envs": "test"
+}
+
+class TestExecDetails(object):
+    def test_from_exec(self):
+        details = ExecDetails.from_exec("test", _exec)
+        expect(details.job_id) == "test"
+        expect(details.hash) == [116, 101, 115, 116, 105, 110, 103]
+        expect(details.status) == "FINISHED"
+        expect(details.retries_count) == 0
+        expect(details.duration) == 2000
+    def test_from_exec_without_hash(self):
+        expect(ExecDetails.from_exec("test", {"Status": "STARTED"}).hash).to.be.none()
+
+_block = {
+    "Header": {
+        "Timestamp": 1530000000,
+        "PrevBlockHash": "AA==",
+        "MerkleRoot": "/w==",
+        "Nonce": 7,
+        "Difficulty": 10,
+        "Hash": "dGVzdGluZw=="
+    },
+    "Jobs": [{"ID": "job", "Name": "Factorial", "Hash": "dGVzdGluZw==", "Execs": [_exec]}],
+    "Height": 3
+}
+
+class TestModels(object):
+    def test_block_from_json(self):
+        block = Block(json.dumps(_block))
+        expect(block.height) == 3
+        expect(block.header.hash_hex) == "74657374696e67"
+        expect(block.header.hash_bytes) == b"testing"
+        expect(block.header.prev_block_hash_hex) == "00"
+        expect(block.header.merkle_root_bytes) == b"\xff"
+        expect(block.header.nonce) == 7
+        expect(block.hash_hex) == "74657374696e67"
+        expect(block["Height"]) == 3
+        expect(block["Header"]["Hash"]) == "dGVzdGluZw=="
+        expect(block.data) == _block
+    def test_block_keeps_only_header(self):
+        block = Block(json.dumps(_block).encode("utf-8"))
+        block.height
+        expect(block._data).to.be.none()
+        expect(block.jobs[0].name) == "Factorial"
+    def test_block_in_cache(self):
+        cache = BlockCache()
+        block = Block(memoryview(json.dumps(_block).encode("utf-8")))
+        cache.put(block)
+        expect(cache.get_by_hash("74657374696e67") is block).to.be.true()
+    def test_job(self):
+        job = Block(_block).jobs[0]
+        expect(job.id) == "job"
+        expect(job.hash_hex) == "74657374696e67"
+        expect(job.execs[0].status) == "FINISHED"
+        expect(job.execs is job.execs).to.be.true()
+    def test_exec(self):
+        e = Exec(json.dumps(_exec))
+        expect(e.hash) == ExecHash(b"testing")
+        expect(e.retries_count) == 0
+        expect(e.ttl) == 0
+        expect(e.details("job").hash) == [116, 101, 115, 116, 105, 110, 103]
+        expect(Exec({"Hash": None}).hash).to.be.none()
+    def test_exec_in_requests(self):
+        jr = Requests("job", Exec(json.dumps(_exec)))
+        expect(json.loads(jr.jrs())["Execs"]) == [_exec]
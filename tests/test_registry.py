@@ -0,0 +1,148 @@
+"""Test for registry"""
+import pytest
+import sys
+import os
+import json
+import threading
+import multiprocessing
+from wsgiref.simple_server import make_server, WSGIRequestHandler
+import hprose
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.registry import JobRegistry, write_config
+from gizo.gizo import Gizo
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+service = hprose.HttpService()
+service.addFunction(lambda: json.dumps({"priv": "priv", "pub": "pub"}), "KeyPair")
+deploys = []
+service.addFunction(lambda task, name, priv, key: deploys.append(name) or f"id-{name}", "NewJob")
+server = make_server("127.0.0.1", 0, service, handler_class=QuietHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = f"gizo://test@127.0.0.1:{server.server_port}"
+
+def deploy(path, worker):
+    registry = JobRegistry(path)
+    for n in range(50):
+        registry[f"{worker}-{n}"] = f"id-{worker}-{n}"
+    registry.close()
+
+class TestJobRegistry(object):
+    def test_mapping(self, tmpdir):
+        registry = JobRegistry(str(tmpdir.join("jobs.db")))
+        registry["a"] = "1"
+        registry["b"] = "2"
+        registry["a"] = "3"
+        expect(registry["a"]) == "3"
+        expect("b" in registry).to.be.true()
+        expect(dict(registry)) == {"a": "3", "b": "2"}
+        del registry["b"]
+        expect(len(registry)) == 1
+        with pytest.raises(KeyError):
+            registry["b"]
+    def test_shared(self, tmpdir):
+        path = str(tmpdir.join("jobs.db"))
+        first, second = JobRegistry(path), JobRegistry(path)
+        first["job"] = "1"
+        expect(second["job"]) == "1"
+    def test_batch(self, tmpdir):
+        path = str(tmpdir.join("jobs.db"))
+        registry, other = JobRegistry(path), JobRegistry(path)
+        with registry.batch():
+            for n in range(100):
+                registry[str(n)] = str(n)
+            expect(registry["99"]) == "99"
+            expect(len(other)) == 0
+        expect(len(other)) == 100
+    def test_batch_deploys(self, tmpdir):
+        path = str(tmpdir.join("jobs.db"))
+        registry, other = JobRegistry(path), JobRegistry(path)
+        with registry.batch():
+            registry.record_deploy("source", "Factorial", False, "1")
+            expect(registry.deployed("source", "Factorial", False)) == "1"
+            expect(other.deployed("source", "Factorial", False)).to.be.none()
+        expect(other.deployed("source", "Factorial", False)) == "1"
+        expect(other["Factorial"]) == "1"
+    def test_lazy_open(self, tmpdir):
+        path = str(tmpdir.join("jobs.db"))
+        registry = JobRegistry(path)
+        expect(os.path.exists(path)).to.be.false()
+        expect(len(registry)) == 0
+        expect(os.path.exists(path)).to.be.true()
+        registry.close()
+        registry["job"] = "1"
+        expect(JobRegistry(path)["job"]) == "1"
+    def test_processes(self, tmpdir):
+        path = str(tmpdir.join("jobs.db"))
+        JobRegistry(path).close()
+        workers = [multiprocessing.Process(target=deploy, args=(path, w)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        expect(len(JobRegistry(path))) == 200
+    def test_write_config(self, tmpdir):
+        path = str(tmpdir.join(".gizo"))
+        write_config(path, {"b": 1, "a": 2})
+        expect(open(path).read()) == json.dumps({"b": 1, "a": 2}, indent=4, separators=(',', ': '), sort_keys=True)
+        expect(os.listdir(str(tmpdir))) == [".gizo"]
+
+class TestGizoJobs(object):
+    def test_no_database_until_used(self, tmpdir):
+        config = str(tmpdir.join(".gizo"))
+        Gizo(url=url, export_file=config, lazy=True)
+        gizo = Gizo(url=url, export_file=config)
+        expect(os.path.exists(f"{config}.db")).to.be.false()
+        expect(len(gizo.jobs)) == 0
+        expect(os.path.exists(f"{config}.db")).to.be.true()
+    def test_legacy_config(self, tmpdir):
+        config = str(tmpdir.join(".gizo"))
+        with open(config, "w") as f:
+            f.write(json.dumps({"dispatcher": url, "keys": {"priv": "priv", "pub": "pub"}, "jobs": {"Factorial": "legacy"}}))
+        gizo = Gizo(export_file=config)
+        expect(gizo.jobs["Factorial"]) == "legacy"
+        expect(dict(Gizo(export_file=config).jobs)) == {"Factorial": "legacy"}
+    def test_new_job(self, tmpdir):
+        config = str(tmpdir.join(".gizo"))
+        task = tmpdir.join("test.ank")
+        task.write("func Factorial(n){ return 1 }")
+        gizo = Gizo(url=url, export_file=config)
+        before = open(config).read()
+        with gizo.jobs.batch():
+            for n in range(10):
+                gizo.NewJob(str(task), f"Factorial{n}", False)
+        expect(open(config).read()) == before
+        expect(Gizo(export_file=config).jobs["Factorial9"]) == "id-Factorial9"
+    def test_deploy_cache(self, tmpdir):
+        config = str(tmpdir.join(".gizo"))
+        task = tmpdir.join("test.ank")
+        task.write("func Factorial(n){ return 1 }")
+        gizo = Gizo(url=url, export_file=config)
+        deploys.clear()
+        expect(gizo.NewJob(str(task), "Factorial", False)) == "id-Factorial"
+        expect(gizo.NewJob(str(task), "Factorial", False)) == "id-Factorial"
+        expect(Gizo(export_file=config).NewJob(str(task), "Factorial", False)) == "id-Factorial"
+        expect(deploys) == ["Factorial"]
+        gizo.NewJob(str(task), "Factorial", True)
+        gizo.NewJob(str(task), "Factorial", False, force=True)
+        task.write("func Factorial(n){ return 2 }")
+        gizo.NewJob(str(task), "Factorial", False)
+        expect(deploys) == ["Factorial"] * 4
+    def test_new_jobs(self, tmpdir):
+        config = str(tmpdir.join(".gizo"))
+        jobs = tmpdir.mkdir("jobs")
+        for n in range(20):
+            jobs.join(f"Job{n}.ank").write(f"func Job{n}(){{ return {n} }}")
+        jobs.join("README.md").write("not a job")
+        gizo = Gizo(url=url, export_file=config)
+        deploys.clear()
+        ids = gizo.NewJobs(str(jobs), workers=4)
+        expect(ids) == {f"Job{n}": f"id-Job{n}" for n in range(20)}
+        expect(len(deploys)) == 20
+        expect(gizo.NewJobs([str(jobs.join("Job3.ank")), (str(jobs.join("Job4.ank")), "Job4")])) == {"Job3": "id-Job3", "Job4": "id-Job4"}
+        expect(len(deploys)) == 20
+        expect(gizo.jobs["Job19"]) == "id-Job19"
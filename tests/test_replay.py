@@ -0,0 +1,108 @@
+"""Test for recording and replaying rpc traffic"""
+import pytest
+import sys
+import os
+import gzip
+import json
+import threading
+import time
+from wsgiref.simple_server import make_server, WSGIRequestHandler
+import hprose
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+import gizo.transport as transport
+from gizo.dispatcher import Dispatcher
+from gizo.gizo import Gizo
+from gizo.metrics import Metrics
+from gizo.replay import Recorder, ReplayClient
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+def fail():
+    raise Exception("broke")
+def slow(n):
+    time.sleep(0.05)
+    return n
+
+service = hprose.HttpService()
+service.addFunction(lambda a, b: a + b, "Add")
+service.addFunction(fail, "Fail")
+service.addFunction(slow, "Slow")
+service.addFunction(lambda: json.dumps({"priv": "priv", "pub": "pub"}), "KeyPair")
+service.addFunction(lambda: 42, "PeerCount")
+service.addFunction(lambda: b"\x01\x02raw", "Raw")
+service.addFunction(lambda: {1: "a", "b": [b"\x03"], "c": {"$b": "not bytes"}}, "Mixed")
+service.addFunction(lambda job_id, exec_hash: f"{job_id}:{len(exec_hash)}", "ExecStatus")
+server = make_server("127.0.0.1", 0, service, handler_class=QuietHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+dispatcher = Dispatcher(f"gizo://test@127.0.0.1:{server.server_port}")
+
+class TestReplay(object):
+    @pytest.mark.parametrize("name", ["traffic.jsonl", "traffic.jsonl.gz"])
+    def test_record_replay(self, tmpdir, name):
+        path = str(tmpdir.join(name))
+        with Recorder(path) as recorder:
+            client = transport.connect(dispatcher, metrics=Metrics(), recorder=recorder)
+            expect(client.Add(1, 2)) == 3
+            expect(client.Add(2, 2)) == 4
+            with pytest.raises(Exception):
+                client.Fail()
+        expect(recorder.calls) == 3
+        opener = gzip.open if name.endswith(".gz") else open
+        with opener(path, "rt") as f:
+            expect([sorted(json.loads(line)) for line in f]) == [["a", "m", "r", "s"]] * 2 + [["a", "e", "m", "s"]]
+        replay = ReplayClient(path, speed=None, metrics=Metrics())
+        expect(replay.Add(2, 2)) == 4
+        expect(replay.Add(1, 2)) == 3
+        with pytest.raises(Exception, match="broke"):
+            replay.Fail()
+        with pytest.raises(Exception, match="no recorded call"):
+            replay.Add(1, 2)
+    def test_types(self, tmpdir):
+        path = str(tmpdir.join("traffic.jsonl"))
+        with Recorder(path) as recorder:
+            client = transport.connect(dispatcher, metrics=Metrics(), recorder=recorder)
+            raw = client.Raw()
+            mixed = client.Mixed()
+            expect(client.Add("a", "b")) == "ab"
+        expect(raw) == b"\x01\x02raw"
+        replay = ReplayClient(path, speed=None, metrics=Metrics())
+        expect(replay.Raw()) == raw
+        expect(replay.Mixed()) == mixed
+        expect(replay.Add("a", "b")) == "ab"
+    def test_method_fallback(self, tmpdir):
+        path = str(tmpdir.join("traffic.jsonl"))
+        with Recorder(path) as recorder:
+            client = transport.connect(dispatcher, metrics=Metrics(), recorder=recorder)
+            client.Add(1, 2)
+        expect(ReplayClient(path, speed=None).Add(5, 5)) == 3
+    def test_speed(self, tmpdir):
+        path = str(tmpdir.join("traffic.jsonl"))
+        with Recorder(path) as recorder:
+            client = transport.connect(dispatcher, metrics=Metrics(), recorder=recorder)
+            client.Slow(1)
+            client.Slow(2)
+        replay = ReplayClient(path, speed=1, metrics=Metrics())
+        start = time.perf_counter()
+        replay.Slow(1)
+        expect(time.perf_counter() - start >= 0.05).to.be.true()
+        replay = ReplayClient(path, speed=None, metrics=Metrics())
+        start = time.perf_counter()
+        replay.Slow(1)
+        replay.Slow(2)
+        expect(time.perf_counter() - start < 0.05).to.be.true()
+    def test_gizo(self, tmpdir):
+        path = str(tmpdir.join("traffic.jsonl"))
+        recorder = Recorder(path)
+        gizo = Gizo(url=dispatcher.url, export_file=str(tmpdir.join(".gizo")), metrics=Metrics(), record=recorder)
+        expect(gizo.PeerCount()) == 42
+        expect(gizo.ExecStatus("job", [1, 2, 3])) == "job:3"
+        recorder.close()
+        metrics = Metrics()
+        replayed = Gizo(export_file=str(tmpdir.join(".gizo")), client=ReplayClient(path, speed=None, metrics=metrics))
+        expect(replayed.ExecStatus("job", [1, 2, 3])) == "job:3"
+        expect(replayed.PeerCount()) == 42
+        expect(metrics.snapshot()[("PeerCount", "replay")]["calls"]) == 1
@@ -0,0 +1,78 @@
+"""Test for store"""
+import pytest
+import sys
+import os
+import base64
+import hashlib
+import threading
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.store import BlockStore
+
+def block(height, tag=b""):
+    digest = hashlib.sha256(bytes([height % 256, height // 256]) + tag).digest()
+    return {"Header": {"Hash": base64.b64encode(digest).decode("utf-8")}, "Height": height}
+
+def hex_hash(b):
+    return base64.b64decode(b["Header"]["Hash"]).hex()
+
+class TestBlockStore(object):
+    def test_put_get(self, tmpdir):
+        store = BlockStore(str(tmpdir))
+        b = block(0)
+        store.put(b)
+        expect(store.get_by_height(0)) == b
+        expect(store.get_by_hash(hex_hash(b))) == b
+        expect(store.get_by_height(1)).to.be.none()
+        expect(store.get_by_hash("00" * 32)).to.be.none()
+    def test_raw_is_kept(self, tmpdir):
+        store = BlockStore(str(tmpdir))
+        b = block(3)
+        store.put(b, b'{"Header": {"Hash": "%s"}, "Height": 3}' % b["Header"]["Hash"].encode())
+        expect(store.raw_by_height(3).startswith(b'{"Header"')).to.be.true()
+        expect(len(store)) == 4
+    def test_grows_hash_index(self, tmpdir):
+        store = BlockStore(str(tmpdir))
+        blocks = [block(h) for h in range(1500)]
+        for b in blocks:
+            store.put(b)
+        expect(store.get_by_hash(hex_hash(blocks[0]))) == blocks[0]
+        expect(store.get_by_hash(hex_hash(blocks[1499]))) == blocks[1499]
+    def test_shared_between_readers(self, tmpdir):
+        writer = BlockStore(str(tmpdir))
+        reader = BlockStore(str(tmpdir))
+        expect(reader.get_by_height(0)).to.be.none()
+        writer.put(block(0))
+        expect(reader.get_by_height(0)) == block(0)
+        expect(reader.get_by_hash(hex_hash(block(0)))) == block(0)
+    def test_replace_height(self, tmpdir):
+        store = BlockStore(str(tmpdir))
+        store.put(block(1))
+        store.put(block(1, b"fork"))
+        expect(store.get_by_height(1)) == block(1, b"fork")
+    def test_concurrent_readers(self, tmpdir):
+        store = BlockStore(str(tmpdir))
+        blocks = [block(h) for h in range(1200)]
+        store.put(blocks[0])
+        done = threading.Event()
+        errors = []
+        def read():
+            try:
+                while not done.is_set():
+                    for h in (0, len(store) - 1):
+                        b = store.get_by_height(h)
+                        expect(b is None or b == blocks[h]).to.be.true()
+                    expect(store.get_by_hash(hex_hash(blocks[0]))) == blocks[0]
+            except Exception as e:
+                errors.append(e)
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for b in blocks[1:]:
+            store.put(b)
+        done.set()
+        for reader in readers:
+            reader.join()
+        expect(errors) == []
+        expect(store.get_by_hash(hex_hash(blocks[-1]))) == blocks[-1]
@@ -0,0 +1,45 @@
+"""Test for sync"""
+import pytest
+import sys
+import os
+import base64
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.sync import ChainSync
+
+class Chain(object):
+    def __init__(self, length, fork=0):
+        self.blocks = [{"Header": {"Hash": base64.b64encode(bytes([h, fork])).decode("utf-8")}, "Height": h} for h in range(length)]
+    def LatestBlockHeight(self):
+        return len(self.blocks) - 1
+    def BlockByHeight(self, height):
+        return self.blocks[height]
+    def BlockHashesHex(self):
+        return [base64.b64decode(b["Header"]["Hash"]).hex() for b in self.blocks]
+
+class TestChainSync(object):
+    def test_in_order(self, tmpdir):
+        sync = ChainSync(Chain(50), str(tmpdir.join("sync")), concurrency=4)
+        expect([b["Height"] for b in sync.blocks()]) == list(range(50))
+        expect(sync.height) == 49
+    def test_resume(self, tmpdir):
+        checkpoint = str(tmpdir.join("sync"))
+        chain = Chain(20)
+        sync = ChainSync(chain, checkpoint)
+        for block in sync.blocks():
+            if block["Height"] == 9:
+                break
+        resumed = ChainSync(chain, checkpoint)
+        expect(resumed.height) == 8
+        expect([b["Height"] for b in resumed.blocks()]) == list(range(9, 20))
+    def test_reorg(self, tmpdir):
+        checkpoint = str(tmpdir.join("sync"))
+        chain = Chain(10)
+        list(ChainSync(chain, checkpoint).blocks())
+        chain.blocks[7:] = Chain(12, fork=1).blocks[7:]
+        forks = []
+        sync = ChainSync(chain, checkpoint, on_reorg=forks.append)
+        expect([b["Height"] for b in sync.blocks()]) == list(range(7, 12))
+        expect(forks) == [6]
+        expect(sync.reorgs) == 1
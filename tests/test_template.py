@@ -0,0 +1,46 @@
+"""Test for template"""
+import pytest
+import sys
+import os
+import json
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.template import ExecTemplate
+from gizo.models import Exec
+
+_exec = {
+    "Hash": None,
+    "Timestamp": 0,
+    "Duration": 0,
+    "Args": [],
+    "Err": None,
+    "Priority": 0,
+    "Result": None,
+    "Status": "STARTED",
+    "Retries": 5,
+    "RetriesCount": 0,
+    "Backoff": 0,
+    "ExecutionTime": 0,
+    "Interval": 0,
+    "By": "",
+    "TTL": 0,
+    "Pub": "test",
+    "Envs": "dGVzdA=="
+}
+
+class TestExecTemplate(object):
+    def test_json(self):
+        template = ExecTemplate("job", _exec)
+        expect(json.loads(template.json([1, "a"]))) == dict(_exec, Args=[1, "a"])
+        expect("Args" in template.exec).to.be.false()
+    def test_requests(self):
+        template = ExecTemplate("job", Exec(json.dumps(_exec)))
+        jr = template.requests([[n] for n in range(3)])
+        content = json.loads(jr.jrs())
+        expect(content["ID"]) == "job"
+        expect([e["Args"] for e in content["Execs"]]) == [[0], [1], [2]]
+        expect(content["Execs"][2]) == dict(_exec, Args=[2])
+    def test_matches_requests(self):
+        template = ExecTemplate("job", _exec)
+        expect(template.encode([7]).data) == dict(_exec, Args=[7])
@@ -0,0 +1,93 @@
+"""Test for transport"""
+import pytest
+import sys
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from wsgiref.simple_server import make_server, WSGIRequestHandler
+import hprose
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+import gizo.transport as transport
+from gizo.dispatcher import Dispatcher
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+service = hprose.HttpService()
+service.addFunction(lambda a, b: a + b, "Add")
+server = make_server("127.0.0.1", 0, service, handler_class=QuietHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+dispatcher = Dispatcher(f"gizo://test@127.0.0.1:{server.server_port}")
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Keeps connections open between requests and counts the connections made"""
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    def setup(self):
+        super().setup()
+        KeepAliveHandler.connections += 1
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(0.3)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"OK")
+    def log_message(self, *args):
+        pass
+
+keep_alive = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+threading.Thread(target=keep_alive.serve_forever, daemon=True).start()
+keep_alive_url = f"http://127.0.0.1:{keep_alive.server_port}"
+
+class TestTransport(object):
+    def test_invoke(self):
+        client = transport.connect(dispatcher)
+        expect(client.Add(1, 2)) == 3
+    def test_shared_pool(self):
+        expect(transport.pool(dispatcher) is transport.pool(Dispatcher(dispatcher.url))).to.be.true()
+        expect(transport.connect(dispatcher).pool is transport.connect(dispatcher).pool).to.be.true()
+    def test_idle_timeout(self):
+        pool = transport.Pool(pool_size=2, idle_timeout=0.1)
+        connections = KeepAliveHandler.connections
+        pool.get(keep_alive_url).raise_for_status()
+        pool.get(keep_alive_url).raise_for_status()
+        expect(KeepAliveHandler.connections - connections) == 1
+        session = pool.session
+        time.sleep(0.2)
+        pool.get(keep_alive_url).raise_for_status()
+        expect(pool.session is session).to.be.false()
+        expect(len(session.get_adapter(keep_alive_url).poolmanager.pools.keys())) == 0
+        expect(KeepAliveHandler.connections - connections) == 2
+        client = transport.HttpTransport(dispatcher.rpc(), transport.Pool(pool_size=2, idle_timeout=0))
+        expect(client.Add(2, 2)) == 4
+        expect(client.Add(3, 3)) == 6
+    def test_idle_in_flight(self):
+        pool = transport.Pool(pool_size=2, idle_timeout=0.1)
+        session = pool.session
+        slow = []
+        thread = threading.Thread(target=lambda: slow.append(pool.get(keep_alive_url + "/slow")))
+        thread.start()
+        time.sleep(0.15)
+        pool.get(keep_alive_url).raise_for_status()
+        expect(pool.session is session).to.be.false()
+        expect(len(session.get_adapter(keep_alive_url).poolmanager.pools.keys())) == 1
+        thread.join()
+        expect(slow[0].status_code) == 200
+        expect(len(session.get_adapter(keep_alive_url).poolmanager.pools.keys())) == 0
+    def test_prune(self):
+        idle = Dispatcher(f"gizo://test@127.0.0.1:{keep_alive.server_port}")
+        transport.pool(idle, idle_timeout=0.05).get(keep_alive_url).raise_for_status()
+        key = f"{idle.ip}:{idle.port}"
+        expect(transport._pools).to.contain(key)
+        time.sleep(0.1)
+        transport.pool(dispatcher)
+        expect(key in transport._pools).to.be.false()
+    def test_error(self):
+        client = transport.HttpTransport(f"http://127.0.0.1:{server.server_port}/rpc", transport.Pool())
+        with pytest.raises(hprose.HproseException):
+            client.Missing()
@@ -18,3 +18,27 @@ class TestUtils(object):
         expect(utils.b64_to_hex("dGVzdGluZw==")) == "74657374696e67"
     def test_b64_to_bytes(self):
         expect(utils.b64_to_bytes("YSKclx4/aaKu+RzEk6UugaoJ40eOWuPOWtPaKqLWmRM=")) == [97, 34, 156, 151, 30, 63, 105, 162, 174, 249, 28, 196, 147, 165, 46, 129, 170, 9, 227, 71, 142, 90, 227, 206, 90, 211, 218, 42, 162, 214, 153, 19]
+
+class TestExecHash(object):
+    def test_forms(self):
+        h = utils.ExecHash.from_hex('74657374696e67')
+        expect(h.list) == _list
+        expect(h.hex) == '74657374696e67'
+        expect(h.b64) == "dGVzdGluZw=="
+        expect(bytes(h)) == b"testing"
+    def test_hashable(self):
+        a = utils.ExecHash.from_b64("dGVzdGluZw==")
+        b = utils.ExecHash(bytes(_list))
+        expect(a == b).to.be.true()
+        expect(a == _list).to.be.true()
+        expect(len({a, b})) == 1
+    def test_bulk(self):
+        hashes = utils.hex_to_exec_hashes(['74657374696e67', '00ff'])
+        expect(hashes[1].list) == [0, 255]
+        expect(utils.b64_to_exec_hashes(["dGVzdGluZw=="])) == [hashes[0]]
+    def test_hash_arg(self):
+        h = utils.ExecHash(bytes(_list))
+        expect(utils.hash_arg(h)) == _list
+        expect(utils.hash_arg(h) is utils.hash_arg(h)).to.be.false()
+        expect(hasattr(h, "_list")).to.be.false()
+        expect(utils.hash_arg(_list)) == _list
@@ -0,0 +1,123 @@
+"""Test for watcher"""
+import pytest
+import sys
+import os
+import asyncio
+import logging
+import threading
+from robber import expect
+myPath = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, myPath + '/../')
+from gizo.watcher import ExecWatcher, Transition, ABANDONED
+import gizo.status as status
+
+class Dispatcher(object):
+    """Moves each exec one status forward every time it is polled"""
+    flow = [status.QUEUED, status.RUNNING, status.FINISHED]
+    def __init__(self):
+        self.polls = {}
+        self.lock = threading.Lock()
+    def ExecStatus(self, job_id, exec_hash):
+        with self.lock:
+            n = self.polls.get(bytes(exec_hash), 0)
+            self.polls[bytes(exec_hash)] = n + 1
+        return self.flow[min(n, len(self.flow) - 1)]
+    def ExecExecutionTime(self, job_id, exec_hash):
+        return 0
+    def ExecTtlSeconds(self, job_id, exec_hash):
+        return 0.1
+
+class Broken(Dispatcher):
+    """Raises on every poll of exec [0]"""
+    def ExecStatus(self, job_id, exec_hash):
+        if bytes(exec_hash) == bytes([0]):
+            with self.lock:
+                self.polls[bytes(exec_hash)] = self.polls.get(bytes(exec_hash), 0) + 1
+            raise Exception("exec not found")
+        return super().ExecStatus(job_id, exec_hash)
+
+class TestExecWatcher(object):
+    def test_transitions(self):
+        watcher = ExecWatcher(Dispatcher(), min_interval=0.01, max_interval=0.05)
+        watcher.watch("job", [1])
+        seen = [t.status for t in watcher.transitions(timeout=0.3)]
+        expect(seen) == [status.QUEUED, status.RUNNING, status.FINISHED]
+        expect(len(watcher)) == 0
+        watcher.stop()
+    def test_callback_and_dedupe(self):
+        changes = []
+        dispatcher = Dispatcher()
+        watcher = ExecWatcher(dispatcher, on_change=changes.append, min_interval=0.01, max_interval=0.05)
+        for i in range(20):
+            watcher.watch("job", [i])
+            watcher.watch("job", [i])
+        expect(watcher.wait(timeout=5)).to.be.true()
+        watcher.stop()
+        expect(len(changes)) == 60
+        expect(changes[0]).to.be.an.instanceof(Transition)
+        expect(max(dispatcher.polls.values())) == 3
+        expect(watcher.polls) == 60
+    def test_stop_ends_iteration(self):
+        watcher = ExecWatcher(Dispatcher(), min_interval=0.01, max_interval=0.05)
+        watcher.watch("job", [1])
+        async def consume():
+            seen = []
+            async for t in watcher:
+                seen.append(t.status)
+                if t.status == status.FINISHED:
+                    asyncio.get_running_loop().call_later(0.05, watcher.stop)
+            return seen
+        expect(asyncio.run(asyncio.wait_for(consume(), 5))) == [status.QUEUED, status.RUNNING, status.FINISHED]
+        expect(list(watcher.transitions())) == []
+        watcher.watch("job", [2])
+        watcher.start()
+        expect([t.status for t in watcher.transitions(timeout=0.3)]) == [status.QUEUED, status.RUNNING, status.FINISHED]
+        watcher.stop()
+    def test_callback_errors_logged(self, caplog):
+        def fail(transition):
+            raise ValueError("broken callback")
+        watcher = ExecWatcher(Dispatcher(), on_change=fail, min_interval=0.01, max_interval=0.05)
+        with caplog.at_level(logging.ERROR, logger="gizo.watcher"):
+            watcher.watch("job", [1])
+            expect(watcher.wait(timeout=5)).to.be.true()
+            watcher.stop()
+        failed = [r for r in caplog.records if r.exc_info and isinstance(r.exc_info[1], ValueError)]
+        expect(len(failed)) == 3
+    def test_failed_polls_capped(self, caplog):
+        dispatcher = Broken()
+        changes = []
+        watcher = ExecWatcher(dispatcher, on_change=changes.append, min_interval=0.01, max_interval=0.02, max_failures=3)
+        with caplog.at_level(logging.WARNING, logger="gizo.watcher"):
+            watcher.watch("job", [0])
+            watcher.watch("job", [1])
+            expect(watcher.wait(timeout=5)).to.be.true()
+            watcher.stop()
+        expect(dispatcher.polls[bytes([0])]) == 3
+        expect([t.exec_hash for t in changes if t.status == status.FINISHED]) == [[1]]
+        expect([t for t in changes if t.exec_hash == [0]]) == [Transition("job", [0], None, ABANDONED)]
+        expect(len([r for r in caplog.records if r.levelno == logging.WARNING])) == 3
+        expect(len([r for r in caplog.records if r.levelno == logging.ERROR])) == 1
+    def test_schedule_errors_logged(self, caplog):
+        class NoTtl(Dispatcher):
+            def ExecTtlSeconds(self, job_id, exec_hash):
+                raise Exception("ttl unavailable")
+        watcher = ExecWatcher(NoTtl(), min_interval=0.01, max_interval=0.05)
+        with caplog.at_level(logging.WARNING, logger="gizo.watcher"):
+            watcher.watch("job", [1])
+            expect([t.status for t in watcher.transitions(timeout=0.5)]) == [status.QUEUED, status.RUNNING, status.FINISHED]
+            watcher.stop()
+        failed = [r for r in caplog.records if r.exc_info and "ttl unavailable" in str(r.exc_info[1])]
+        expect(len(failed)) == 1
+    def test_cancelled_iteration(self):
+        watcher = ExecWatcher(Dispatcher(), min_interval=0.05, max_interval=0.05)
+        async def first():
+            async for t in watcher:
+                return t.status
+        async def cancelled():
+            task = asyncio.ensure_future(first())
+            await asyncio.sleep(0.01)
+            task.cancel()
+        asyncio.run(asyncio.wait_for(cancelled(), 5))
+        watcher.watch("job", [1])
+        expect([t.status for t in watcher.transitions(timeout=0.5)]) == [status.QUEUED, status.RUNNING, status.FINISHED]
+        watcher.stop()